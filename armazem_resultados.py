@@ -0,0 +1,260 @@
+import argparse
+import hashlib
+import inspect
+import io
+import json
+import os
+import sqlite3
+import zlib
+from datetime import datetime
+
+from carregar_historicos import ler_resultados
+from historico_colunar import HistoricoApostas
+from simulador_rodadas_com_graficos import simular_apostas
+
+
+# Muda quando as regras da simulação mudam, invalidando os resultados guardados
+VERSAO_SIMULACAO = 1
+# Parâmetros de simular_apostas que não fazem parte da configuração guardada
+FORA_DA_CONFIGURACAO = {"resultados", "resultados_analisados", "estrategia", "historico_colunar", "instrumentacao"}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS configuracoes (
+    chave TEXT PRIMARY KEY,
+    parametros TEXT NOT NULL
+);
+-- Caminho de cada arquivo -> hash do conteúdo atual (arquivos iguais apontam para o mesmo hash)
+CREATE TABLE IF NOT EXISTS arquivos (
+    caminho TEXT PRIMARY KEY,
+    tamanho_bytes INTEGER NOT NULL,
+    modificado_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    resultados INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resultados (
+    hash_arquivo TEXT NOT NULL,
+    configuracao TEXT NOT NULL REFERENCES configuracoes (chave),
+    estrategia TEXT NOT NULL,
+    resultados INTEGER NOT NULL,
+    rodadas INTEGER NOT NULL,
+    vitorias INTEGER NOT NULL,
+    saldo_final REAL NOT NULL,
+    ganho_liquido REAL NOT NULL,
+    encerrada INTEGER NOT NULL,
+    rastro BLOB,
+    gravado_em TEXT NOT NULL,
+    PRIMARY KEY (hash_arquivo, configuracao, estrategia)
+);
+CREATE INDEX IF NOT EXISTS resultados_por_configuracao ON resultados (configuracao, estrategia);
+CREATE INDEX IF NOT EXISTS arquivos_por_hash ON arquivos (hash);
+"""
+
+
+def configuracao_completa(parametros):
+    """
+    Configuração completa de uma simulação: os parâmetros informados mais os valores padrão de
+    simular_apostas para os demais, e a versão das regras (VERSAO_SIMULACAO).
+    """
+    configuracao = {nome: parametro.default for nome, parametro in inspect.signature(simular_apostas).parameters.items()
+                    if nome not in FORA_DA_CONFIGURACAO}
+    configuracao.update(parametros)
+    configuracao["pesos_padrao"] = list(configuracao["pesos_padrao"])
+    configuracao["versao"] = VERSAO_SIMULACAO
+    return configuracao
+
+
+def hash_numeros(numeros):
+    """Hash do conteúdo de um histórico: SHA-256 dos números sorteados, um byte por resultado."""
+    return hashlib.sha256(bytes(numeros)).hexdigest()
+
+
+def compactar_rastro(historico):
+    """Rastro rodada a rodada de um HistoricoApostas: as colunas em .npz, comprimidas com zlib."""
+    buffer = io.BytesIO()
+    historico.salvar_npz(buffer)
+    return zlib.compress(buffer.getvalue())
+
+
+class ArmazemResultados:
+    """
+    Resultados das simulações guardados em SQLite, para não refazer o que não mudou.
+
+    Cada resultado é identificado pelo hash do conteúdo do histórico (hash_numeros), pela
+    configuração completa (configuracao_completa) e pela estratégia, e guarda o resumo de
+    simulador_lote com o rastro compacto das rodadas. A tabela 'arquivos' liga cada caminho ao hash
+    do seu conteúdo: arquivos com o mesmo conteúdo reaproveitam a mesma simulação e as consultas
+    continuam mostrando cada um deles. Um arquivo que só ganhou resultados no fim
+    reaproveita as estratégias que encerraram antes do fim antigo por uma regra de parada: com
+    os mesmos resultados iniciais a simulação é a mesma.
+
+    Parâmetros:
+    - caminho: Arquivo do banco SQLite (criado se não existir).
+    """
+
+    def __init__(self, caminho="resultados_simulacao.sqlite"):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.row_factory = sqlite3.Row
+        self.conexao.executescript(ESQUEMA)
+
+    def fechar(self):
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def registrar_configuracao(self, parametros):
+        """Guarda a configuração completa dos parâmetros e retorna a sua chave."""
+        texto = json.dumps(configuracao_completa(parametros), sort_keys=True)
+        chave = hashlib.sha256(texto.encode()).hexdigest()[:16]
+        with self.conexao:
+            self.conexao.execute("INSERT OR IGNORE INTO configuracoes VALUES (?, ?)", (chave, texto))
+        return chave
+
+    def identificar_arquivo(self, caminho):
+        """
+        Hash do conteúdo do arquivo, lido só quando o tamanho ou a data de modificação mudaram.
+
+        Retorna:
+        - (hash, quantidade de resultados, hash_anterior). hash_anterior é o hash da versão já
+          conhecida do arquivo quando a nova apenas acrescentou resultados no fim; senão None.
+        """
+        informacoes = os.stat(caminho)
+        anterior = self.conexao.execute("SELECT * FROM arquivos WHERE caminho = ?", (caminho,)).fetchone()
+        if anterior and (anterior["tamanho_bytes"], anterior["modificado_ns"]) == (informacoes.st_size,
+                                                                                   informacoes.st_mtime_ns):
+            return anterior["hash"], anterior["resultados"], None
+        numeros = bytes(numero for numero, _ in ler_resultados(caminho))
+        hash_arquivo = hash_numeros(numeros)
+        hash_anterior = None
+        if anterior and anterior["hash"] != hash_arquivo and anterior["resultados"] < len(numeros) \
+                and hash_numeros(numeros[:anterior["resultados"]]) == anterior["hash"]:
+            hash_anterior = anterior["hash"]
+        with self.conexao:
+            self.conexao.execute("INSERT OR REPLACE INTO arquivos VALUES (?, ?, ?, ?, ?)",
+                                 (caminho, informacoes.st_size, informacoes.st_mtime_ns, hash_arquivo, len(numeros)))
+        return hash_arquivo, len(numeros), hash_anterior
+
+    def obter_linhas(self, caminho, hash_arquivo, configuracao, estrategias, resultados=None, hash_anterior=None):
+        """
+        Linhas já guardadas do arquivo para a configuração, no formato de simulador_lote.
+
+        Com hash_anterior (arquivo que cresceu), as estratégias que encerraram antes do fim da
+        versão anterior são copiadas para o novo hash com a nova quantidade de resultados.
+
+        Retorna:
+        - Um dicionário {estrategia: linha} só com as estratégias encontradas.
+        """
+        linhas = {}
+        consulta = ("SELECT estrategia, resultados, rodadas, vitorias, saldo_final, ganho_liquido FROM resultados "
+                    "WHERE hash_arquivo = ? AND configuracao = ? AND estrategia = ?")
+        for estrategia in estrategias:
+            registro = self.conexao.execute(consulta, (hash_arquivo, configuracao, estrategia)).fetchone()
+            if registro is None and hash_anterior is not None:
+                registro = self.conexao.execute(consulta + " AND encerrada = 1",
+                                                (hash_anterior, configuracao, estrategia)).fetchone()
+                if registro is not None:
+                    with self.conexao:
+                        self.conexao.execute(
+                            "INSERT OR REPLACE INTO resultados SELECT ?, configuracao, estrategia, ?, rodadas, "
+                            "vitorias, saldo_final, ganho_liquido, encerrada, rastro, ? FROM resultados "
+                            "WHERE hash_arquivo = ? AND configuracao = ? AND estrategia = ?",
+                            (hash_arquivo, resultados, datetime.now().isoformat(timespec="seconds"),
+                             hash_anterior, configuracao, estrategia))
+                    registro = dict(registro, resultados=resultados)
+            if registro is not None:
+                linhas[estrategia] = {"arquivo": caminho, **dict(registro)}
+        return linhas
+
+    def guardar_linhas(self, hash_arquivo, configuracao, linhas, rastros=None, tamanho_janela=30):
+        """
+        Guarda as linhas de simular_arquivo e os rastros ({estrategia: bytes de compactar_rastro}).
+
+        Uma simulação 'encerrada' parou por uma regra antes do último resultado disponível.
+        """
+        rastros = rastros or {}
+        gravado_em = datetime.now().isoformat(timespec="seconds")
+        with self.conexao:
+            self.conexao.executemany(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(hash_arquivo, configuracao, linha["estrategia"], linha["resultados"],
+                  linha["rodadas"], linha["vitorias"], linha["saldo_final"], linha["ganho_liquido"],
+                  int(linha["rodadas"] < max(linha["resultados"] - tamanho_janela, 0)),
+                  rastros.get(linha["estrategia"]), gravado_em)
+                 for linha in linhas])
+
+    def rastro(self, hash_arquivo, configuracao, estrategia):
+        """Retorna o HistoricoApostas guardado de uma simulação, ou None se não houver rastro."""
+        registro = self.conexao.execute(
+            "SELECT rastro FROM resultados WHERE hash_arquivo = ? AND configuracao = ? AND estrategia = ?",
+            (hash_arquivo, configuracao, estrategia)).fetchone()
+        if registro is None or registro["rastro"] is None:
+            return None
+        return HistoricoApostas.carregar_npz(io.BytesIO(zlib.decompress(registro["rastro"])))
+
+    def consultar(self, configuracao=None, estrategia=None, arquivo=None):
+        """
+        Linhas guardadas (sem o rastro) de cada arquivo conhecido, na versão atual do seu conteúdo,
+        filtradas por configuração, estratégia e/ou caminho do arquivo.
+        """
+        filtros, valores = [], []
+        for coluna, valor in (("r.configuracao", configuracao), ("r.estrategia", estrategia), ("a.caminho", arquivo)):
+            if valor is not None:
+                filtros.append(f"{coluna} = ?")
+                valores.append(valor)
+        sql = ("SELECT r.hash_arquivo, r.configuracao, r.estrategia, a.caminho AS arquivo, r.resultados, r.rodadas, "
+               "r.vitorias, r.saldo_final, r.ganho_liquido, r.encerrada, r.gravado_em "
+               "FROM arquivos a JOIN resultados r ON r.hash_arquivo = a.hash")
+        if filtros:
+            sql += " WHERE " + " AND ".join(filtros)
+        return [dict(registro) for registro in self.conexao.execute(sql + " ORDER BY arquivo, estrategia", valores)]
+
+    def resumo_por_configuracao(self, estrategia=None):
+        """
+        Compara as execuções: para cada configuração e estratégia, quantidade de arquivos,
+        rodadas, ganho líquido total e médio e fração de arquivos com lucro.
+
+        Entra cada arquivo conhecido, na versão atual do seu conteúdo; arquivos com o mesmo
+        conteúdo contam uma vez cada um.
+        """
+        sql = ("SELECT r.configuracao, c.parametros, r.estrategia, COUNT(*) AS arquivos, SUM(r.rodadas) AS rodadas, "
+               "SUM(r.ganho_liquido) AS ganho_total, AVG(r.ganho_liquido) AS ganho_medio, "
+               "AVG(r.ganho_liquido > 0) AS fracao_com_lucro "
+               "FROM arquivos a JOIN resultados r ON r.hash_arquivo = a.hash "
+               "JOIN configuracoes c ON c.chave = r.configuracao")
+        filtros, valores = [], []
+        if estrategia is not None:
+            filtros.append("r.estrategia = ?")
+            valores.append(estrategia)
+        if filtros:
+            sql += " WHERE " + " AND ".join(filtros)
+        sql += " GROUP BY r.configuracao, r.estrategia ORDER BY r.configuracao, r.estrategia"
+        return [dict(registro, parametros=json.loads(registro["parametros"]))
+                for registro in self.conexao.execute(sql, valores)]
+
+
+# Função para imprimir a comparação entre as configurações guardadas
+def imprimir_resumo(linhas):
+    print(f"{'configuracao':<17} {'estrategia':<20} {'arquivos':>8} {'rodadas':>9} {'ganho total':>12} "
+          f"{'ganho medio':>12} {'com lucro':>10}")
+    for linha in linhas:
+        print(f"{linha['configuracao']:<17} {linha['estrategia']:<20} {linha['arquivos']:>8} {linha['rodadas']:>9} "
+              f"{linha['ganho_total']:>12.2f} {linha['ganho_medio']:>12.3f} {linha['fracao_com_lucro']:>10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consulta os resultados guardados por simulador_lote.py --armazem.")
+    parser.add_argument("banco", help="Arquivo SQLite do armazém")
+    parser.add_argument("--estrategia")
+    parser.add_argument("--configuracoes", action="store_true", help="Mostra os parâmetros de cada configuração")
+    argumentos = parser.parse_args()
+
+    with ArmazemResultados(argumentos.banco) as armazem:
+        resumo = armazem.resumo_por_configuracao(argumentos.estrategia)
+        imprimir_resumo(resumo)
+        if argumentos.configuracoes:
+            for chave, parametros in dict((linha["configuracao"], linha["parametros"]) for linha in resumo).items():
+                print(f"{chave}: {json.dumps(parametros, sort_keys=True)}")
@@ -0,0 +1,356 @@
+import numpy as np
+
+from estrategias import obter_estrategia
+from historico_colunar import HistoricoApostas
+import tabela_roleta
+
+
+ESTRATEGIAS = ["martingale", "fibonacci", "dalembert", "paroli", "labouchere", "nenhuma_estrategia"]
+
+# Índice da coluna (0, 1, 2) de cada número da roleta; -1 (FORA) para o zero
+COLUNA_DO_NUMERO = np.array(tabela_roleta.COLUNA_DO_NUMERO, dtype=np.int8)
+
+
+def estatisticas_janelas(numeros, tamanho_janela, limite_tempo=5):
+    """
+    Calcula, de uma vez, as estatísticas de todas as janelas deslizantes de um histórico.
+
+    A janela i corresponde a numeros[i:i + tamanho_janela], ou seja, às estatísticas usadas
+    por simular_apostas para decidir a aposta do resultado numeros[i + tamanho_janela].
+
+    Parâmetros:
+    - numeros: Array com os números sorteados (janela inicial seguida dos resultados).
+    - tamanho_janela: Tamanho da janela analisada.
+    - limite_tempo: Mesmo parâmetro de calcular_repeticoes_antigas.
+
+    Retorna:
+    - Quatro arrays (n, 3) com frequências, atrasos, repetições recentes e repetições antigas,
+      equivalentes a contar_frequencias, calcular_atrasos, calcular_repeticoes_recentes e
+      calcular_repeticoes_antigas aplicadas a cada janela.
+    """
+    colunas = COLUNA_DO_NUMERO[numeros]
+    total = len(colunas)
+    n = total - tamanho_janela
+    indices_colunas = np.arange(3)
+    inicio = np.arange(n)
+    fim = inicio + tamanho_janela
+
+    # Frequências por contagem acumulada
+    uma_quente = colunas[:, None] == indices_colunas
+    contagem = np.zeros((total + 1, 3), dtype=np.int64)
+    np.cumsum(uma_quente, axis=0, out=contagem[1:])
+    frequencias = contagem[fim] - contagem[inicio]
+
+    # Atrasos pela última aparição de cada coluna antes do fim da janela
+    ultima = np.maximum.accumulate(np.where(uma_quente, np.arange(total)[:, None], -1), axis=0)
+    ultima_na_janela = ultima[fim - 1] if tamanho_janela > 0 else np.full((n, 3), -1)
+    atrasos = np.where(ultima_na_janela >= inicio[:, None], fim[:, None] - ultima_na_janela,
+                       2 * tamanho_janela)
+
+    recentes = np.zeros((n, 3), dtype=np.int64)
+    antigas = np.zeros((n, 3), dtype=np.int64)
+
+    # Sequência sem o zero e suas sequências consecutivas
+    nao_zero = colunas >= 0
+    filtrada = colunas[nao_zero]
+    m = len(filtrada)
+    if m == 0 or n <= 0:
+        return frequencias, atrasos, recentes, antigas
+    posicao_filtrada = np.zeros(total + 1, dtype=np.int64)
+    np.cumsum(nao_zero, out=posicao_filtrada[1:])
+    s = posicao_filtrada[inicio]
+    e = posicao_filtrada[fim]
+    valida = e > s
+
+    novo = np.ones(m, dtype=bool)
+    novo[1:] = filtrada[1:] != filtrada[:-1]
+    seq_inicio = np.flatnonzero(novo)
+    seq_fim = np.append(seq_inicio[1:], m)
+    seq_comprimento = seq_fim - seq_inicio
+    seq_coluna = filtrada[seq_inicio]
+    seq_de = np.cumsum(novo) - 1
+    contribuicao = np.where(seq_comprimento > 1, seq_comprimento, 0)
+
+    # Repetições recentes: última sequência visível com 2 ou mais ocorrências
+    ultima_seq = seq_de[np.clip(e - 1, 0, m - 1)]
+    visivel_ultima = e - np.maximum(seq_inicio[ultima_seq], s)
+    coluna_ultima = seq_coluna[ultima_seq]
+    indices_seq = np.arange(len(seq_inicio))
+    for c in range(3):
+        marcada = (seq_coluna == c) & (seq_comprimento > 1)
+        anterior = np.empty(len(seq_inicio), dtype=np.int64)
+        anterior[0] = -1
+        anterior[1:] = np.maximum.accumulate(np.where(marcada, indices_seq, -1))[:-1]
+        q = anterior[ultima_seq]
+        qi = np.maximum(q, 0)
+        visivel_q = np.where(q >= 0, seq_fim[qi] - np.maximum(seq_inicio[qi], s), 0)
+        recentes[:, c] = np.where(
+            valida & (coluna_ultima == c) & (visivel_ultima > 1), visivel_ultima,
+            np.where(valida & (visivel_q > 1), visivel_q, 0))
+
+    # Repetições antigas: soma das sequências visíveis depois dos primeiros 'limite_tempo'
+    a = s + limite_tempo
+    ok = a < e
+    seq_a = seq_de[np.clip(a, 0, m - 1)]
+    mesma = seq_a == ultima_seq
+    acumulado = np.zeros((len(seq_inicio) + 1, 3), dtype=np.int64)
+    np.cumsum(contribuicao[:, None] * (seq_coluna[:, None] == indices_colunas), axis=0, out=acumulado[1:])
+    cabeca = np.where(mesma, e - a, seq_fim[seq_a] - a)
+    cauda = e - seq_inicio[ultima_seq]
+    meio = acumulado[ultima_seq] - acumulado[np.minimum(seq_a + 1, ultima_seq)]
+    antigas[:] = np.where((ok & ~mesma)[:, None], meio, 0)
+    for c in range(3):
+        antigas[:, c] += np.where(ok & (seq_coluna[seq_a] == c) & (cabeca > 1), cabeca, 0)
+        antigas[:, c] += np.where(ok & ~mesma & (coluna_ultima == c) & (cauda > 1), cauda, 0)
+    return frequencias, atrasos, recentes, antigas
+
+
+# Equivalente vetorizado de gerar_pesos
+def gerar_pesos_vetorizado(frequencias, atrasos, recentes, antigas, tamanho_janela):
+    total_frequencia = frequencias.sum(axis=1)
+    peso_frequencia = np.where(total_frequencia > 0, 1 / (total_frequencia + 1), 0.5)
+    if tamanho_janela > 0:
+        peso_atraso = atrasos.sum(axis=1) / tamanho_janela
+        peso_repeticao = -recentes.sum(axis=1) / tamanho_janela
+        peso_repeticao_antiga = antigas.sum(axis=1) / tamanho_janela
+    else:
+        # Sem janela analisada, os mesmos valores fixos de gerar_pesos
+        peso_atraso = np.full(len(frequencias), 0.3)
+        peso_repeticao = np.full(len(frequencias), -0.2)
+        peso_repeticao_antiga = np.full(len(frequencias), 0.3)
+    soma_pesos = peso_frequencia + peso_atraso + np.abs(peso_repeticao) + peso_repeticao_antiga
+    return (peso_frequencia / soma_pesos, peso_atraso / soma_pesos,
+            peso_repeticao / soma_pesos, peso_repeticao_antiga / soma_pesos)
+
+
+def coluna_excluida(frequencias, atrasos, recentes, antigas, peso_frequencia, peso_atraso,
+                    peso_repeticao, peso_repeticao_antiga):
+    """
+    Equivalente vetorizado de escolher_colunas_dinamicamente.
+
+    Como apenas uma das três colunas fica de fora, retorna para cada janela o índice da
+    coluna não escolhida: a de menor pontuação, com empate resolvido como no sorted
+    estável do escalar (fica de fora a de maior índice).
+    """
+    def coluna(peso):
+        return peso[:, None] if np.ndim(peso) else peso
+    pontuacao = (coluna(peso_frequencia) * frequencias +
+                 coluna(peso_atraso) * (1 / (atrasos + 1)) -
+                 coluna(peso_repeticao) * recentes +
+                 coluna(peso_repeticao_antiga) * antigas)
+    p0, p1, p2 = pontuacao[:, 0], pontuacao[:, 1], pontuacao[:, 2]
+    return np.where((p2 <= p0) & (p2 <= p1), 2, np.where(p1 <= p0, 1, 0))
+
+
+def mascara_vitorias(numeros, tamanho_janela, pesos_padrao=(0.7, 0.3, 0.0, 0.2)):
+    """
+    Calcula a máscara de vitórias de cada rodada nos dois modos de escolha de simular_apostas.
+
+    Retorna:
+    - vitorias_padrao: Vitória usando os pesos fixos (ou gerar_pesos quando sai o zero).
+    - vitorias_dinamicas: Vitória usando sempre gerar_pesos (após perdas consecutivas).
+    """
+    estatisticas = estatisticas_janelas(numeros, tamanho_janela)
+    return mascaras_de_estatisticas(estatisticas, numeros[tamanho_janela:], tamanho_janela, pesos_padrao)
+
+
+# Mesmo que mascara_vitorias, a partir de estatísticas já calculadas e dos números apostados
+def mascaras_de_estatisticas(estatisticas, sorteados, tamanho_janela, pesos_padrao=(0.7, 0.3, 0.0, 0.2)):
+    colunas_sorteadas = COLUNA_DO_NUMERO[sorteados]
+    excluida_padrao = coluna_excluida(*estatisticas, *pesos_padrao)
+    excluida_dinamica = coluna_excluida(*estatisticas, *gerar_pesos_vetorizado(*estatisticas, tamanho_janela))
+    vitorias_dinamicas = (colunas_sorteadas >= 0) & (colunas_sorteadas != excluida_dinamica)
+    vitorias_padrao = np.where(colunas_sorteadas < 0, vitorias_dinamicas,
+                               colunas_sorteadas != excluida_padrao)
+    return vitorias_padrao, vitorias_dinamicas
+
+
+def resolver_vitorias(vitorias_padrao, vitorias_dinamicas, max_perdas_consecutivas=3):
+    """
+    Combina os dois modos conforme o contador de perdas consecutivas de simular_apostas.
+
+    Com menos de duas perdas seguidas vale o modo padrão; a partir da segunda perda vale o
+    dinâmico até a próxima vitória. Cada episódio começa em duas perdas seguidas no modo
+    padrão e termina na primeira vitória dinâmica; o episódio seguinte é o primeiro que começa
+    depois dela. Essa cadeia de episódios é percorrida por saltos dobrados (log n passagens de
+    array), sem laço em Python por episódio.
+
+    Retorna:
+    - A máscara de vitórias efetiva e quantas rodadas são jogadas até o limite de perdas consecutivas.
+    """
+    n = len(vitorias_padrao)
+    if max_perdas_consecutivas <= 1:
+        perdas = np.flatnonzero(~vitorias_padrao)
+        return vitorias_padrao.copy(), int(perdas[0]) + 1 if len(perdas) else n
+    # Rodadas j em que j - 1 e j são perdas no modo padrão
+    duplas = np.flatnonzero(~vitorias_padrao[1:] & ~vitorias_padrao[:-1]) + 1
+    if len(duplas) == 0:
+        return vitorias_padrao.copy(), n
+    if max_perdas_consecutivas == 2:
+        return vitorias_padrao.copy(), int(duplas[0]) + 1
+
+    # Para cada episódio: a primeira vitória dinâmica, a rodada do limite de perdas e o próximo episódio
+    quantidade = len(duplas)
+    vitorias_altas = np.append(np.flatnonzero(vitorias_dinamicas), n)
+    vitoria = vitorias_altas[np.searchsorted(vitorias_altas, duplas + 1)]
+    parada = duplas + max_perdas_consecutivas - 2
+    encerra = vitoria > parada
+    proximo = np.append(np.where(encerra, quantidade, np.searchsorted(duplas, vitoria + 2)), quantidade)
+
+    # Episódios alcançados a partir do primeiro: após a etapa com salto de 2**i episódios,
+    # 'alcancado' contém os 2**(i + 1) primeiros da cadeia
+    alcancado = np.zeros(quantidade + 1, dtype=bool)
+    alcancado[0] = True
+    salto = proximo
+    passo = 1
+    while passo <= quantidade:
+        alcancado[salto[alcancado]] = True
+        salto = salto[salto]
+        passo *= 2
+    episodios = np.flatnonzero(alcancado[:quantidade])
+
+    # Em cada episódio vale o modo dinâmico até a vitória (ou até o limite, só com derrotas)
+    inicio = duplas[episodios] + 1
+    fim = np.minimum(np.minimum(vitoria[episodios], parada[episodios]) + 1, n)
+    marcas = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(marcas, inicio, 1)
+    np.add.at(marcas, fim, -1)
+    dinamico = np.cumsum(marcas[:n]) > 0
+    vitorias = np.where(dinamico, vitorias_dinamicas, vitorias_padrao)
+    ultimo = episodios[-1]
+    return vitorias, int(fim[-1]) if encerra[ultimo] else n
+
+
+def resolver_vitorias_lote(vitorias_padrao, vitorias_dinamicas, max_perdas_consecutivas=3):
+    """
+    Versão de resolver_vitorias para várias sessões (linhas), avançando rodada a rodada
+    com o contador de perdas consecutivas de todas as sessões num array.
+    """
+    sessoes, rodadas = vitorias_padrao.shape
+    vitorias = np.empty_like(vitorias_padrao)
+    perdas_consecutivas = np.zeros(sessoes, dtype=np.int64)
+    jogadas = np.full(sessoes, rodadas, dtype=np.int64)
+    for t in range(rodadas):
+        vitoria = np.where(perdas_consecutivas > 1, vitorias_dinamicas[:, t], vitorias_padrao[:, t])
+        vitorias[:, t] = vitoria
+        perdas_consecutivas = np.where(vitoria, 0, perdas_consecutivas + 1)
+        jogadas[(perdas_consecutivas == max_perdas_consecutivas) & (jogadas == rodadas)] = t + 1
+    return vitorias, jogadas
+
+
+def saldos_por_rodada(apostas, vitorias, saldo_inicial):
+    """
+    Saldo após retirar cada aposta e após cada rodada, ao longo do último eixo.
+
+    A retirada da aposta e o prêmio são intercalados numa única soma acumulada, na mesma
+    ordem das operações de simular_apostas, para que os valores sejam idênticos.
+    """
+    with np.errstate(invalid="ignore"):
+        operacoes = np.empty(apostas.shape[:-1] + (2 * apostas.shape[-1] + 1,))
+        operacoes[..., 0] = saldo_inicial
+        operacoes[..., 1::2] = -apostas
+        operacoes[..., 2::2] = np.where(vitorias, (apostas / 2) * 3, 0.0)
+        saldos = np.cumsum(operacoes, axis=-1)
+    return saldos[..., 1::2], saldos[..., 2::2]
+
+
+def encerramento(apos_aposta, apos_rodada, vitorias, jogadas, saldo_inicial, stop_gain, stop_loss):
+    """
+    Rodada em que cada sessão termina pelas regras de gestão de risco.
+
+    Parâmetros:
+    - apos_aposta, apos_rodada: Saldos de saldos_por_rodada (linhas = sessões).
+    - vitorias: Máscara de vitórias (linhas = sessões).
+    - jogadas: Rodadas jogadas por sessão até o limite de perdas consecutivas.
+
+    Retorna:
+    - fim: Quantidade de rodadas registradas no histórico de cada sessão.
+    - insuficiente: Se a sessão terminou por saldo insuficiente para a próxima aposta.
+    """
+    if apos_aposta.shape[-1] == 0:
+        vazio = np.zeros(apos_aposta.shape[:-1], dtype=np.int64)
+        return vazio, vazio.astype(bool)
+    with np.errstate(invalid="ignore"):
+        insuficiente = apos_aposta <= 0
+        parada = (insuficiente |
+                  (vitorias & (apos_rodada - saldo_inicial >= stop_gain)) |
+                  (~vitorias & (apos_rodada - saldo_inicial <= stop_loss)))
+    rodadas = parada.shape[-1]
+    primeira = np.where(parada.any(axis=-1), parada.argmax(axis=-1), rodadas)
+    indice = np.minimum(primeira, rodadas - 1)[..., None]
+    por_saldo = np.take_along_axis(insuficiente, indice, axis=-1)[..., 0] & (primeira < jogadas)
+    fim = np.where(por_saldo, primeira, np.minimum(primeira + 1, jogadas))
+    return fim, por_saldo
+
+
+def simular_apostas_vetorizado(resultados, resultados_analisados, saldo_inicial=100, aposta_base=10,
+                               estrategias=ESTRATEGIAS, max_perdas_consecutivas=3, stop_gain=20, stop_loss=-5,
+                               pesos_padrao=(0.7, 0.3, 0.0, 0.2), historico_colunar=False):
+    """
+    Executa simular_apostas para várias estratégias de uma vez usando NumPy.
+
+    A máscara de vitórias é a mesma para todas as estratégias (a escolha das colunas não
+    depende da progressão das apostas), então é calculada uma única vez em passagens de array.
+    Os saldos de todas as estratégias evoluem juntos numa matriz (estratégia x rodada).
+
+    Parâmetros:
+    - resultados: Lista de tuplas no formato [[numero, cor], ...] a apostar.
+    - resultados_analisados: Janela inicial analisada (não é modificada).
+    - saldo_inicial, aposta_base: Como em simular_apostas.
+    - estrategias: Lista de estratégias a simular.
+    - max_perdas_consecutivas, stop_gain, stop_loss, pesos_padrao: Como em simular_apostas.
+    - historico_colunar: Se True, o histórico é um HistoricoApostas em vez da lista de tuplas.
+
+    Retorna:
+    - Um dicionário {estrategia: (saldo_final, historico, ganho_liquido)} igual ao de simular_apostas.
+    """
+    tamanho_janela = len(resultados_analisados)
+    numeros = np.concatenate([_numeros_de(resultados_analisados), _numeros_de(resultados)])
+    resultado = simular_numeros_vetorizado(numeros, tamanho_janela, saldo_inicial, aposta_base, estrategias,
+                                           max_perdas_consecutivas, stop_gain, stop_loss, pesos_padrao)
+    if not historico_colunar:
+        resultado = {estrategia: (saldo_final, list(historico), ganho_liquido)
+                     for estrategia, (saldo_final, historico, ganho_liquido) in resultado.items()}
+    return resultado
+
+
+# Array de números de uma lista [[numero, cor], ...] ou de resultados com array próprio (ResultadosBinarios)
+def _numeros_de(resultados):
+    if hasattr(resultados, "numeros"):
+        return np.asarray(resultados.numeros)
+    return np.fromiter((numero for numero, _ in resultados), dtype=np.int64, count=len(resultados))
+
+
+def simular_numeros_vetorizado(numeros, tamanho_janela, saldo_inicial=100, aposta_base=10,
+                               estrategias=ESTRATEGIAS, max_perdas_consecutivas=3, stop_gain=20, stop_loss=-5,
+                               pesos_padrao=(0.7, 0.3, 0.0, 0.2)):
+    """
+    Mesmo que simular_apostas_vetorizado, recebendo um array de números em que os primeiros
+    'tamanho_janela' formam a janela inicial analisada e o restante é apostado.
+
+    O histórico de cada estratégia é um HistoricoApostas sobre as linhas das matrizes de apostas
+    e saldos, sem montar tuplas por rodada; list(historico) dá a lista de simular_apostas.
+    """
+    padrao, dinamicas = mascara_vitorias(numeros, tamanho_janela, pesos_padrao)
+    vitorias, jogadas = resolver_vitorias(padrao, dinamicas, max_perdas_consecutivas)
+    vitorias = vitorias[:jogadas]
+    sorteados = np.asarray(numeros[tamanho_janela:tamanho_janela + jogadas], dtype=np.uint8)
+
+    # Matriz de apostas (estratégia x rodada)
+    apostas = np.zeros((len(estrategias), jogadas))
+    registradas = np.zeros((len(estrategias), jogadas))
+    with np.errstate(over="ignore"):
+        for linha, estrategia in enumerate(estrategias):
+            apostas[linha], registradas[linha] = obter_estrategia(estrategia).apostas_lote(
+                vitorias, aposta_base, saldo_inicial)
+    apos_aposta, apos_rodada = saldos_por_rodada(apostas, vitorias, saldo_inicial)
+    fins, _ = encerramento(apos_aposta, apos_rodada, vitorias, jogadas, saldo_inicial, stop_gain, stop_loss)
+
+    resultado = {}
+    for linha, estrategia in enumerate(estrategias):
+        fim = int(fins[linha])
+        saldo_final = float(apos_rodada[linha, fim - 1]) if fim > 0 else saldo_inicial
+        historico = HistoricoApostas.de_colunas(sorteados[:fim], vitorias[:fim], registradas[linha, :fim],
+                                                apos_rodada[linha, :fim])
+        resultado[estrategia] = (saldo_final, historico, saldo_final - saldo_inicial)
+    return resultado
@@ -0,0 +1,229 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import simulador_rodadas_com_graficos as simulador
+from tabela_roleta import NOME_COR_DO_NUMERO
+
+
+TAMANHOS_HISTORICO = [10 ** 3, 10 ** 4, 10 ** 5]
+TAMANHOS_JANELA = [30, 300, 3000]
+DIRETORIO_RESULTADOS = "resultados_benchmark"
+
+# Limites que não encerram a simulação, para que o histórico inteiro seja percorrido
+SEM_LIMITES = dict(saldo_inicial=10 ** 12, aposta_base=1, estrategia="nenhuma_estrategia",
+                   max_perdas_consecutivas=10 ** 12, stop_gain=10 ** 15, stop_loss=-10 ** 15)
+
+
+def gerar_historico(tamanho, semente=0):
+    """Gera um histórico sintético reproduzível no formato [[numero, cor], ...]."""
+    gerador = random.Random(semente)
+    return [[numero, NOME_COR_DO_NUMERO[numero]] for numero in (gerador.randrange(37) for _ in range(tamanho))]
+
+
+def medir(funcao, repeticoes=1, memoria=True, preparar=None):
+    """
+    Mede o menor tempo entre as repetições e, opcionalmente, o pico de memória (tracemalloc)
+    numa execução separada, para que o rastreamento não distorça o tempo.
+
+    'preparar' é chamada antes de cada execução, fora da medição (ex.: esvaziar os caches).
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    pico = None
+    if memoria:
+        if preparar:
+            preparar()
+        tracemalloc.start()
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return min(tempos), pico
+
+
+# resultados_processados=None quando a função não percorre resultados (só chamadas por segundo)
+def _linha(funcao, tamanho_historico, tamanho_janela, chamadas, resultados_processados, tempo, pico):
+    return {
+        "funcao": funcao,
+        "tamanho_historico": tamanho_historico,
+        "tamanho_janela": tamanho_janela,
+        "chamadas": chamadas,
+        "tempo_total_s": tempo,
+        "tempo_por_chamada_s": tempo / chamadas if chamadas else None,
+        "chamadas_por_s": chamadas / tempo if tempo > 0 else None,
+        "resultados_por_s": resultados_processados / tempo if resultados_processados and tempo > 0 else None,
+        "pico_memoria_bytes": pico,
+    }
+
+
+def benchmark_estatisticas(tamanhos_janela, chamadas=200, semente=0, memoria=True):
+    """Tempo por chamada das funções de estatística e do escolhedor de colunas para cada janela."""
+    linhas = []
+    for tamanho_janela in tamanhos_janela:
+        janela = gerar_historico(tamanho_janela, semente)
+        funcoes = {
+            "contar_frequencias": lambda: simulador.contar_frequencias(janela),
+            "calcular_atrasos": lambda: simulador.calcular_atrasos(janela),
+            "calcular_repeticoes_recentes": lambda: simulador.calcular_repeticoes_recentes(janela),
+            "calcular_repeticoes_antigas": lambda: simulador.calcular_repeticoes_antigas(janela),
+        }
+        frequencias = simulador.contar_frequencias(janela)
+        atrasos = simulador.calcular_atrasos(janela)
+        recentes = simulador.calcular_repeticoes_recentes(janela)
+        antigas = simulador.calcular_repeticoes_antigas(janela)
+        funcoes["escolher_colunas_dinamicamente"] = lambda: simulador.escolher_colunas_dinamicamente(
+            frequencias, atrasos, recentes, antigas)
+        for nome, funcao in funcoes.items():
+            def repetir(funcao=funcao):
+                for _ in range(chamadas):
+                    funcao()
+            tempo, pico = medir(repetir, repeticoes=3, memoria=memoria)
+            # O escolhedor recebe as estatísticas prontas, não percorre a janela: só chamadas por segundo
+            processados = None if nome == "escolher_colunas_dinamicamente" else chamadas * tamanho_janela
+            linhas.append(_linha(nome, None, tamanho_janela, chamadas, processados, tempo, pico))
+    return linhas
+
+
+def benchmark_simulacao(tamanhos_historico, tamanhos_janela, semente=0, memoria=True, vetorizado=True):
+    """
+    Vazão de simular_apostas (e do modo vetorizado, se disponível) para cada histórico e janela.
+
+    simular_apostas é medido com CACHE_COLUNAS e CACHE_PESOS vazios antes de cada execução
+    ("simular_apostas") e de novo com os caches preenchidos pela execução anterior
+    ("simular_apostas_cache_quente"), para que uma medição não herde os acertos de outra.
+    """
+    linhas = []
+    for tamanho_historico in tamanhos_historico:
+        for tamanho_janela in tamanhos_janela:
+            historico = gerar_historico(tamanho_historico + tamanho_janela, semente)
+            apostados = historico[tamanho_janela:]
+
+            def simular():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    simulador.simular_apostas(apostados, historico[:tamanho_janela], **SEM_LIMITES)
+            tempo, pico = medir(simular, memoria=memoria, preparar=_esvaziar_caches)
+            linhas.append(_linha("simular_apostas", tamanho_historico, tamanho_janela, 1, tamanho_historico,
+                                 tempo, pico))
+            simular()
+            tempo, pico = medir(simular, memoria=memoria)
+            linhas.append(_linha("simular_apostas_cache_quente", tamanho_historico, tamanho_janela, 1,
+                                 tamanho_historico, tempo, pico))
+
+            if vetorizado:
+                import numpy as np
+                from backtest_vetorizado import simular_numeros_vetorizado
+                numeros = np.array([numero for numero, _ in historico], dtype=np.uint8)
+                limites = dict(SEM_LIMITES)
+                limites["estrategias"] = [limites.pop("estrategia")]
+
+                def simular_vetorizado():
+                    simular_numeros_vetorizado(numeros, tamanho_janela, **limites)
+                tempo, pico = medir(simular_vetorizado, memoria=memoria)
+                linhas.append(_linha("simular_numeros_vetorizado", tamanho_historico, tamanho_janela, 1,
+                                     tamanho_historico, tempo, pico))
+    return linhas
+
+
+def _esvaziar_caches():
+    simulador.CACHE_COLUNAS.limpar()
+    simulador.CACHE_PESOS.limpar()
+
+
+def _versao_codigo():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def salvar_resultados(linhas, parametros, diretorio=DIRETORIO_RESULTADOS):
+    """Grava os resultados em JSON (com metadados) e CSV; retorna o caminho do JSON."""
+    os.makedirs(diretorio, exist_ok=True)
+    carimbo = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base = os.path.join(diretorio, f"benchmark_{carimbo}")
+    dados = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "versao_codigo": _versao_codigo(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": parametros,
+        "resultados": linhas,
+    }
+    with open(base + ".json", "w") as f:
+        json.dump(dados, f, indent=2)
+    with open(base + ".csv", "w", newline="") as f:
+        escritor = csv.DictWriter(f, fieldnames=list(linhas[0]))
+        escritor.writeheader()
+        escritor.writerows(linhas)
+    return base + ".json"
+
+
+def comparar(linhas, caminho_anterior, tolerancia=0.10):
+    """
+    Compara com uma execução anterior e imprime a variação do tempo de cada medição.
+
+    Retorna a lista de medições que ficaram mais lentas que a tolerância (regressões).
+    """
+    with open(caminho_anterior) as f:
+        anteriores = {(l["funcao"], l["tamanho_historico"], l["tamanho_janela"]): l for l in json.load(f)["resultados"]}
+    regressoes = []
+    for linha in linhas:
+        chave = (linha["funcao"], linha["tamanho_historico"], linha["tamanho_janela"])
+        anterior = anteriores.get(chave)
+        if not anterior:
+            continue
+        variacao = linha["tempo_por_chamada_s"] / anterior["tempo_por_chamada_s"] - 1
+        marca = "  <-- regressão" if variacao > tolerancia else ""
+        print(f"{chave[0]:<32} hist={chave[1]!s:>9} janela={chave[2]!s:>6} {variacao:+8.1%}{marca}")
+        if variacao > tolerancia:
+            regressoes.append(chave)
+    return regressoes
+
+
+def imprimir_resultados(linhas):
+    print(f"{'funcao':<32} {'historico':>10} {'janela':>7} {'tempo/chamada':>14} {'chamadas/s':>12} "
+          f"{'resultados/s':>14} {'pico KiB':>10}")
+    for linha in linhas:
+        pico = f"{linha['pico_memoria_bytes'] / 1024:.0f}" if linha["pico_memoria_bytes"] is not None else "-"
+        chamadas = f"{linha['chamadas_por_s']:.0f}" if linha["chamadas_por_s"] else "-"
+        vazao = f"{linha['resultados_por_s']:.0f}" if linha["resultados_por_s"] else "-"
+        print(f"{linha['funcao']:<32} {linha['tamanho_historico']!s:>10} {linha['tamanho_janela']:>7} "
+              f"{linha['tempo_por_chamada_s']:>14.6f} {chamadas:>12} {vazao:>14} {pico:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark das funções de simulação.")
+    parser.add_argument("--historicos", type=int, nargs="+", default=TAMANHOS_HISTORICO,
+                        help="Tamanhos de histórico (ex.: 1000 10000 ... 10000000)")
+    parser.add_argument("--janelas", type=int, nargs="+", default=TAMANHOS_JANELA)
+    parser.add_argument("--chamadas", type=int, default=200, help="Chamadas por medição das estatísticas")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória")
+    parser.add_argument("--sem-vetorizado", action="store_true", help="Não mede o modo vetorizado (NumPy)")
+    parser.add_argument("--saida", default=DIRETORIO_RESULTADOS)
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparação")
+    argumentos = parser.parse_args()
+
+    memoria = not argumentos.sem_memoria
+    linhas = benchmark_estatisticas(argumentos.janelas, argumentos.chamadas, argumentos.semente, memoria)
+    linhas += benchmark_simulacao(argumentos.historicos, argumentos.janelas, argumentos.semente, memoria,
+                                  not argumentos.sem_vetorizado)
+    imprimir_resultados(linhas)
+    print("Resultados salvos em " + salvar_resultados(linhas, vars(argumentos), argumentos.saida))
+    if argumentos.comparar:
+        comparar(linhas, argumentos.comparar)
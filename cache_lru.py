@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache limitado que descarta o item usado há mais tempo quando a capacidade é excedida.
+
+    Conta acertos, falhas e descartes para medir o aproveitamento (veja estatisticas).
+    Os valores guardados são devolvidos sem cópia, então não devem ser modificados.
+
+    Parâmetros:
+    - capacidade: Quantidade máxima de itens guardados.
+    """
+
+    def __init__(self, capacidade=16384):
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave):
+        """Retorna o valor guardado para a chave, ou None (contando uma falha) se não houver."""
+        valor = self._itens.get(chave)
+        if valor is None:
+            self.falhas += 1
+            return None
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return valor
+
+    def guardar(self, chave, valor):
+        self._itens[chave] = valor
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+            self.descartes += 1
+
+    def limpar(self):
+        """Esvazia o cache e zera os contadores."""
+        self._itens.clear()
+        self.acertos = self.falhas = self.descartes = 0
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {
+            "itens": len(self._itens),
+            "capacidade": self.capacidade,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "descartes": self.descartes,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,146 @@
+import glob
+import json
+import os
+import re
+from datetime import datetime
+
+
+# Os arquivos gravados usam historico_jogo_DDMMAAAA_HHMMSS.json ou historico_jogo_AAAAMMDD_HHMMSS.json
+PADRAO_NOME = re.compile(r"historico_jogo_(\d{8})_(\d{6})")
+FORMATOS_DATA = ("%d%m%Y%H%M%S", "%Y%m%d%H%M%S")
+TAMANHO_BLOCO = 64 * 1024
+
+
+def data_do_arquivo(caminho):
+    """
+    Retorna a data e hora da sessão a partir do nome do arquivo, ou None se o nome não segue o padrão.
+    """
+    encontrado = PADRAO_NOME.search(os.path.basename(caminho))
+    if not encontrado:
+        return None
+    texto = encontrado.group(1) + encontrado.group(2)
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            continue
+    return None
+
+
+def listar_arquivos_historico(origem):
+    """
+    Lista os arquivos de histórico em ordem cronológica.
+
+    Parâmetros:
+    - origem: Diretório (usa historico_jogo_*.json dentro dele), padrão glob, caminho de
+      arquivo ou lista com qualquer combinação desses.
+
+    Retorna:
+    - Lista de caminhos ordenada pela data no nome do arquivo; arquivos sem data no nome
+      vêm por último, em ordem alfabética.
+    """
+    origens = [origem] if isinstance(origem, (str, os.PathLike)) else list(origem)
+    caminhos = set()
+    for item in origens:
+        item = os.fspath(item)
+        if os.path.isdir(item):
+            caminhos.update(glob.glob(os.path.join(item, "historico_jogo_*.json")))
+        elif glob.has_magic(item):
+            caminhos.update(glob.glob(item))
+        else:
+            caminhos.add(item)
+
+    def chave(caminho):
+        data = data_do_arquivo(caminho)
+        return (data is None, data or datetime.min, caminho)
+    return sorted(caminhos, key=chave)
+
+
+def ler_resultados(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê um arquivo JSON com uma lista de resultados ([[numero, cor], ...]) sem carregá-lo inteiro.
+
+    O arquivo é lido em blocos e cada elemento da lista é decodificado assim que fica completo,
+    então a memória usada depende do tamanho do bloco e não do tamanho do arquivo. Arquivos que
+    json.load recusaria (sem a lista, truncados ou com dados depois do ']') levantam
+    json.JSONDecodeError (um ValueError), mesmo que alguns resultados já tenham sido produzidos.
+
+    Retorna:
+    - Um gerador com os resultados no formato [numero, cor].
+    """
+    decodificador = json.JSONDecoder()
+    with open(caminho, "r") as f:
+        texto = ""
+        posicao = 0
+        fim_arquivo = False
+        # O que pode vir a seguir: a abertura da lista, o primeiro elemento (ou o fechamento),
+        # um separador (vírgula ou fechamento) ou um elemento depois da vírgula
+        esperado = "abertura"
+        while True:
+            while posicao < len(texto) and texto[posicao] in " \t\r\n":
+                posicao += 1
+            if posicao < len(texto):
+                caractere = texto[posicao]
+                if esperado == "abertura":
+                    if caractere != "[":
+                        raise json.JSONDecodeError("o arquivo deve conter uma lista JSON", texto, posicao)
+                    posicao += 1
+                    esperado = "primeiro"
+                    continue
+                if caractere == "]" and esperado in ("primeiro", "separador"):
+                    _conferir_fim(f, texto[posicao + 1:], tamanho_bloco)
+                    return
+                if esperado == "separador":
+                    if caractere != ",":
+                        raise json.JSONDecodeError("esperado ',' ou ']'", texto, posicao)
+                    posicao += 1
+                    esperado = "elemento"
+                    continue
+                try:
+                    resultado, fim = decodificador.raw_decode(texto, posicao)
+                except json.JSONDecodeError:
+                    if fim_arquivo:
+                        raise
+                else:
+                    # Um número no fim do bloco pode estar incompleto (ex.: "6e" de "6e4"): o elemento
+                    # só vale quando o que vem depois dele já está no bloco
+                    if fim_arquivo or (fim < len(texto) and texto[fim] in " \t\r\n,]"):
+                        posicao = fim
+                        esperado = "separador"
+                        yield resultado
+                        continue
+            if fim_arquivo:
+                # Arquivo truncado: json.load também recusa uma lista sem o ']'
+                raise json.JSONDecodeError("fim do arquivo antes do fechamento da lista", texto, len(texto))
+            bloco = f.read(tamanho_bloco)
+            fim_arquivo = not bloco
+            texto = texto[posicao:] + bloco
+            posicao = 0
+
+
+# Depois do ']' só pode haver espaços até o fim do arquivo, como em json.load
+def _conferir_fim(f, resto, tamanho_bloco):
+    while True:
+        if resto.strip(" \t\r\n"):
+            raise json.JSONDecodeError("dados depois do fim da lista", resto, 0)
+        resto = f.read(tamanho_bloco)
+        if not resto:
+            return
+
+
+def carregar_resultados_em_fluxo(origem, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Percorre os resultados de vários arquivos de histórico, em ordem cronológica, um a um.
+
+    Parâmetros:
+    - origem: Diretório, padrão glob, arquivo ou lista deles (veja listar_arquivos_historico).
+
+    Retorna:
+    - Um gerador com os resultados no formato [numero, cor], que pode ser passado
+      diretamente para simular_apostas e para as funções de estatística.
+    """
+    for caminho in listar_arquivos_historico(origem):
+        try:
+            yield from ler_resultados(caminho, tamanho_bloco)
+        except json.JSONDecodeError:
+            print(f"Erro ao decodificar o arquivo JSON {caminho}. Verifique o formato.")
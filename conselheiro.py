@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import json
+import math
+
+from estrategias import ESTRATEGIAS_REGISTRADAS, criar_estrategia
+from janela_estatisticas import JanelaEstatisticas
+from simulador_rodadas_com_graficos import escolher_colunas_em_cache, gerar_pesos_em_cache
+from tabela_roleta import alguma_aposta_vence, retorno_apostas
+
+
+class ConselheiroApostas:
+    """
+    Versão incremental de simular_apostas para resultados ao vivo.
+
+    Recebe um resultado por vez, atualiza a janela de estatísticas (O(1) por resultado), liquida
+    a aposta pendente com as mesmas regras de simular_apostas e devolve as duas colunas e o valor
+    da próxima aposta.
+
+    Diferença em relação a simular_apostas: lá a troca para os pesos de gerar_pesos olha se o
+    resultado que vai ser apostado é zero, o que ao vivo ainda não se conhece; aqui a troca
+    acontece quando o último resultado registrado foi zero (ou após perdas consecutivas).
+    """
+
+    def __init__(self, estrategia="martingale", saldo_inicial=100, aposta_base=10, tamanho_janela=30,
+                 max_perdas_consecutivas=3, stop_gain=20, stop_loss=-5, pesos_padrao=(0.7, 0.3, 0.0, 0.2)):
+        self.estrategia = estrategia
+        self.saldo_inicial = saldo_inicial
+        self.aposta_base = aposta_base
+        self.max_perdas_consecutivas = max_perdas_consecutivas
+        self.stop_gain = stop_gain
+        self.stop_loss = stop_loss
+        self.pesos_padrao = tuple(pesos_padrao)
+        self.janela = JanelaEstatisticas(tamanho=tamanho_janela)
+
+        self.saldo = saldo_inicial
+        self.progressao = criar_estrategia(estrategia, aposta_base)
+        self.perdas_consecutivas = 0
+
+        self.rodadas = 0
+        self.encerrado = False
+        self.motivo = None
+        self.colunas = []
+        self.aposta_pendente = None
+        self.ultimo_zero = False
+
+    def registrar(self, numero, cor=None):
+        """
+        Registra um resultado e retorna a recomendação para a próxima rodada (veja recomendacao).
+        """
+        if self.aposta_pendente is not None:
+            self._liquidar(numero)
+        self.janela.adicionar([numero, cor])
+        self.ultimo_zero = numero == 0
+        if not self.encerrado and len(self.janela) >= self.janela.tamanho:
+            self._preparar_aposta()
+        return self.recomendacao()
+
+    def recomendacao(self):
+        """
+        Retorna um dicionário com as colunas e o valor da próxima aposta (None enquanto a janela
+        não estiver completa ou depois de encerrado), o saldo e o motivo do encerramento.
+        """
+        return {
+            "colunas": list(self.colunas) if self.aposta_pendente is not None else None,
+            "aposta": self.aposta_pendente,
+            "saldo": self.saldo,
+            "ganho_liquido": self.saldo - self.saldo_inicial,
+            "rodadas": self.rodadas,
+            "encerrado": self.encerrado,
+            "motivo": self.motivo,
+        }
+
+    def _preparar_aposta(self):
+        frequencia_colunas = self.janela.frequencias()
+        atrasos = self.janela.atrasos()
+        repeticoes_recentes = self.janela.repeticoes_recentes()
+        repeticoes_antigas = self.janela.repeticoes_antigas()
+        if self.ultimo_zero or self.perdas_consecutivas > 1:
+            pesos = gerar_pesos_em_cache(frequencia_colunas, atrasos, repeticoes_recentes, repeticoes_antigas,
+                                         len(self.janela))
+        else:
+            pesos = self.pesos_padrao
+        self.colunas, _ = escolher_colunas_em_cache(frequencia_colunas, atrasos, repeticoes_recentes,
+                                                    repeticoes_antigas, pesos)
+
+        # Define o valor da aposta com base na estratégia
+        aposta = self.progressao.proxima_aposta(self.saldo)
+        if self.saldo - aposta <= 0:
+            self._encerrar("saldo_insuficiente")
+            return
+        self.aposta_pendente = aposta
+
+    def _liquidar(self, numero):
+        aposta = self.aposta_pendente
+        self.aposta_pendente = None
+        self.rodadas += 1
+        self.saldo -= aposta
+        if alguma_aposta_vence(self.colunas, numero):
+            self.saldo += retorno_apostas(self.colunas, numero, aposta)
+            self.progressao.ao_vencer()
+            self.perdas_consecutivas = 0
+            if self.saldo - self.saldo_inicial >= self.stop_gain:
+                self._encerrar("stop_gain")
+        else:
+            self.progressao.ao_perder()
+            self.perdas_consecutivas += 1
+            if self.saldo - self.saldo_inicial <= self.stop_loss:
+                self._encerrar("stop_loss")
+            elif self.perdas_consecutivas >= self.max_perdas_consecutivas:
+                self._encerrar("max_perdas_consecutivas")
+
+    def _encerrar(self, motivo):
+        self.encerrado = True
+        self.motivo = motivo
+        self.aposta_pendente = None
+
+
+def _numero(valor):
+    # bool é subclasse de int e o json aceita NaN e Infinity: nenhum deles vale como número
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+
+
+def _inteiro(valor):
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+
+# Parâmetros aceitos no corpo de POST /mesas/<mesa>: nome -> (validação, descrição do valor esperado)
+PARAMETROS_MESA = {
+    "estrategia": (lambda valor: isinstance(valor, str) and valor in ESTRATEGIAS_REGISTRADAS,
+                   "uma estratégia registrada"),
+    "saldo_inicial": (lambda valor: _numero(valor) and valor > 0, "um número positivo"),
+    "aposta_base": (lambda valor: _numero(valor) and valor > 0, "um número positivo"),
+    "tamanho_janela": (lambda valor: _inteiro(valor) and valor >= 1, "um inteiro maior que zero"),
+    "max_perdas_consecutivas": (lambda valor: _inteiro(valor) and valor >= 1, "um inteiro maior que zero"),
+    "stop_gain": (_numero, "um número"),
+    "stop_loss": (_numero, "um número"),
+    "pesos_padrao": (lambda valor: isinstance(valor, list) and len(valor) == 4 and all(map(_numero, valor)),
+                     "uma lista com quatro números"),
+}
+
+
+def validar_parametros(parametros):
+    """
+    Confere os parâmetros de uma mesa antes de criar o ConselheiroApostas.
+
+    Retorna:
+    - A mensagem de erro do primeiro parâmetro desconhecido ou inválido, ou None se todos são válidos.
+    """
+    for nome, valor in parametros.items():
+        if nome not in PARAMETROS_MESA:
+            return f"parâmetro desconhecido: {nome}"
+        valido, esperado = PARAMETROS_MESA[nome]
+        if not valido(valor):
+            return f"'{nome}' deve ser {esperado}"
+    return None
+
+
+class ServidorConselheiro:
+    """
+    Servidor HTTP local (asyncio) com um ConselheiroApostas por mesa.
+
+    Rotas:
+    - POST /mesas/<mesa>            Cria ou reinicia a mesa; o corpo JSON traz os parâmetros do conselheiro.
+    - POST /mesas/<mesa>/resultado  Registra {"numero": n} e retorna a recomendação.
+    - GET  /mesas/<mesa>            Retorna a recomendação atual.
+    - DELETE /mesas/<mesa>          Remove a mesa.
+    """
+
+    def __init__(self, **parametros_padrao):
+        self.parametros_padrao = parametros_padrao
+        self.mesas = {}
+
+    def tratar(self, metodo, caminho, corpo):
+        """Executa uma requisição e retorna (status, resposta)."""
+        partes = [parte for parte in caminho.split("/") if parte]
+        if len(partes) < 2 or partes[0] != "mesas":
+            return 404, {"erro": "rota não encontrada"}
+        mesa = partes[1]
+        if corpo is not None and not isinstance(corpo, dict):
+            return 400, {"erro": "o corpo deve ser um objeto JSON"}
+        if len(partes) == 2 and metodo == "POST":
+            erro = validar_parametros(corpo or {})
+            if erro:
+                return 400, {"erro": erro}
+            self.mesas[mesa] = ConselheiroApostas(**dict(self.parametros_padrao, **(corpo or {})))
+            return 201, self.mesas[mesa].recomendacao()
+        if mesa not in self.mesas:
+            if metodo == "POST" and partes[2:] == ["resultado"]:
+                self.mesas[mesa] = ConselheiroApostas(**self.parametros_padrao)
+            else:
+                return 404, {"erro": f"mesa {mesa} não encontrada"}
+        if len(partes) == 2 and metodo == "GET":
+            return 200, self.mesas[mesa].recomendacao()
+        if len(partes) == 2 and metodo == "DELETE":
+            del self.mesas[mesa]
+            return 200, {"removida": mesa}
+        if partes[2:] == ["resultado"] and metodo == "POST":
+            numero = (corpo or {}).get("numero")
+            # bool é subclasse de int: true/false não valem como 1/0
+            if isinstance(numero, bool) or not isinstance(numero, int) or not 0 <= numero <= 36:
+                return 400, {"erro": "informe 'numero' entre 0 e 36"}
+            return 200, self.mesas[mesa].registrar(numero, corpo.get("cor"))
+        return 405, {"erro": "método não permitido"}
+
+    async def atender(self, leitor, escritor):
+        # Conexões persistentes (keep-alive): várias requisições por conexão
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                metodo, caminho, _ = linha.decode("latin-1").split(" ", 2)
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = linha.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                tamanho = int(cabecalhos.get("content-length", 0))
+                dados = await leitor.readexactly(tamanho) if tamanho else b""
+                try:
+                    status, resposta = self.tratar(metodo, caminho, json.loads(dados) if dados else None)
+                except RecursionError:
+                    status, resposta = 400, {"erro": "JSON aninhado demais"}
+                except (ValueError, TypeError) as erro:
+                    status, resposta = 400, {"erro": str(erro)}
+                conteudo = json.dumps(resposta).encode()
+                fechar = cabecalhos.get("connection", "").lower() == "close"
+                escritor.write(
+                    f"HTTP/1.1 {status} {'OK' if status < 400 else 'Erro'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(conteudo)}\r\n"
+                    f"Connection: {'close' if fechar else 'keep-alive'}\r\n\r\n".encode() + conteudo)
+                await escritor.drain()
+                if fechar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host="127.0.0.1", porta=8765):
+        servidor = await asyncio.start_server(self.atender, host, porta)
+        print(f"Conselheiro de apostas em http://{host}:{porta}")
+        async with servidor:
+            await servidor.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local do conselheiro de apostas ao vivo.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--estrategia", default="martingale", choices=list(ESTRATEGIAS_REGISTRADAS))
+    parser.add_argument("--saldo-inicial", type=float, default=100)
+    parser.add_argument("--aposta-base", type=float, default=10)
+    parser.add_argument("--janela", type=int, default=30)
+    parser.add_argument("--max-perdas", type=int, default=3)
+    parser.add_argument("--stop-gain", type=float, default=20)
+    parser.add_argument("--stop-loss", type=float, default=-5)
+    argumentos = parser.parse_args()
+    servidor = ServidorConselheiro(estrategia=argumentos.estrategia, saldo_inicial=argumentos.saldo_inicial,
+                                   aposta_base=argumentos.aposta_base, tamanho_janela=argumentos.janela,
+                                   max_perdas_consecutivas=argumentos.max_perdas, stop_gain=argumentos.stop_gain,
+                                   stop_loss=argumentos.stop_loss)
+    asyncio.run(servidor.servir(argumentos.host, argumentos.porta))
@@ -0,0 +1,357 @@
+import math
+
+import numpy as np
+
+
+# Estratégias registradas por nome (veja registrar_estrategia)
+ESTRATEGIAS_REGISTRADAS = {}
+
+
+def registrar_estrategia(nome):
+    """
+    Decorador que registra uma classe de estratégia com o nome usado em simular_apostas.
+
+    Uma nova progressão só precisa herdar de Estrategia, implementar os ganchos que mudam
+    e ser registrada; o laço de simulação não precisa ser alterado.
+    """
+    def decorador(classe):
+        classe.nome = nome
+        ESTRATEGIAS_REGISTRADAS[nome] = classe
+        return classe
+    return decorador
+
+
+def obter_estrategia(nome):
+    """Retorna a classe da estratégia; nomes desconhecidos apostam sempre o valor base, como antes."""
+    return ESTRATEGIAS_REGISTRADAS.get(nome, Estrategia)
+
+
+def criar_estrategia(nome, aposta_base):
+    """Cria o estado de uma estratégia para uma simulação."""
+    return obter_estrategia(nome)(aposta_base)
+
+
+@registrar_estrategia("nenhuma_estrategia")
+class Estrategia:
+    """
+    Progressão de apostas com ganchos separados para cada momento da rodada.
+
+    - proxima_aposta(saldo): valor a apostar na próxima rodada.
+    - ao_vencer() / ao_perder(): atualizam o estado depois do resultado.
+
+    'aposta_atual' é o valor registrado no histórico de simular_apostas. A classe base aposta
+    sempre o valor base (nenhuma estratégia).
+    """
+
+    __slots__ = ("aposta_base", "aposta_atual")
+    nome = None
+
+    def __init__(self, aposta_base):
+        self.aposta_base = aposta_base
+        self.aposta_atual = aposta_base
+
+    def proxima_aposta(self, saldo):
+        return self.aposta_atual
+
+    def ao_vencer(self):
+        pass
+
+    def ao_perder(self):
+        pass
+
+    def estado(self):
+        """
+        Tupla que identifica o estado da progressão: duas instâncias com o mesmo estado apostam
+        igual daqui em diante (usada pela análise exata de markov_ruina.py).
+        """
+        return tuple(tuple(valor) if isinstance(valor, list) else valor
+                     for classe in type(self).__mro__ for nome in getattr(classe, "__slots__", ())
+                     for valor in (getattr(self, nome),))
+
+    @classmethod
+    def apostas_lote(cls, vitorias, aposta_base, saldo_inicial):
+        """
+        Apostas feitas e valores registrados para uma ou várias sessões (linhas) de vitórias.
+
+        A implementação padrão roda os próprios ganchos da estratégia em cada sessão, então
+        qualquer estratégia registrada funciona nos caminhos vetorizados; as estratégias
+        clássicas substituem este método por fórmulas de array. Depois de um saldo
+        insuficiente a aposta da sessão passa a ser infinita.
+        """
+        linhas = np.atleast_2d(vitorias)
+        apostas = np.full(linhas.shape, np.inf)
+        registradas = np.full(linhas.shape, np.inf)
+        for linha, vitorias_sessao in enumerate(linhas):
+            estrategia = cls(aposta_base)
+            proxima_aposta, ao_vencer, ao_perder = estrategia.proxima_aposta, estrategia.ao_vencer, estrategia.ao_perder
+            saldo = saldo_inicial
+            for i, vitoria in enumerate(vitorias_sessao.tolist()):
+                aposta = proxima_aposta(saldo)
+                apostas[linha, i] = aposta
+                saldo -= aposta
+                if saldo <= 0:
+                    break
+                if vitoria:
+                    saldo += (aposta / 2) * 3
+                    ao_vencer()
+                else:
+                    ao_perder()
+                registradas[linha, i] = estrategia.aposta_atual
+        if np.ndim(vitorias) == 1:
+            return apostas[0], registradas[0]
+        return apostas, registradas
+
+
+def _deslocar(registradas, aposta_base):
+    # A aposta de cada rodada é o valor registrado na rodada anterior (a primeira é a base)
+    apostas = np.empty(registradas.shape)
+    apostas[..., :1] = aposta_base
+    apostas[..., 1:] = registradas[..., :-1]
+    return apostas
+
+
+@registrar_estrategia("martingale")
+class Martingale(Estrategia):
+    __slots__ = ()
+
+    def ao_vencer(self):
+        self.aposta_atual = self.aposta_base  # Volta à aposta inicial
+
+    def ao_perder(self):
+        self.aposta_atual *= 2  # Dobra a aposta
+
+    @classmethod
+    def apostas_lote(cls, vitorias, aposta_base, saldo_inicial):
+        # Dobra a cada perda desde a última vitória
+        perdas_acumuladas = np.cumsum(~vitorias, axis=-1)
+        sequencia = perdas_acumuladas - np.maximum.accumulate(np.where(vitorias, perdas_acumuladas, 0), axis=-1)
+        registradas = np.where(vitorias, aposta_base, aposta_base * np.exp2(sequencia.astype(float)))
+        return _deslocar(registradas, aposta_base), registradas
+
+
+@registrar_estrategia("fibonacci")
+class Fibonacci(Estrategia):
+    __slots__ = ("sequencia", "indice")
+
+    def __init__(self, aposta_base):
+        super().__init__(aposta_base)
+        self.sequencia = [1, 1]  # Sequência de Fibonacci inicial
+        self.indice = 0
+
+    def ao_vencer(self):
+        self.indice = max(0, self.indice - 2)  # Retrocede dois passos na sequência
+        self.aposta_atual = self.sequencia[self.indice]
+
+    def ao_perder(self):
+        self.indice += 1
+        if self.indice >= len(self.sequencia):
+            self.sequencia.append(self.sequencia[-1] + self.sequencia[-2])
+        self.aposta_atual = self.sequencia[self.indice]
+
+    def estado(self):
+        # A sequência só guarda os termos já calculados; o estado é a posição nela
+        return (self.aposta_base, self.aposta_atual, self.indice)
+
+    @classmethod
+    def apostas_lote(cls, vitorias, aposta_base, saldo_inicial):
+        # Índice como passeio refletido em zero: +1 na perda, -2 na vitória
+        passeio = np.cumsum(np.where(vitorias, -2, 1), axis=-1)
+        indice = passeio - np.minimum(0, np.minimum.accumulate(passeio, axis=-1))
+        sequencia = [1.0, 1.0]
+        limite = min(int(indice.max(initial=0)), 1470)
+        while len(sequencia) <= limite:
+            sequencia.append(sequencia[-1] + sequencia[-2])
+        registradas = np.asarray(sequencia)[np.minimum(indice, limite)]
+        return _deslocar(registradas, aposta_base), registradas
+
+
+@registrar_estrategia("dalembert")
+class Dalembert(Estrategia):
+    __slots__ = ()
+
+    def ao_vencer(self):
+        self.aposta_atual = max(self.aposta_base, self.aposta_atual - self.aposta_base)  # Diminui uma unidade
+
+    def ao_perder(self):
+        self.aposta_atual += self.aposta_base  # Aumenta uma unidade
+
+    @classmethod
+    def apostas_lote(cls, vitorias, aposta_base, saldo_inicial):
+        # Unidades acima da base como passeio refletido: +1 na perda, -1 na vitória
+        passeio = np.cumsum(np.where(vitorias, -1, 1), axis=-1)
+        unidades = passeio - np.minimum(0, np.minimum.accumulate(passeio, axis=-1))
+        registradas = aposta_base * (unidades + 1.0)
+        return _deslocar(registradas, aposta_base), registradas
+
+
+@registrar_estrategia("paroli")
+class Paroli(Estrategia):
+    __slots__ = ("contador", "multiplicador")
+
+    def __init__(self, aposta_base):
+        super().__init__(aposta_base)
+        self.contador = 0
+        self.multiplicador = 2
+
+    def proxima_aposta(self, saldo):
+        # Garante que a aposta não exceda o saldo
+        self.aposta_atual = min(self.aposta_base * (self.multiplicador ** self.contador), saldo)
+        return self.aposta_atual
+
+    def ao_vencer(self):
+        self.contador += 1  # Incrementa o contador de vitórias consecutivas
+
+    def ao_perder(self):
+        self.contador = 0  # Reseta o contador de vitórias consecutivas
+
+    @classmethod
+    def apostas_lote(cls, vitorias, aposta_base, saldo_inicial):
+        # Dobra a cada vitória consecutiva. Limitar ao saldo não é necessário: uma aposta igual
+        # ou maior que o saldo encerra a sessão por saldo insuficiente nos dois casos.
+        vitorias_acumuladas = np.cumsum(vitorias, axis=-1)
+        contador = vitorias_acumuladas - np.maximum.accumulate(np.where(~vitorias, vitorias_acumuladas, 0), axis=-1)
+        apostas = np.empty(vitorias.shape)
+        apostas[..., :1] = aposta_base
+        apostas[..., 1:] = aposta_base * np.exp2(contador[..., :-1].astype(float))
+        return apostas, apostas
+
+
+@registrar_estrategia("labouchere")
+class Labouchere(Estrategia):
+    __slots__ = ("sequencia",)
+
+    SEQUENCIA_INICIAL = (1, 2, 3)
+
+    def __init__(self, aposta_base):
+        super().__init__(aposta_base)
+        self.sequencia = list(self.SEQUENCIA_INICIAL)
+
+    def proxima_aposta(self, saldo):
+        if not self.sequencia:
+            self.sequencia = list(self.SEQUENCIA_INICIAL)  # Reinicia a sequência se estiver vazia
+        self.aposta_atual = min(self.sequencia[0] + self.sequencia[-1], saldo)
+        return self.aposta_atual
+
+    def ao_vencer(self):
+        if len(self.sequencia) > 1:
+            self.sequencia.pop(0)  # Remove o primeiro elemento
+            self.sequencia.pop(-1)  # Remove o último elemento
+        else:
+            self.sequencia = []  # Zera a sequência
+
+    def ao_perder(self):
+        self.sequencia.append(self.aposta_atual)  # Adiciona a aposta perdida ao final da sequência
+
+    @classmethod
+    def apostas_lote(cls, vitorias, aposta_base, saldo_inicial):
+        """
+        Com uma sessão usa os ganchos escalares; com várias avança rodada a rodada com a
+        sequência de cada sessão numa linha de um buffer com ponteiros de início e fim: a
+        vitória avança os dois ponteiros e a perda escreve no fim, como a lista do escalar.
+        """
+        if np.ndim(vitorias) == 1:
+            return super().apostas_lote(vitorias, aposta_base, saldo_inicial)
+        sessoes, rodadas = vitorias.shape
+        linhas = np.arange(sessoes)
+        tamanho_inicial = len(cls.SEQUENCIA_INICIAL)
+        sequencia = np.zeros((sessoes, rodadas + tamanho_inicial))
+        sequencia[:, :tamanho_inicial] = cls.SEQUENCIA_INICIAL
+        inicio = np.zeros(sessoes, dtype=np.int64)
+        fim = np.full(sessoes, tamanho_inicial, dtype=np.int64)
+        saldo = np.full(sessoes, float(saldo_inicial))
+        ativa = np.ones(sessoes, dtype=bool)
+        apostas = np.full((sessoes, rodadas), np.inf)
+        for t in range(rodadas):
+            vazia = fim <= inicio
+            sequencia[vazia, :tamanho_inicial] = cls.SEQUENCIA_INICIAL
+            inicio[vazia] = 0
+            fim[vazia] = tamanho_inicial
+            aposta = np.minimum(sequencia[linhas, inicio] + sequencia[linhas, fim - 1], saldo)
+            apostas[ativa, t] = aposta[ativa]
+            saldo = saldo - aposta
+            ativa &= saldo > 0
+            vitoria = vitorias[:, t]
+            saldo = np.where(vitoria, saldo + (aposta / 2) * 3, saldo)
+            # Vitória: remove o primeiro e o último (com um só elemento a sequência fica vazia)
+            inicio = np.where(vitoria, inicio + 1, inicio)
+            fim = np.where(vitoria, np.maximum(fim - 1, inicio), fim)
+            perdeu = ~vitoria
+            sequencia[linhas[perdeu], fim[perdeu]] = aposta[perdeu]
+            fim = np.where(perdeu, fim + 1, fim)
+        return apostas, apostas
+
+
+@registrar_estrategia("labouchere_reversa")
+class LabouchereReversa(Estrategia):
+    """Labouchere invertida: a vitória acrescenta a aposta à sequência e a perda remove as pontas."""
+
+    __slots__ = ("sequencia",)
+
+    def __init__(self, aposta_base):
+        super().__init__(aposta_base)
+        self.sequencia = list(Labouchere.SEQUENCIA_INICIAL)
+
+    def proxima_aposta(self, saldo):
+        if not self.sequencia:
+            self.sequencia = list(Labouchere.SEQUENCIA_INICIAL)
+        self.aposta_atual = min(self.sequencia[0] + self.sequencia[-1], saldo)
+        return self.aposta_atual
+
+    def ao_vencer(self):
+        self.sequencia.append(self.aposta_atual)
+
+    def ao_perder(self):
+        if len(self.sequencia) > 1:
+            self.sequencia.pop(0)
+            self.sequencia.pop(-1)
+        else:
+            self.sequencia = []
+
+
+@registrar_estrategia("1_3_2_6")
+class UmTresDoisSeis(Estrategia):
+    """Multiplica a base por 1, 3, 2 e 6 a cada vitória seguida; volta ao início na perda ou após a quarta."""
+
+    __slots__ = ("passo",)
+
+    MULTIPLICADORES = (1, 3, 2, 6)
+
+    def __init__(self, aposta_base):
+        super().__init__(aposta_base)
+        self.passo = 0
+
+    def ao_vencer(self):
+        self.passo = (self.passo + 1) % len(self.MULTIPLICADORES)
+        self.aposta_atual = self.aposta_base * self.MULTIPLICADORES[self.passo]
+
+    def ao_perder(self):
+        self.passo = 0
+        self.aposta_atual = self.aposta_base
+
+
+@registrar_estrategia("oscar_grind")
+class OscarGrind(Estrategia):
+    """
+    Oscar's Grind: busca um lucro de uma unidade (aposta_base) por ciclo.
+
+    A aposta sobe uma unidade após cada vitória e se mantém após a perda, sem nunca passar do
+    necessário para fechar o ciclo (o prêmio de duas colunas é metade da aposta).
+    """
+
+    __slots__ = ("lucro_ciclo",)
+
+    def __init__(self, aposta_base):
+        super().__init__(aposta_base)
+        self.lucro_ciclo = 0
+
+    def ao_vencer(self):
+        self.lucro_ciclo += self.aposta_atual / 2
+        if self.lucro_ciclo >= self.aposta_base:
+            self.lucro_ciclo = 0
+            self.aposta_atual = self.aposta_base
+            return
+        necessario = math.ceil((self.aposta_base - self.lucro_ciclo) * 2 / self.aposta_base) * self.aposta_base
+        self.aposta_atual = min(self.aposta_atual + self.aposta_base, necessario)
+
+    def ao_perder(self):
+        self.lucro_ciclo -= self.aposta_atual
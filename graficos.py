@@ -0,0 +1,148 @@
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from historico_colunar import HistoricoApostas
+
+
+DPI = 100
+TAMANHO_INDIVIDUAL = (10, 6)
+TAMANHO_COMPARATIVO = (12, 8)
+# Acima desta quantidade de pontos os marcadores deixam de ser desenhados
+MAX_MARCADORES = 500
+
+
+def extrair_saldos(historico):
+    """Retorna os saldos de um histórico de simular_apostas como array float64."""
+    if isinstance(historico, HistoricoApostas):
+        return historico.saldos
+    return np.fromiter((saldo for _, _, _, saldo in historico), dtype=np.float64, count=len(historico))
+
+
+def reduzir_min_max(valores, largura):
+    """
+    Reduz uma curva a no máximo 2 * 'largura' pontos, guardando o mínimo e o máximo de cada faixa.
+
+    Com uma faixa por pixel da figura, o desenho fica igual ao da curva completa (picos e
+    vales são preservados), mas o matplotlib só recebe alguns milhares de pontos.
+
+    Retorna:
+    - (rodadas, valores), com as rodadas numeradas a partir de 1.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    quantidade = len(valores)
+    if quantidade <= 2 * largura:
+        return np.arange(1, quantidade + 1), valores
+    inicios = np.linspace(0, quantidade, largura + 1).astype(np.int64)[:-1]
+    fins = np.append(inicios[1:], quantidade)
+    minimos = np.minimum.reduceat(valores, inicios)
+    maximos = np.maximum.reduceat(valores, inicios)
+    centros = (inicios + fins + 1) / 2
+    return np.repeat(centros, 2), np.column_stack((minimos, maximos)).ravel()
+
+
+def _nova_figura(tamanho):
+    # Figura desenhada pelo Agg, sem pyplot: não abre janelas nem depende de interface gráfica
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    figura = Figure(figsize=tamanho, dpi=DPI)
+    FigureCanvasAgg(figura)
+    return figura
+
+
+def _estilo_linha(quantidade_original):
+    return {"marker": "o" if quantidade_original <= MAX_MARCADORES else None, "linestyle": "-"}
+
+
+def _desenhar_individual(tarefa):
+    rodadas, saldos, quantidade, estrategia, saldo_final, ganho_liquido, destino = tarefa
+    figura = _nova_figura(TAMANHO_INDIVIDUAL)
+    eixo = figura.add_subplot()
+    eixo.plot(rodadas, saldos, color="b", label=f"Estratégia: {estrategia.capitalize()}", **_estilo_linha(quantidade))
+    eixo.set_title(f"Evolução do Saldo ({estrategia.capitalize()})")
+    eixo.set_xlabel("Rodadas")
+    eixo.set_ylabel("Saldo")
+    eixo.grid(True)
+    eixo.annotate(f"Saldo Final: {saldo_final:.2f}\nGanho Líquido: {ganho_liquido:.2f}",
+                  xy=(1, 1), xycoords="axes fraction", xytext=(-20, -20), textcoords="offset points",
+                  ha="right", va="top", fontsize=10,
+                  bbox=dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="white"))
+    eixo.legend()
+    figura.savefig(destino)
+    return destino
+
+
+def _desenhar_comparativo(tarefa):
+    curvas, destino = tarefa
+    figura = _nova_figura(TAMANHO_COMPARATIVO)
+    eixo = figura.add_subplot()
+    for estrategia, rodadas, saldos, quantidade, ganho in curvas:
+        eixo.plot(rodadas, saldos, label=f"{estrategia.capitalize()} - ganho {ganho}", **_estilo_linha(quantidade))
+    eixo.set_title("Comparação de Estratégias")
+    eixo.set_xlabel("Rodadas")
+    eixo.set_ylabel("Saldo")
+    eixo.grid(True)
+    eixo.legend()
+    figura.savefig(destino)
+    return destino
+
+
+def salvar_grafico(historico, estrategia, saldo_final, ganho_liquido, destino):
+    """
+    Versão off-screen de plotar_grafico: grava a figura em 'destino' (o formato, PNG ou SVG,
+    vem da extensão) em vez de abrir uma janela.
+    """
+    saldos = extrair_saldos(historico)
+    rodadas, reduzidos = reduzir_min_max(saldos, TAMANHO_INDIVIDUAL[0] * DPI)
+    return _desenhar_individual((rodadas, reduzidos, len(saldos), estrategia, saldo_final, ganho_liquido, destino))
+
+
+def salvar_grafico_comparativo(historicos, estrategias, ganhos_liquidos, destino):
+    """Versão off-screen de plotar_grafico_comparativo."""
+    curvas = []
+    for estrategia, historico, ganho in zip(estrategias, historicos, ganhos_liquidos):
+        saldos = extrair_saldos(historico)
+        rodadas, reduzidos = reduzir_min_max(saldos, TAMANHO_COMPARATIVO[0] * DPI)
+        curvas.append((estrategia, rodadas, reduzidos, len(saldos), ganho))
+    return _desenhar_comparativo((curvas, destino))
+
+
+def salvar_graficos(resultados, diretorio, formato="png", prefixo="", processos=None):
+    """
+    Grava o gráfico de cada estratégia e o comparativo, desenhando as figuras em paralelo.
+
+    As curvas são reduzidas (reduzir_min_max) antes de seguir para os processos, então
+    só alguns milhares de pontos por estratégia são copiados.
+
+    Parâmetros:
+    - resultados: Dicionário {estrategia: (saldo_final, historico, ganho_liquido)}.
+    - diretorio: Diretório de saída (criado se não existir).
+    - formato: "png" ou "svg".
+    - prefixo: Texto colocado antes do nome de cada arquivo.
+    - processos: Quantidade de processos (padrão: um por figura; 1 desenha no processo atual).
+
+    Retorna:
+    - Lista com os caminhos gravados, o comparativo por último.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    individuais = []
+    curvas = []
+    for estrategia, (saldo_final, historico, ganho_liquido) in resultados.items():
+        saldos = extrair_saldos(historico)
+        rodadas, reduzidos = reduzir_min_max(saldos, TAMANHO_INDIVIDUAL[0] * DPI)
+        destino = os.path.join(diretorio, f"{prefixo}{estrategia}.{formato}")
+        individuais.append((rodadas, reduzidos, len(saldos), estrategia, saldo_final, ganho_liquido, destino))
+        rodadas, reduzidos = reduzir_min_max(saldos, TAMANHO_COMPARATIVO[0] * DPI)
+        curvas.append((estrategia, rodadas, reduzidos, len(saldos), ganho_liquido))
+    comparativo = (curvas, os.path.join(diretorio, f"{prefixo}comparativo.{formato}"))
+
+    processos = processos or len(individuais) + 1
+    if processos == 1:
+        return [_desenhar_individual(tarefa) for tarefa in individuais] + [_desenhar_comparativo(comparativo)]
+    # Carrega o matplotlib antes de criar os processos, que já o recebem importado
+    import matplotlib.backends.backend_agg  # noqa: F401
+    with Pool(processos) as pool:
+        pendente = pool.apply_async(_desenhar_comparativo, (comparativo,))
+        caminhos = pool.map(_desenhar_individual, individuais)
+        return caminhos + [pendente.get()]
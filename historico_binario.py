@@ -0,0 +1,115 @@
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from carregar_historicos import data_do_arquivo, ler_resultados, listar_arquivos_historico
+from tabela_roleta import NOME_COR_DO_NUMERO
+
+
+# Formato binário do histórico:
+# - cabeçalho de 32 bytes: assinatura, versão, quantidade de sessões e de resultados;
+# - índice das sessões: início, quantidade de resultados e data (segundos desde 1970, 0 se desconhecida);
+# - resultados: um uint8 por rodada (a cor é deduzida do número).
+ASSINATURA = b"ROLETAB1"
+VERSAO = 1
+CABECALHO = struct.Struct("<8sIIQQ")
+TIPO_INDICE = np.dtype([("inicio", "<u8"), ("quantidade", "<u8"), ("data", "<i8")])
+TAMANHO_BLOCO = 64 * 1024
+EPOCA = datetime(1970, 1, 1)
+
+
+class ResultadosBinarios:
+    """
+    Sequência de resultados sobre um array de números (normalmente um numpy.memmap).
+
+    Se comporta como a lista [[numero, cor], ...] carregada do JSON, mas o fatiamento
+    (resultados[:tmt], resultados[tmt:]) devolve visões do mesmo array, sem cópia.
+    O array fica disponível em 'numeros' para o modo vetorizado.
+    """
+
+    def __init__(self, numeros, sessoes=None):
+        self.numeros = numeros
+        self.sessoes = sessoes
+
+    def __len__(self):
+        return len(self.numeros)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return ResultadosBinarios(self.numeros[indice])
+        numero = int(self.numeros[indice])
+        return [numero, NOME_COR_DO_NUMERO[numero]]
+
+    def __iter__(self):
+        for inicio in range(0, len(self.numeros), TAMANHO_BLOCO):
+            for numero in self.numeros[inicio:inicio + TAMANHO_BLOCO].tolist():
+                yield [numero, NOME_COR_DO_NUMERO[numero]]
+
+    def sessao(self, posicao):
+        """Retorna os resultados da sessão (arquivo de origem) na posição informada, sem cópia."""
+        registro = self.sessoes[posicao]
+        inicio = int(registro["inicio"])
+        return ResultadosBinarios(self.numeros[inicio:inicio + int(registro["quantidade"])])
+
+
+def converter_para_binario(origem, destino):
+    """
+    Converte arquivos historico_jogo_*.json para o formato binário.
+
+    Os arquivos são lidos em fluxo (veja carregar_historicos) e gravados em ordem cronológica,
+    uma sessão por arquivo, sem carregar o histórico inteiro em memória.
+
+    Parâmetros:
+    - origem: Diretório, padrão glob, arquivo ou lista deles.
+    - destino: Caminho do arquivo binário a criar.
+
+    Retorna:
+    - A quantidade de resultados gravados.
+    """
+    arquivos = listar_arquivos_historico(origem)
+    indice = np.zeros(len(arquivos), dtype=TIPO_INDICE)
+    inicio_dados = CABECALHO.size + indice.nbytes
+    total = 0
+    with open(destino, "wb") as f:
+        f.seek(inicio_dados)
+        for posicao, caminho in enumerate(arquivos):
+            data = data_do_arquivo(caminho)
+            indice[posicao] = (total, 0, int((data - EPOCA).total_seconds()) if data else 0)
+            bloco = bytearray()
+            for numero, cor in ler_resultados(caminho):
+                if not 0 <= numero <= 36 or cor != NOME_COR_DO_NUMERO[numero]:
+                    raise ValueError(f"Resultado inválido em {caminho}: {[numero, cor]}")
+                bloco.append(numero)
+                if len(bloco) >= TAMANHO_BLOCO:
+                    f.write(bloco)
+                    total += len(bloco)
+                    bloco.clear()
+            f.write(bloco)
+            total += len(bloco)
+            indice[posicao]["quantidade"] = total - int(indice[posicao]["inicio"])
+        f.seek(0)
+        f.write(CABECALHO.pack(ASSINATURA, VERSAO, len(arquivos), total, 0))
+        f.write(indice.tobytes())
+    return total
+
+
+def abrir_historico_binario(caminho):
+    """
+    Abre um histórico binário com numpy.memmap, sem ler os resultados para a memória.
+
+    Retorna:
+    - ResultadosBinarios com todos os resultados; 'sessoes' traz o índice das sessões.
+    """
+    with open(caminho, "rb") as f:
+        assinatura, versao, quantidade_sessoes, quantidade_resultados, _ = CABECALHO.unpack(f.read(CABECALHO.size))
+    if assinatura != ASSINATURA or versao != VERSAO:
+        raise ValueError(f"{caminho} não é um histórico binário compatível.")
+    if quantidade_sessoes == 0:
+        return ResultadosBinarios(np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=TIPO_INDICE))
+    sessoes = np.memmap(caminho, dtype=TIPO_INDICE, mode="r", offset=CABECALHO.size, shape=(quantidade_sessoes,))
+    inicio_dados = CABECALHO.size + quantidade_sessoes * TIPO_INDICE.itemsize
+    if quantidade_resultados == 0:
+        return ResultadosBinarios(np.zeros(0, dtype=np.uint8), sessoes)
+    numeros = np.memmap(caminho, dtype=np.uint8, mode="r", offset=inicio_dados, shape=(quantidade_resultados,))
+    return ResultadosBinarios(numeros, sessoes)
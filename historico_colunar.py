@@ -0,0 +1,121 @@
+import csv
+
+import numpy as np
+
+
+SITUACOES = ("Derrota", "Vitória")
+CAPACIDADE_INICIAL = 1024
+# Registro equivalente a uma tupla (numero, situacao, aposta, saldo) do histórico em lista
+TIPO_REGISTRO = np.dtype([("numero", np.uint8), ("vitoria", np.bool_), ("aposta", np.float64), ("saldo", np.float64)])
+
+
+class HistoricoApostas:
+    """
+    Histórico de simular_apostas guardado em colunas (arrays numpy tipados).
+
+    Cada rodada ocupa 18 bytes (numero uint8, vitoria bool, aposta e saldo float64) em vez de
+    uma tupla com quatro objetos. Se comporta como a lista de tuplas
+    (numero, "Vitória"/"Derrota", aposta, saldo): tem len, índice, iteração e append, então
+    o código que percorre o histórico continua funcionando. O fatiamento devolve visões, sem cópia,
+    e as colunas ficam disponíveis em 'numeros', 'vitorias', 'apostas' e 'saldos'.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_INICIAL, _colunas=None):
+        if _colunas is None:
+            capacidade = max(int(capacidade), 1)
+            _colunas = (np.empty(capacidade, np.uint8), np.empty(capacidade, np.bool_),
+                        np.empty(capacidade, np.float64), np.empty(capacidade, np.float64))
+            self._tamanho = 0
+        else:
+            self._tamanho = len(_colunas[0])
+        self._numeros, self._vitorias, self._apostas, self._saldos = _colunas
+
+    @property
+    def numeros(self):
+        return self._numeros[:self._tamanho]
+
+    @property
+    def vitorias(self):
+        return self._vitorias[:self._tamanho]
+
+    @property
+    def apostas(self):
+        return self._apostas[:self._tamanho]
+
+    @property
+    def saldos(self):
+        return self._saldos[:self._tamanho]
+
+    def _crescer(self):
+        capacidade = 2 * len(self._numeros)
+        colunas = []
+        for coluna in (self._numeros, self._vitorias, self._apostas, self._saldos):
+            nova = np.empty(capacidade, coluna.dtype)
+            nova[:self._tamanho] = coluna[:self._tamanho]
+            colunas.append(nova)
+        self._numeros, self._vitorias, self._apostas, self._saldos = colunas
+
+    def adicionar(self, numero, vitoria, aposta, saldo):
+        """Registra uma rodada; a capacidade dobra quando o espaço pré-alocado acaba."""
+        if self._tamanho == len(self._numeros):
+            self._crescer()
+        posicao = self._tamanho
+        self._numeros[posicao] = numero
+        self._vitorias[posicao] = vitoria
+        self._apostas[posicao] = aposta
+        self._saldos[posicao] = saldo
+        self._tamanho = posicao + 1
+
+    def append(self, registro):
+        """Aceita a tupla (numero, situacao, aposta, saldo) usada no histórico em lista."""
+        numero, situacao, aposta, saldo = registro
+        self.adicionar(numero, situacao == "Vitória", aposta, saldo)
+
+    def __len__(self):
+        return self._tamanho
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return HistoricoApostas(_colunas=(self.numeros[indice], self.vitorias[indice],
+                                              self.apostas[indice], self.saldos[indice]))
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError("índice fora do histórico")
+        return (int(self._numeros[indice]), SITUACOES[bool(self._vitorias[indice])],
+                float(self._apostas[indice]), float(self._saldos[indice]))
+
+    def __iter__(self):
+        situacoes = [SITUACOES[vitoria] for vitoria in self.vitorias.tolist()]
+        return zip(self.numeros.tolist(), situacoes, self.apostas.tolist(), self.saldos.tolist())
+
+    def para_numpy(self):
+        """Retorna o histórico como array estruturado (campos numero, vitoria, aposta, saldo)."""
+        registros = np.empty(self._tamanho, dtype=TIPO_REGISTRO)
+        registros["numero"] = self.numeros
+        registros["vitoria"] = self.vitorias
+        registros["aposta"] = self.apostas
+        registros["saldo"] = self.saldos
+        return registros
+
+    def salvar_csv(self, destino):
+        """Grava o histórico em CSV com as colunas rodada, numero, resultado, aposta e saldo."""
+        with open(destino, "w", newline="") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["rodada", "numero", "resultado", "aposta", "saldo"])
+            escritor.writerows((rodada, *registro) for rodada, registro in enumerate(self, start=1))
+
+    def salvar_npz(self, destino):
+        """Grava as colunas em um arquivo .npz (um array por coluna, como um arquivo colunar)."""
+        np.savez(destino, numeros=self.numeros, vitorias=self.vitorias, apostas=self.apostas, saldos=self.saldos)
+
+    @classmethod
+    def de_colunas(cls, numeros, vitorias, apostas, saldos):
+        """Monta o histórico sobre colunas já calculadas (usadas como estão, sem cópia)."""
+        return cls(_colunas=(numeros, vitorias, apostas, saldos))
+
+    @classmethod
+    def carregar_npz(cls, caminho):
+        """Lê um histórico gravado por salvar_npz."""
+        with np.load(caminho) as dados:
+            return cls.de_colunas(dados["numeros"], dados["vitorias"], dados["apostas"], dados["saldos"])
@@ -0,0 +1,162 @@
+import numpy as np
+
+from tabela_roleta import COLUNA_DO_NUMERO, FORA, NOMES_COLUNAS
+
+
+class IndiceHistorico:
+    """
+    Índice de um histórico para consultas de colunas em qualquer trecho sem percorrê-lo de novo.
+
+    Montado uma única vez (O(n)), guarda:
+    - contagens acumuladas de cada coluna, para a frequência de qualquer trecho em O(1);
+    - a última posição de cada coluna até cada rodada, para os atrasos em O(1);
+    - as sequências consecutivas (ignorando o zero), com a mais longa de cada bloco de log2(n)
+      sequências e uma tabela esparsa sobre esses blocos, para a maior sequência de um trecho em
+      O(log n) com memória O(n).
+
+    Os trechos seguem o fatiamento do Python: [inicio, fim). As consultas devolvem os mesmos
+    dicionários de contar_frequencias e calcular_atrasos aplicados a resultados[inicio:fim].
+
+    Parâmetros:
+    - resultados: Lista de tuplas no formato [[numero, cor], ...], array de números ou ResultadosBinarios.
+    """
+
+    def __init__(self, resultados):
+        if hasattr(resultados, "numeros"):
+            resultados = resultados.numeros
+        elif len(resultados) and not isinstance(resultados, np.ndarray):
+            resultados = [numero for numero, _ in resultados]
+        numeros = np.asarray(resultados, dtype=np.uint8)
+        self.tamanho = len(numeros)
+        tipo = np.int32 if self.tamanho < 2 ** 31 - 1 else np.int64
+        colunas = np.array(COLUNA_DO_NUMERO, dtype=np.int8)[numeros]
+        posicoes = np.arange(self.tamanho, dtype=tipo)
+
+        # contagens[k, c]: aparições da coluna c em [0, k); ultima[k, c]: última posição de c em [0, k]
+        self._contagens = np.zeros((self.tamanho + 1, 3), dtype=tipo)
+        self._ultima = np.empty((self.tamanho, 3), dtype=tipo)
+        for coluna in range(3):
+            aparicoes = colunas == coluna
+            np.cumsum(aparicoes, out=self._contagens[1:, coluna])
+            np.maximum.accumulate(np.where(aparicoes, posicoes, -1), out=self._ultima[:, coluna])
+
+        # Sequências consecutivas sobre os resultados sem o zero
+        validos = colunas != FORA
+        self._validos_antes = np.zeros(self.tamanho + 1, dtype=tipo)
+        np.cumsum(validos, out=self._validos_antes[1:])
+        sem_zero = colunas[validos]
+        mudancas = np.flatnonzero(np.diff(sem_zero)) + 1
+        self._inicio_sequencia = np.concatenate(([0], mudancas)).astype(tipo) if len(sem_zero) else np.zeros(0, tipo)
+        self._fim_sequencia = np.append(self._inicio_sequencia[1:], len(sem_zero)).astype(tipo)
+        self._coluna_sequencia = sem_zero[self._inicio_sequencia]
+        self._comprimento_sequencia = self._fim_sequencia - self._inicio_sequencia
+
+        # Blocos de log2(n) sequências: _maior_do_bloco[b] é a sequência mais longa (a primeira, em
+        # caso de empate) do bloco b
+        quantidade = len(self._comprimento_sequencia)
+        self._tamanho_bloco = max(1, quantidade.bit_length())
+        blocos = -(-quantidade // self._tamanho_bloco)
+        preenchido = np.full(blocos * self._tamanho_bloco, -1, dtype=tipo)
+        preenchido[:quantidade] = self._comprimento_sequencia
+        posicoes_no_bloco = preenchido.reshape(blocos, self._tamanho_bloco).argmax(axis=1)
+        maior_do_bloco = (np.arange(blocos, dtype=tipo) * self._tamanho_bloco + posicoes_no_bloco).astype(tipo)
+
+        # Tabela esparsa sobre os blocos: _maximos[j][b] é a sequência mais longa dos blocos b .. b + 2**j - 1.
+        # São n / log2(n) blocos com log2(n) níveis, então a tabela ocupa O(n)
+        self._maximos = [maior_do_bloco]
+        passo = 1
+        while 2 * passo <= blocos:
+            anterior = self._maximos[-1]
+            esquerda, direita = anterior[:-passo], anterior[passo:]
+            maior_direita = self._comprimento_sequencia[direita] > self._comprimento_sequencia[esquerda]
+            self._maximos.append(np.where(maior_direita, direita, esquerda))
+            passo *= 2
+
+    def __len__(self):
+        return self.tamanho
+
+    def _trecho(self, inicio, fim):
+        inicio, fim, _ = slice(inicio, fim).indices(self.tamanho)
+        return inicio, max(fim, inicio)
+
+    def frequencias(self, inicio=0, fim=None):
+        """Frequência de cada coluna em [inicio, fim), como contar_frequencias(resultados[inicio:fim])."""
+        inicio, fim = self._trecho(inicio, fim)
+        totais = self._contagens[fim] - self._contagens[inicio]
+        return {NOMES_COLUNAS[coluna]: int(total) for coluna, total in enumerate(totais) if total}
+
+    def atrasos(self, inicio=0, fim=None):
+        """
+        Atraso de cada coluna no fim de [inicio, fim), como calcular_atrasos(resultados[inicio:fim]):
+        rodadas desde a última aparição no trecho, ou 2 * tamanho do trecho se a coluna não apareceu.
+        """
+        inicio, fim = self._trecho(inicio, fim)
+        total = fim - inicio
+        if total == 0:
+            return {nome: 0 for nome in NOMES_COLUNAS}
+        ultimas = self._ultima[fim - 1]
+        return {nome: int(fim - ultima) if ultima >= inicio else 2 * total
+                for nome, ultima in zip(NOMES_COLUNAS, ultimas)}
+
+    def atraso_em(self, posicao):
+        """
+        Rodadas desde a última aparição de cada coluna antes da rodada 'posicao'
+        (1 se a coluna saiu na rodada anterior), ou None se ela ainda não tinha saído.
+        """
+        if posicao <= 0:
+            return {nome: None for nome in NOMES_COLUNAS}
+        ultimas = self._ultima[min(posicao, self.tamanho) - 1]
+        return {nome: int(posicao - ultima) if ultima >= 0 else None for nome, ultima in zip(NOMES_COLUNAS, ultimas)}
+
+    def maior_sequencia(self, inicio=0, fim=None):
+        """
+        Maior sequência consecutiva da mesma coluna em [inicio, fim), ignorando o zero
+        (como em calcular_repeticoes_recentes).
+
+        Retorna:
+        - (coluna, comprimento) da sequência mais longa (a primeira, em caso de empate),
+          ou (None, 0) se o trecho não tem nenhum número fora do zero.
+        """
+        inicio, fim = self._trecho(inicio, fim)
+        primeiro, ultimo = int(self._validos_antes[inicio]), int(self._validos_antes[fim])
+        if primeiro >= ultimo:
+            return None, 0
+        # Os valores buscados têm o mesmo tipo do array, para o numpy não convertê-lo inteiro a cada busca
+        tipo = self._inicio_sequencia.dtype.type
+        sequencia_inicial = int(np.searchsorted(self._inicio_sequencia, tipo(primeiro), side="right")) - 1
+        sequencia_final = int(np.searchsorted(self._inicio_sequencia, tipo(ultimo - 1), side="right")) - 1
+        if sequencia_inicial == sequencia_final:
+            return NOMES_COLUNAS[self._coluna_sequencia[sequencia_inicial]], ultimo - primeiro
+
+        # As sequências das pontas podem estar cortadas pelo trecho; as do meio estão inteiras
+        candidatos = [(int(self._fim_sequencia[sequencia_inicial]) - primeiro, sequencia_inicial)]
+        if sequencia_final - sequencia_inicial > 1:
+            meio = self._maior_entre(sequencia_inicial + 1, sequencia_final - 1)
+            candidatos.append((int(self._comprimento_sequencia[meio]), meio))
+        candidatos.append((ultimo - int(self._inicio_sequencia[sequencia_final]), sequencia_final))
+        comprimento, sequencia = max(candidatos, key=lambda candidato: (candidato[0], -candidato[1]))
+        return NOMES_COLUNAS[self._coluna_sequencia[sequencia]], comprimento
+
+    def _maior_entre(self, primeira, ultima):
+        # Sequência mais longa (a primeira, em caso de empate) entre as sequências primeira .. ultima:
+        # as pontas (até log2(n) sequências cada) são percorridas e os blocos completos do meio
+        # consultados em O(1) na tabela esparsa
+        comprimentos = self._comprimento_sequencia
+        bloco_inicial, bloco_final = primeira // self._tamanho_bloco, ultima // self._tamanho_bloco
+        if bloco_final - bloco_inicial <= 1:
+            return primeira + int(comprimentos[primeira:ultima + 1].argmax())
+        fim_inicial, inicio_final = (bloco_inicial + 1) * self._tamanho_bloco, bloco_final * self._tamanho_bloco
+        candidatos = (primeira + int(comprimentos[primeira:fim_inicial].argmax()),
+                      self._maior_nos_blocos(bloco_inicial + 1, bloco_final - 1),
+                      inicio_final + int(comprimentos[inicio_final:ultima + 1].argmax()))
+        # Em ordem de posição: max devolve o primeiro com o maior comprimento
+        return max(candidatos, key=lambda sequencia: comprimentos[sequencia])
+
+    def _maior_nos_blocos(self, primeiro, ultimo):
+        # Consulta O(1) na tabela esparsa: duas faixas de 2**nivel blocos que cobrem [primeiro, ultimo]
+        nivel = (ultimo - primeiro + 1).bit_length() - 1
+        esquerda = int(self._maximos[nivel][primeiro])
+        direita = int(self._maximos[nivel][ultimo - (1 << nivel) + 1])
+        if self._comprimento_sequencia[direita] > self._comprimento_sequencia[esquerda]:
+            return direita
+        return esquerda
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class Instrumentacao:
+    """
+    Coleta tempos por fase, contadores e eventos de uma execução (opcional).
+
+    simular_apostas recebe uma instância pelo parâmetro 'instrumentacao'; sem ela (padrão) o laço
+    só testa uma variável local por fase, então a instrumentação pode ficar disponível em produção.
+    Trechos maiores (gráficos, leitura de arquivos) são medidos com o gerenciador 'secao'.
+
+    Os dados podem ser gravados como relatório JSON (salvar_relatorio), como pilhas agregadas
+    para gráficos de chama (salvar_pilhas, formato aceito por speedscope e flamegraph.pl) ou como
+    eventos no formato Trace Event do Chrome (salvar_trace, para chrome://tracing e Perfetto).
+    """
+
+    def __init__(self):
+        # Tempo total (s) e quantidade de medições de cada pilha de fases ("simular_apostas;estatisticas")
+        self.tempos = Counter()
+        self.medicoes = Counter()
+        self.contadores = Counter()
+        self.eventos = []
+        self._origem = time.perf_counter()
+
+    def adicionar_tempo(self, pilha, segundos, medicoes=1):
+        self.tempos[pilha] += segundos
+        self.medicoes[pilha] += medicoes
+
+    def contar(self, nome, quantidade=1):
+        self.contadores[nome] += quantidade
+
+    def registrar_evento(self, nome, inicio, fim, argumentos=None):
+        """Registra um intervalo medido com time.perf_counter para o arquivo de trace."""
+        self.eventos.append({
+            "name": nome, "ph": "X", "ts": (inicio - self._origem) * 1e6, "dur": (fim - inicio) * 1e6,
+            "pid": os.getpid(), "tid": threading.get_ident(), "args": argumentos or {},
+        })
+
+    @contextmanager
+    def secao(self, nome, **argumentos):
+        """Mede um trecho de código: with instrumentacao.secao("graficos"): ..."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fim = time.perf_counter()
+            self.adicionar_tempo(nome, fim - inicio)
+            self.registrar_evento(nome, inicio, fim, argumentos)
+
+    def combinar(self, outra):
+        """Soma os dados de outra instância (ex.: vinda de um processo de trabalho)."""
+        self.tempos.update(outra.tempos)
+        self.medicoes.update(outra.medicoes)
+        self.contadores.update(outra.contadores)
+        deslocamento = (outra._origem - self._origem) * 1e6
+        self.eventos.extend(dict(evento, ts=evento["ts"] + deslocamento) for evento in outra.eventos)
+
+    def relatorio(self):
+        """Retorna um dicionário com as fases (tempo e medições) e os contadores."""
+        return {
+            "fases": {pilha: {"tempo_s": self.tempos[pilha], "medicoes": self.medicoes[pilha]}
+                      for pilha in sorted(self.tempos)},
+            "contadores": dict(sorted(self.contadores.items())),
+        }
+
+    def imprimir_relatorio(self):
+        print(f"{'fase':<45} {'tempo (s)':>10} {'medições':>10}")
+        for pilha in sorted(self.tempos):
+            print(f"{pilha:<45} {self.tempos[pilha]:>10.4f} {self.medicoes[pilha]:>10}")
+        for nome, quantidade in sorted(self.contadores.items()):
+            print(f"{nome:<45} {quantidade:>21}")
+
+    def salvar_relatorio(self, destino):
+        with open(destino, "w") as f:
+            json.dump(self.relatorio(), f, indent=2)
+
+    def salvar_pilhas(self, destino):
+        """
+        Grava as pilhas agregadas ("pai;filho microssegundos" por linha). O tempo de cada pilha
+        é o tempo próprio: as fases filhas são descontadas do tempo da pilha pai.
+        """
+        proprios = Counter(self.tempos)
+        for pilha, segundos in self.tempos.items():
+            if ";" in pilha:
+                pai = pilha.rsplit(";", 1)[0]
+                if pai in proprios:
+                    proprios[pai] -= segundos
+        with open(destino, "w") as f:
+            for pilha in sorted(proprios):
+                f.write(f"{pilha} {max(round(proprios[pilha] * 1e6), 0)}\n")
+
+    def salvar_trace(self, destino):
+        with open(destino, "w") as f:
+            json.dump({"traceEvents": self.eventos, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,140 @@
+from collections import deque
+
+from tabela_roleta import COLUNA_DO_NUMERO, FORA, NOMES_COLUNAS
+
+
+class JanelaEstatisticas:
+    """
+    Janela deslizante de resultados com estatísticas das colunas mantidas de forma incremental.
+
+    Cada resultado que entra ou sai da janela atualiza os contadores em O(1), substituindo
+    as recontagens completas feitas por contar_frequencias, calcular_atrasos,
+    calcular_repeticoes_recentes e calcular_repeticoes_antigas a cada rodada.
+    Os métodos de consulta devolvem exatamente os mesmos dicionários dessas funções.
+
+    Parâmetros:
+    - resultados_iniciais: Lista de tuplas no formato [[numero, cor], ...] que preenche a janela.
+    - tamanho: Tamanho máximo da janela (padrão: quantidade de resultados iniciais).
+    """
+
+    def __init__(self, resultados_iniciais=(), tamanho=None):
+        resultados_iniciais = list(resultados_iniciais)
+        self.tamanho = len(resultados_iniciais) if tamanho is None else tamanho
+        self._resultados = deque()
+        # Posição absoluta do próximo resultado a entrar e da última aparição de cada coluna
+        self._posicao = 0
+        self._ultima_posicao = [None, None, None]
+        self._frequencias = [0, 0, 0]
+        # Sequências consecutivas (ignorando o zero) como listas [coluna, comprimento]
+        self._sequencias = deque()
+        self._quantidade_colunas = 0
+        # Última sequência com 2 ou mais repetições de cada coluna
+        self._sequencia_recente = [None, None, None]
+        # Soma dos comprimentos das sequências com 2 ou mais repetições de cada coluna
+        self._soma_repeticoes = [0, 0, 0]
+        for resultado in resultados_iniciais:
+            self.adicionar(resultado)
+
+    def __len__(self):
+        return len(self._resultados)
+
+    def __iter__(self):
+        return iter(self._resultados)
+
+    def resultados(self):
+        """Retorna a lista de resultados presentes na janela, do mais antigo ao mais recente."""
+        return list(self._resultados)
+
+    def adicionar(self, resultado):
+        """
+        Insere um resultado no fim da janela e descarta o mais antigo se o tamanho for excedido.
+        """
+        self._resultados.append(resultado)
+        coluna = COLUNA_DO_NUMERO[resultado[0]]
+        if coluna != FORA:
+            self._frequencias[coluna] += 1
+            self._ultima_posicao[coluna] = self._posicao
+            self._quantidade_colunas += 1
+            if self._sequencias and self._sequencias[-1][0] == coluna:
+                sequencia = self._sequencias[-1]
+                self._alterar_comprimento(sequencia, sequencia[1] + 1)
+            else:
+                sequencia = [coluna, 1]
+                self._sequencias.append(sequencia)
+            if sequencia[1] > 1:
+                self._sequencia_recente[coluna] = sequencia
+        self._posicao += 1
+        while len(self._resultados) > self.tamanho:
+            self.remover_mais_antigo()
+
+    def remover_mais_antigo(self):
+        """Remove e retorna o resultado mais antigo da janela."""
+        resultado = self._resultados.popleft()
+        coluna = COLUNA_DO_NUMERO[resultado[0]]
+        if coluna != FORA:
+            self._frequencias[coluna] -= 1
+            self._quantidade_colunas -= 1
+            sequencia = self._sequencias[0]
+            self._alterar_comprimento(sequencia, sequencia[1] - 1)
+            if sequencia[1] == 0:
+                self._sequencias.popleft()
+            # A sequência mais antiga só é a recente da coluna se não houver outra depois dela
+            if self._sequencia_recente[coluna] is sequencia and sequencia[1] < 2:
+                self._sequencia_recente[coluna] = None
+        return resultado
+
+    def _alterar_comprimento(self, sequencia, comprimento):
+        coluna = sequencia[0]
+        self._soma_repeticoes[coluna] += _contribuicao(comprimento) - _contribuicao(sequencia[1])
+        sequencia[1] = comprimento
+
+    # Equivalente a contar_frequencias(janela)
+    def frequencias(self):
+        return {NOMES_COLUNAS[c]: self._frequencias[c] for c in range(3) if self._frequencias[c] > 0}
+
+    # Equivalente a calcular_atrasos(janela)
+    def atrasos(self):
+        total_rodadas = len(self._resultados)
+        inicio = self._posicao - total_rodadas
+        atrasos = {}
+        for c, nome in enumerate(NOMES_COLUNAS):
+            ultima = self._ultima_posicao[c]
+            if ultima is None or ultima < inicio:
+                atrasos[nome] = 2 * total_rodadas
+            else:
+                atrasos[nome] = self._posicao - ultima
+        return atrasos
+
+    # Equivalente a calcular_repeticoes_recentes(janela)
+    def repeticoes_recentes(self):
+        repeticoes = {}
+        for c, nome in enumerate(NOMES_COLUNAS):
+            sequencia = self._sequencia_recente[c]
+            repeticoes[nome] = sequencia[1] if sequencia is not None else 0
+        return repeticoes
+
+    # Equivalente a calcular_repeticoes_antigas(janela, limite_tempo)
+    def repeticoes_antigas(self, limite_tempo=5):
+        """
+        Soma das sequências com 2 ou mais repetições após descartar os primeiros
+        'limite_tempo' resultados (sem o zero). Só as sequências que tocam o trecho
+        descartado precisam ser corrigidas, então o custo depende de limite_tempo e não da janela.
+        """
+        soma = list(self._soma_repeticoes)
+        if self._quantidade_colunas <= limite_tempo:
+            return {nome: 0 for nome in NOMES_COLUNAS}
+        restante = limite_tempo
+        for sequencia in self._sequencias:
+            if restante <= 0:
+                break
+            coluna, comprimento = sequencia
+            soma[coluna] -= _contribuicao(comprimento)
+            if comprimento > restante:
+                soma[coluna] += _contribuicao(comprimento - restante)
+            restante -= comprimento
+        return {nome: soma[c] for c, nome in enumerate(NOMES_COLUNAS)}
+
+
+# Uma sequência só conta como repetição com 2 ou mais ocorrências
+def _contribuicao(comprimento):
+    return comprimento if comprimento > 1 else 0
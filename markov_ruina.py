@@ -0,0 +1,290 @@
+import argparse
+import copy
+import itertools
+import math
+from collections import deque
+from statistics import NormalDist
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from estrategias import ESTRATEGIAS_REGISTRADAS, criar_estrategia
+from monte_carlo import intervalo_wilson, simular_monte_carlo
+from tabela_roleta import NOMES_COLUNAS, RETORNO_DA_APOSTA, retorno_apostas
+
+
+# Duas colunas cobrem 24 dos 37 números; a aposta perde nos outros 12 e no zero (13/37)
+COLUNAS_APOSTADAS = list(NOMES_COLUNAS[:2])
+PROBABILIDADE_VITORIA = sum(1 for retorno in zip(*(RETORNO_DA_APOSTA[coluna] for coluna in COLUNAS_APOSTADAS))
+                            if any(retorno)) / 37
+NUMERO_VENCEDOR = next(numero for numero, retorno in enumerate(RETORNO_DA_APOSTA[COLUNAS_APOSTADAS[0]]) if retorno)
+MOTIVOS = ("stop_gain", "stop_loss", "max_perdas_consecutivas", "saldo_insuficiente", "fim_dos_resultados")
+MAX_ESTADOS = 2_000_000
+
+
+class CadeiaApostas:
+    """
+    Cadeia de Markov absorvente de uma sessão de simular_apostas com rodadas independentes.
+
+    Os estados transitórios são (saldo, perdas consecutivas, estado da progressão); os absorventes
+    são (motivo de encerramento, saldo final). As transições aplicam os mesmos ganchos da estratégia
+    (estrategias.py) e as mesmas regras de parada de simular_apostas, com vitória de probabilidade
+    'probabilidade_vitoria' a cada rodada: numa roleta sem memória as colunas escolhidas não mudam
+    essa probabilidade.
+
+    Atributos:
+    - Q: Matriz esparsa (transitórios x transitórios).
+    - R: Matriz esparsa (transitórios x absorventes).
+    - apostas: 1.0 nos estados em que há aposta (os demais só encerram por saldo insuficiente).
+    - saldos: Saldo de cada estado transitório.
+    - absorventes: Lista de (motivo, saldo final).
+    """
+
+    def __init__(self, estrategia="martingale", saldo_inicial=10, aposta_base=1, max_perdas_consecutivas=3,
+                 stop_gain=20, stop_loss=-5, probabilidade_vitoria=PROBABILIDADE_VITORIA, max_estados=MAX_ESTADOS):
+        self.saldo_inicial = saldo_inicial
+        probabilidade_derrota = 1 - probabilidade_vitoria
+        inicial = criar_estrategia(estrategia, aposta_base)
+        indices = {(saldo_inicial, 0, inicial.estado()): 0}
+        pendentes = deque([(saldo_inicial, 0, inicial)])
+        indices_absorventes = {}
+        self.saldos = []
+        self.apostas = []
+        self.absorventes = []
+        linhas_q, colunas_q, valores_q = [], [], []
+        linhas_r, colunas_r, valores_r = [], [], []
+
+        def destino(chave, progressao):
+            indice = indices.get(chave)
+            if indice is None:
+                if len(indices) >= max_estados:
+                    raise ValueError(f"A cadeia passou de {max_estados} estados; limite stop_gain/stop_loss "
+                                     "ou max_perdas_consecutivas.")
+                indice = indices[chave] = len(indices)
+                pendentes.append((chave[0], chave[1], progressao))
+            return indice
+
+        def absorver(linha, motivo, saldo, probabilidade):
+            indice = indices_absorventes.get((motivo, saldo))
+            if indice is None:
+                indice = indices_absorventes[(motivo, saldo)] = len(self.absorventes)
+                self.absorventes.append((motivo, saldo))
+            linhas_r.append(linha)
+            colunas_r.append(indice)
+            valores_r.append(probabilidade)
+
+        # Os estados são numerados na ordem em que são descobertos (busca em largura)
+        while pendentes:
+            saldo, perdas_consecutivas, progressao = pendentes.popleft()
+            linha = len(self.saldos)
+            self.saldos.append(saldo)
+            progressao = copy.deepcopy(progressao)
+            aposta_atual = progressao.proxima_aposta(saldo)
+            apos_aposta = saldo - aposta_atual
+            if apos_aposta <= 0:
+                self.apostas.append(0.0)
+                absorver(linha, "saldo_insuficiente", saldo, 1.0)
+                continue
+            self.apostas.append(1.0)
+
+            vitoria = copy.deepcopy(progressao)
+            saldo_vitoria = apos_aposta + retorno_apostas(COLUNAS_APOSTADAS, NUMERO_VENCEDOR, aposta_atual)
+            vitoria.ao_vencer()
+            if saldo_vitoria - saldo_inicial >= stop_gain:
+                absorver(linha, "stop_gain", saldo_vitoria, probabilidade_vitoria)
+            else:
+                linhas_q.append(linha)
+                colunas_q.append(destino((saldo_vitoria, 0, vitoria.estado()), vitoria))
+                valores_q.append(probabilidade_vitoria)
+
+            progressao.ao_perder()
+            if apos_aposta - saldo_inicial <= stop_loss:
+                absorver(linha, "stop_loss", apos_aposta, probabilidade_derrota)
+            elif perdas_consecutivas + 1 >= max_perdas_consecutivas:
+                absorver(linha, "max_perdas_consecutivas", apos_aposta, probabilidade_derrota)
+            else:
+                chave = (apos_aposta, perdas_consecutivas + 1, progressao.estado())
+                linhas_q.append(linha)
+                colunas_q.append(destino(chave, progressao))
+                valores_q.append(probabilidade_derrota)
+
+        tamanho = len(self.saldos)
+        self.Q = sparse.csr_matrix((valores_q, (linhas_q, colunas_q)), shape=(tamanho, tamanho))
+        self.R = sparse.csr_matrix((valores_r, (linhas_r, colunas_r)), shape=(tamanho, len(self.absorventes)))
+        self.saldos = np.asarray(self.saldos, dtype=float)
+        self.apostas = np.asarray(self.apostas)
+
+    def __len__(self):
+        return len(self.saldos)
+
+    def resolver(self, rodadas=None):
+        """
+        Distribuição exata do encerramento da sessão que começa no estado inicial.
+
+        Sem 'rodadas' a sessão só termina por uma regra de parada: resolve (I - Q)^T y = e0 (uma
+        fatoração LU esparsa) e y são as visitas esperadas a cada estado. Com 'rodadas' a sessão
+        tem no máximo essa quantidade de resultados, como em simular_monte_carlo: a distribuição
+        é propagada rodada a rodada e o que sobra termina em 'fim_dos_resultados'.
+
+        Retorna:
+        - Um dicionário com as probabilidades de cada motivo ('prob_<motivo>'), de ruína (saldo
+          insuficiente com prejuízo, como em monte_carlo) e de lucro, o ganho líquido esperado e
+          seu desvio padrão, as rodadas esperadas, a quantidade de estados e a distribuição
+          [(ganho_liquido, probabilidade), ...].
+        """
+        absorvidos = {}
+        if rodadas is None:
+            inicial = np.zeros(len(self))
+            inicial[0] = 1.0
+            identidade = sparse.identity(len(self), format="csc")
+            visitas = splu((identidade - self.Q).T.tocsc()).solve(inicial)
+            probabilidades = self.R.T @ visitas
+            rodadas_esperadas = float(visitas @ self.apostas)
+            for (motivo, saldo), probabilidade in zip(self.absorventes, probabilidades):
+                absorvidos[motivo, saldo] = absorvidos.get((motivo, saldo), 0.0) + probabilidade
+        else:
+            distribuicao = np.zeros(len(self))
+            distribuicao[0] = 1.0
+            acumulado = np.zeros(len(self.absorventes))
+            rodadas_esperadas = 0.0
+            Q_transposta, R_transposta = self.Q.T.tocsr(), self.R.T.tocsr()
+            for _ in range(rodadas):
+                acumulado += R_transposta @ distribuicao
+                rodadas_esperadas += float(distribuicao @ self.apostas)
+                distribuicao = Q_transposta @ distribuicao
+            for (motivo, saldo), probabilidade in zip(self.absorventes, acumulado):
+                absorvidos[motivo, saldo] = absorvidos.get((motivo, saldo), 0.0) + probabilidade
+            for saldo, probabilidade in zip(self.saldos, distribuicao):
+                if probabilidade:
+                    chave = ("fim_dos_resultados", float(saldo))
+                    absorvidos[chave] = absorvidos.get(chave, 0.0) + probabilidade
+        return self._resumir(absorvidos, rodadas_esperadas)
+
+    def _resumir(self, absorvidos, rodadas_esperadas):
+        por_motivo = dict.fromkeys(MOTIVOS, 0.0)
+        por_ganho = {}
+        ruina = 0.0
+        for (motivo, saldo), probabilidade in absorvidos.items():
+            ganho = float(saldo - self.saldo_inicial)
+            probabilidade = float(probabilidade)
+            por_motivo[motivo] += probabilidade
+            por_ganho[ganho] = por_ganho.get(ganho, 0.0) + probabilidade
+            if motivo == "saldo_insuficiente" and ganho < 0:
+                ruina += probabilidade
+        media = sum(ganho * probabilidade for ganho, probabilidade in por_ganho.items())
+        variancia = sum((ganho - media) ** 2 * probabilidade for ganho, probabilidade in por_ganho.items())
+        resumo = {f"prob_{motivo}": probabilidade for motivo, probabilidade in por_motivo.items()}
+        resumo.update({
+            "prob_ruina": ruina,
+            "prob_lucro": sum(probabilidade for ganho, probabilidade in por_ganho.items() if ganho > 0),
+            "ganho_esperado": media,
+            "desvio": math.sqrt(max(variancia, 0.0)),
+            "rodadas_esperadas": rodadas_esperadas,
+            "estados": len(self),
+            "distribuicao": sorted(por_ganho.items()),
+        })
+        return resumo
+
+
+def analisar_sessao(estrategia="martingale", saldo_inicial=10, aposta_base=1, max_perdas_consecutivas=3,
+                    stop_gain=20, stop_loss=-5, rodadas=None, probabilidade_vitoria=PROBABILIDADE_VITORIA):
+    """
+    Probabilidades exatas de ruína e de cada regra de parada, ganho líquido e rodadas esperados
+    de uma sessão de simular_apostas, sem simular (veja CadeiaApostas.resolver).
+    """
+    cadeia = CadeiaApostas(estrategia, saldo_inicial, aposta_base, max_perdas_consecutivas, stop_gain, stop_loss,
+                           probabilidade_vitoria)
+    return cadeia.resolver(rodadas)
+
+
+def analisar_grade(estrategias, saldos_iniciais=(10,), apostas_base=(1,), max_perdas=(3,), stop_gains=(20,),
+                   stop_losses=(-5,), rodadas=None):
+    """
+    Analisa todas as combinações de parâmetros da grade.
+
+    Retorna:
+    - Um gerador de dicionários com a configuração e o resumo de analisar_sessao (sem a distribuição).
+    """
+    for estrategia, saldo, aposta, perdas, gain, loss in itertools.product(
+            estrategias, saldos_iniciais, apostas_base, max_perdas, stop_gains, stop_losses):
+        resumo = analisar_sessao(estrategia, saldo, aposta, perdas, gain, loss, rodadas)
+        del resumo["distribuicao"]
+        yield {"estrategia": estrategia, "saldo_inicial": saldo, "aposta_base": aposta,
+               "max_perdas_consecutivas": perdas, "stop_gain": gain, "stop_loss": loss, **resumo}
+
+
+def comparar_com_monte_carlo(estrategia="martingale", sessoes=20000, rodadas=200, semente=None,
+                             tamanho_janela=30, confianca=0.95, **parametros):
+    """
+    Confere o resultado exato contra sessões simuladas por monte_carlo.simular_monte_carlo
+    (mesmas regras de simular_apostas, sobre números sorteados) com o mesmo limite de rodadas.
+
+    É uma conferência estatística: mesmo com o resultado exato correto, cada medida fica fora do
+    intervalo com probabilidade 1 - confianca. Para conferir várias medidas de uma vez, use uma
+    confiança corrigida (Bonferroni), como faz o __main__.
+
+    Retorna:
+    - Um dicionário {medida: (exato, simulado, intervalo da simulação com a confiança pedida,
+      dentro do intervalo)} para o ganho líquido médio e as probabilidades de ruína, de lucro e de stop_gain.
+    """
+    exato = analisar_sessao(estrategia, rodadas=rodadas, **parametros)
+    simulado = simular_monte_carlo(sessoes, rodadas, tamanho_janela, [estrategia], semente=semente,
+                                   **parametros)[estrategia]
+    total = simulado["sessoes"]
+    z = NormalDist().inv_cdf(1 - (1 - confianca) / 2)
+    margem = z * simulado["desvio"] / math.sqrt(total)
+    comparacao = {"ganho_esperado": (exato["ganho_esperado"], simulado["media"],
+                                     (simulado["media"] - margem, simulado["media"] + margem))}
+    for medida in ("prob_ruina", "prob_lucro", "prob_stop_gain"):
+        comparacao[medida] = (exato[medida], simulado[medida],
+                              intervalo_wilson(round(simulado[medida] * total), total, z))
+    return {medida: (valor_exato, valor_simulado, intervalo, intervalo[0] <= valor_exato <= intervalo[1])
+            for medida, (valor_exato, valor_simulado, intervalo) in comparacao.items()}
+
+
+# Função para imprimir a análise exata de cada configuração
+def imprimir_analise(linhas):
+    print(f"{'estrategia':<12} {'saldo':>6} {'gain':>6} {'loss':>6} {'perdas':>6} {'ruina':>8} {'stop_gain':>10} "
+          f"{'lucro':>8} {'ganho esperado':>15} {'rodadas':>8} {'estados':>8}")
+    for linha in linhas:
+        print(f"{linha['estrategia']:<12} {linha['saldo_inicial']:>6g} {linha['stop_gain']:>6g} "
+              f"{linha['stop_loss']:>6g} {linha['max_perdas_consecutivas']:>6} {linha['prob_ruina']:>8.2%} "
+              f"{linha['prob_stop_gain']:>10.2%} {linha['prob_lucro']:>8.2%} {linha['ganho_esperado']:>15.4f} "
+              f"{linha['rodadas_esperadas']:>8.1f} {linha['estados']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Análise exata (cadeia de Markov) de ruína e regras de parada.")
+    parser.add_argument("--estrategias", nargs="+", default=["martingale", "dalembert", "fibonacci", "paroli"],
+                        choices=list(ESTRATEGIAS_REGISTRADAS))
+    parser.add_argument("--saldos-iniciais", nargs="+", type=float, default=[10])
+    parser.add_argument("--apostas-base", nargs="+", type=float, default=[1])
+    parser.add_argument("--max-perdas", nargs="+", type=int, default=[3])
+    parser.add_argument("--stop-gains", nargs="+", type=float, default=[20])
+    parser.add_argument("--stop-losses", nargs="+", type=float, default=[-5])
+    parser.add_argument("--rodadas", type=int, help="Limite de rodadas por sessão (padrão: sem limite)")
+    parser.add_argument("--conferir", type=int, metavar="SESSOES",
+                        help="Confere cada estratégia (primeira configuração) com essa quantidade de sessões simuladas")
+    parser.add_argument("--semente", type=int, help="Semente das sessões simuladas de --conferir")
+    argumentos = parser.parse_args()
+
+    imprimir_analise(analisar_grade(argumentos.estrategias, argumentos.saldos_iniciais, argumentos.apostas_base,
+                                    argumentos.max_perdas, argumentos.stop_gains, argumentos.stop_losses,
+                                    argumentos.rodadas))
+    if argumentos.conferir:
+        # Correção de Bonferroni: 95% de confiança para o conjunto das 4 medidas de todas as estratégias
+        confianca = 1 - 0.05 / (4 * len(argumentos.estrategias))
+        print(f"\nConferência estatística com IC de {confianca:.3%} por medida (95% para o conjunto): "
+              "com o cálculo exato correto, ainda há 5% de chance de alguma medida aparecer como FORA.")
+        for estrategia in argumentos.estrategias:
+            print(f"\n--- Conferência com Monte Carlo: {estrategia} ---")
+            comparacao = comparar_com_monte_carlo(
+                estrategia, argumentos.conferir, argumentos.rodadas or 200,
+                argumentos.semente, confianca=confianca,
+                saldo_inicial=argumentos.saldos_iniciais[0], aposta_base=argumentos.apostas_base[0],
+                max_perdas_consecutivas=argumentos.max_perdas[0], stop_gain=argumentos.stop_gains[0],
+                stop_loss=argumentos.stop_losses[0])
+            for medida, (exato, simulado, (inferior, superior), confere) in comparacao.items():
+                print(f"{medida:<16} exato {exato:.5f}  simulado {simulado:.5f}  "
+                      f"IC [{inferior:.5f}, {superior:.5f}]  {'ok' if confere else 'FORA'}")
@@ -0,0 +1,168 @@
+import math
+from collections import Counter
+
+import numpy as np
+
+from backtest_vetorizado import (ESTRATEGIAS, encerramento, estatisticas_janelas, mascaras_de_estatisticas,
+                                 resolver_vitorias_lote, saldos_por_rodada)
+from estrategias import obter_estrategia
+
+
+PERCENTIS = (1, 5, 25, 50, 75, 95, 99)
+Z_95 = 1.959963984540054
+
+
+def gerar_sessoes(gerador, sessoes, largura):
+    """Gera 'sessoes' linhas de 'largura' números sorteados numa roleta europeia (0 a 36)."""
+    return gerador.integers(0, 37, size=(sessoes, largura), dtype=np.uint8)
+
+
+def simular_lote(numeros, tamanho_janela, estrategias=ESTRATEGIAS, saldo_inicial=10, aposta_base=1,
+                 max_perdas_consecutivas=3, stop_gain=20, stop_loss=-5, pesos_padrao=(0.7, 0.3, 0.0, 0.2)):
+    """
+    Simula um lote de sessões independentes com as mesmas regras de simular_apostas.
+
+    Parâmetros:
+    - numeros: Array (sessões, tamanho_janela + rodadas); os primeiros números de cada linha
+      formam a janela inicial analisada e o restante é apostado.
+
+    Retorna:
+    - Um dicionário {estrategia: (ganhos_liquidos, por_saldo_insuficiente)} com um valor por sessão.
+    """
+    sessoes, largura = numeros.shape
+    rodadas = largura - tamanho_janela
+    # As janelas que cruzam o limite entre sessões são calculadas, mas descartadas
+    estatisticas = estatisticas_janelas(numeros.reshape(-1), tamanho_janela)
+    posicoes = (np.arange(sessoes)[:, None] * largura + np.arange(rodadas)).reshape(-1)
+    estatisticas = [estatistica[posicoes] for estatistica in estatisticas]
+    padrao, dinamicas = mascaras_de_estatisticas(estatisticas, numeros[:, tamanho_janela:].reshape(-1),
+                                                 tamanho_janela, pesos_padrao)
+    vitorias, jogadas = resolver_vitorias_lote(padrao.reshape(sessoes, rodadas),
+                                               dinamicas.reshape(sessoes, rodadas), max_perdas_consecutivas)
+    resultado = {}
+    linhas = np.arange(sessoes)
+    with np.errstate(over="ignore"):
+        for estrategia in estrategias:
+            apostas, _ = obter_estrategia(estrategia).apostas_lote(vitorias, aposta_base, saldo_inicial)
+            apos_aposta, apos_rodada = saldos_por_rodada(apostas, vitorias, saldo_inicial)
+            fim, por_saldo = encerramento(apos_aposta, apos_rodada, vitorias, jogadas, saldo_inicial,
+                                          stop_gain, stop_loss)
+            saldo_final = np.where(fim > 0, apos_rodada[linhas, np.maximum(fim - 1, 0)], saldo_inicial)
+            resultado[estrategia] = (saldo_final - saldo_inicial, por_saldo)
+    return resultado
+
+
+def simular_monte_carlo(sessoes, rodadas=200, tamanho_janela=30, estrategias=ESTRATEGIAS, saldo_inicial=10,
+                        aposta_base=1, max_perdas_consecutivas=3, stop_gain=20, stop_loss=-5,
+                        pesos_padrao=(0.7, 0.3, 0.0, 0.2), semente=None, tamanho_lote=5000, percentis=PERCENTIS):
+    """
+    Gera sessões sintéticas de roleta europeia e simula cada estratégia sobre elas.
+
+    As sessões são processadas em lotes de 'tamanho_lote', e de cada lote só se guarda a
+    contagem de cada ganho líquido distinto, então a memória não cresce com o número de
+    sessões (10^7 ou mais).
+
+    Parâmetros:
+    - sessoes: Quantidade de sessões sintéticas.
+    - rodadas: Rodadas sorteadas por sessão, além da janela inicial.
+    - tamanho_janela: Tamanho da janela analisada (tmt).
+    - semente: Semente do gerador do NumPy, para resultados reproduzíveis.
+    - Demais parâmetros: Como em simular_apostas.
+
+    Retorna:
+    - Um dicionário {estrategia: resumo}, com o resumo de resumir_distribuicao.
+    """
+    gerador = np.random.default_rng(semente)
+    distribuicoes = {estrategia: Counter() for estrategia in estrategias}
+    ruinas = Counter()
+    restantes = sessoes
+    while restantes > 0:
+        lote = min(tamanho_lote, restantes)
+        restantes -= lote
+        numeros = gerar_sessoes(gerador, lote, tamanho_janela + rodadas)
+        resultados = simular_lote(numeros, tamanho_janela, estrategias, saldo_inicial, aposta_base,
+                                  max_perdas_consecutivas, stop_gain, stop_loss, pesos_padrao)
+        for estrategia, (ganhos, por_saldo) in resultados.items():
+            valores, contagens = np.unique(ganhos, return_counts=True)
+            distribuicoes[estrategia].update(dict(zip(valores.tolist(), contagens.tolist())))
+            # Ruína: sem saldo para a próxima aposta e com prejuízo (o Paroli também para
+            # por saldo insuficiente depois de uma série de vitórias, com lucro)
+            ruinas[estrategia] += int((por_saldo & (ganhos < 0)).sum())
+    return {estrategia: resumir_distribuicao(distribuicoes[estrategia], ruinas[estrategia], stop_gain, percentis)
+            for estrategia in estrategias}
+
+
+def resumir_distribuicao(distribuicao, ruinas, stop_gain=20, percentis=PERCENTIS):
+    """
+    Resume a distribuição do ganho líquido a partir da contagem de cada valor.
+
+    Retorna:
+    - Um dicionário com média e intervalo de confiança de 95%, desvio padrão, percentis,
+      probabilidade de ruína (sessão encerrada com prejuízo por saldo insuficiente para a
+      próxima aposta) com intervalo de Wilson,
+      probabilidade de lucro e de atingir o stop_gain, e a própria distribuição.
+    """
+    valores = sorted(distribuicao)
+    total = sum(distribuicao.values())
+    media = sum(valor * distribuicao[valor] for valor in valores) / total
+    variancia = sum((valor - media) ** 2 * distribuicao[valor] for valor in valores) / max(total - 1, 1)
+    desvio = math.sqrt(variancia)
+    margem = Z_95 * desvio / math.sqrt(total)
+
+    resultado_percentis = {}
+    acumulado = 0
+    pendentes = sorted(percentis)
+    for valor in valores:
+        acumulado += distribuicao[valor]
+        while pendentes and acumulado >= math.ceil(pendentes[0] / 100 * total):
+            resultado_percentis[pendentes.pop(0)] = valor
+    for percentil in pendentes:
+        resultado_percentis[percentil] = valores[-1]
+
+    return {
+        "sessoes": total,
+        "media": media,
+        "ic_media": (media - margem, media + margem),
+        "desvio": desvio,
+        "percentis": resultado_percentis,
+        "prob_ruina": ruinas / total,
+        "ic_ruina": intervalo_wilson(ruinas, total),
+        "prob_lucro": sum(distribuicao[valor] for valor in valores if valor > 0) / total,
+        "prob_stop_gain": sum(distribuicao[valor] for valor in valores if valor >= stop_gain) / total,
+        "distribuicao": [(valor, distribuicao[valor]) for valor in valores],
+    }
+
+
+# Intervalo de confiança de Wilson para uma proporção
+def intervalo_wilson(sucessos, total, z=Z_95):
+    if total == 0:
+        return (0.0, 1.0)
+    p = sucessos / total
+    denominador = 1 + z ** 2 / total
+    centro = (p + z ** 2 / (2 * total)) / denominador
+    margem = z * math.sqrt(p * (1 - p) / total + z ** 2 / (4 * total ** 2)) / denominador
+    return (max(0.0, centro - margem), min(1.0, centro + margem))
+
+
+def probabilidade_ganho_maior_ou_igual(resumo, ganho_observado):
+    """
+    Fração das sessões sintéticas com ganho líquido maior ou igual ao observado no histórico.
+
+    Um valor alto indica que o ganho observado é comum numa roleta sem memória, ou seja,
+    que a vantagem aparente da estratégia no histórico gravado pode ser apenas ruído.
+    """
+    return sum(contagem for valor, contagem in resumo["distribuicao"] if valor >= ganho_observado) / resumo["sessoes"]
+
+
+# Função para imprimir o resumo do Monte Carlo
+def imprimir_resumo(resumos):
+    for estrategia, resumo in resumos.items():
+        inferior, superior = resumo["ic_media"]
+        ruina_inferior, ruina_superior = resumo["ic_ruina"]
+        print(f"\n--- Monte Carlo: {estrategia.capitalize()} ({resumo['sessoes']} sessões) ---")
+        print(f"Ganho líquido médio: {resumo['media']:.4f} (IC 95%: {inferior:.4f} a {superior:.4f})")
+        print(f"Desvio padrão: {resumo['desvio']:.4f}")
+        print("Percentis: " + ", ".join(f"p{p}={v:.2f}" for p, v in resumo["percentis"].items()))
+        print(f"Probabilidade de ruína: {resumo['prob_ruina']:.4%} "
+              f"(IC 95%: {ruina_inferior:.4%} a {ruina_superior:.4%})")
+        print(f"Probabilidade de lucro: {resumo['prob_lucro']:.4%}")
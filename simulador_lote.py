@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+from armazem_resultados import ArmazemResultados, compactar_rastro
+from carregar_historicos import ler_resultados, listar_arquivos_historico
+from estrategias import ESTRATEGIAS_REGISTRADAS
+from instrumentacao import Instrumentacao
+from simulador_rodadas_com_graficos import simular_apostas
+
+
+ESTRATEGIAS = ["martingale", "fibonacci", "dalembert", "paroli", "labouchere", "nenhuma_estrategia"]
+CAMPOS = ["arquivo", "estrategia", "resultados", "rodadas", "vitorias", "saldo_final", "ganho_liquido"]
+
+
+# Simula todas as estratégias sobre um arquivo de histórico (executada nos processos de trabalho)
+def simular_arquivo(tarefa):
+    caminho, estrategias, parametros, graficos, medir, rastros = tarefa
+    instrumentacao = Instrumentacao() if medir else None
+    with instrumentacao.secao("leitura", arquivo=caminho) if medir else contextlib.nullcontext():
+        resultados = list(ler_resultados(caminho))
+    janela = parametros["tamanho_janela"]
+    linhas = []
+    simulacoes = {}
+    for estrategia in estrategias:
+        # Cada estratégia recebe sua própria cópia da janela inicial
+        with contextlib.redirect_stdout(io.StringIO()):
+            saldo_final, historico, ganho_liquido = simular_apostas(
+                resultados[janela:], resultados[:janela], estrategia=estrategia, historico_colunar=True,
+                instrumentacao=instrumentacao, **parametros)
+        simulacoes[estrategia] = (saldo_final, historico, ganho_liquido)
+        linhas.append({
+            "arquivo": caminho,
+            "estrategia": estrategia,
+            "resultados": len(resultados),
+            "rodadas": len(historico),
+            "vitorias": int(historico.vitorias.sum()),
+            "saldo_final": saldo_final,
+            "ganho_liquido": ganho_liquido,
+        })
+    if graficos:
+        # O arquivo já roda em um processo de trabalho, então as figuras são desenhadas nele mesmo
+        from graficos import salvar_graficos
+        diretorio, formato = graficos
+        prefixo = os.path.splitext(os.path.basename(caminho))[0] + "_"
+        with instrumentacao.secao("graficos", arquivo=caminho) if medir else contextlib.nullcontext():
+            salvar_graficos(simulacoes, diretorio, formato, prefixo, processos=1)
+    if rastros:
+        rastros = {estrategia: compactar_rastro(historico) for estrategia, (_, historico, _) in simulacoes.items()}
+    return linhas, instrumentacao, rastros or None
+
+
+def simular_em_lote(origem, estrategias=ESTRATEGIAS, processos=None, graficos=None, instrumentacao=None,
+                    armazem=None, **parametros):
+    """
+    Simula as estratégias sobre cada arquivo de histórico, um arquivo por processo.
+
+    Parâmetros:
+    - origem: Diretório, padrão glob, arquivo ou lista deles (veja listar_arquivos_historico).
+    - estrategias: Nomes das estratégias a simular.
+    - processos: Quantidade de processos (padrão: todos os núcleos; 1 roda no processo atual).
+    - graficos: Tupla (diretorio, formato) para gravar os gráficos de cada arquivo (veja graficos.py).
+    - instrumentacao: Instrumentacao que recebe os tempos e contadores de todos os processos.
+    - armazem: ArmazemResultados (ou caminho do banco SQLite) com os resultados já calculados; só os
+      pares (arquivo, estratégia) que não estão nele são simulados, e os novos são guardados.
+      Os gráficos são gravados apenas para os arquivos simulados.
+    - parametros: Demais argumentos de simular_apostas (saldo_inicial, aposta_base, tamanho_janela...).
+
+    Retorna:
+    - Um gerador de dicionários com os campos de CAMPOS, na ordem cronológica dos arquivos.
+    """
+    parametros.setdefault("tamanho_janela", 30)
+    estrategias = list(estrategias)
+    medir = instrumentacao is not None
+    caminhos = listar_arquivos_historico(origem)
+    if armazem is None:
+        tarefas = [(caminho, estrategias, parametros, graficos, medir, False) for caminho in caminhos]
+        for resultado in _executar(tarefas, processos):
+            yield from _coletar(resultado, instrumentacao)
+        return
+
+    fechar = not isinstance(armazem, ArmazemResultados)
+    if fechar:
+        armazem = ArmazemResultados(armazem)
+    try:
+        configuracao = armazem.registrar_configuracao(parametros)
+        planos = []
+        a_simular = set()
+        for caminho in caminhos:
+            hash_arquivo, resultados, hash_anterior = armazem.identificar_arquivo(caminho)
+            guardadas = armazem.obter_linhas(caminho, hash_arquivo, configuracao, estrategias, resultados,
+                                             hash_anterior)
+            faltando = [estrategia for estrategia in estrategias if estrategia not in guardadas]
+            # Um arquivo com o mesmo conteúdo de outro já agendado reaproveita a simulação dele
+            repetido = bool(faltando) and hash_arquivo in a_simular
+            if faltando:
+                a_simular.add(hash_arquivo)
+            planos.append((caminho, hash_arquivo, guardadas, faltando, repetido))
+        if medir:
+            instrumentacao.contar("armazem.reaproveitadas", sum(len(plano[2]) for plano in planos))
+        simulados = _executar([(caminho, faltando, parametros, graficos, medir, True)
+                               for caminho, _, _, faltando, repetido in planos if faltando and not repetido],
+                              processos)
+        for caminho, hash_arquivo, guardadas, faltando, repetido in planos:
+            if repetido:
+                guardadas.update(armazem.obter_linhas(caminho, hash_arquivo, configuracao, faltando))
+            elif faltando:
+                resultado = next(simulados)
+                armazem.guardar_linhas(hash_arquivo, configuracao, resultado[0], resultado[2],
+                                       parametros["tamanho_janela"])
+                guardadas.update((linha["estrategia"], linha) for linha in _coletar(resultado, instrumentacao))
+            yield from ({campo: guardadas[estrategia][campo] for campo in CAMPOS} for estrategia in estrategias)
+    finally:
+        if fechar:
+            armazem.fechar()
+
+
+# Executa as tarefas no processo atual ou em um Pool, devolvendo os resultados na ordem das tarefas
+def _executar(tarefas, processos):
+    if processos == 1 or len(tarefas) <= 1:
+        yield from map(simular_arquivo, tarefas)
+        return
+    with Pool(min(processos or os.cpu_count(), len(tarefas))) as pool:
+        yield from pool.imap(simular_arquivo, tarefas)
+
+
+# Junta as medições do processo de trabalho às do processo principal e devolve as linhas
+def _coletar(resultado, instrumentacao):
+    linhas, medicoes, _ = resultado
+    if medicoes is not None:
+        instrumentacao.combinar(medicoes)
+    return linhas
+
+
+# Função para gravar o resumo em CSV (ou na saída padrão com '-')
+def salvar_csv(linhas, destino):
+    with (contextlib.nullcontext(sys.stdout) if destino == "-" else open(destino, "w", newline="")) as f:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS)
+        escritor.writeheader()
+        escritor.writerows(linhas)
+
+
+# Função para gravar o resumo em JSON (ou na saída padrão com '-')
+def salvar_json(linhas, destino):
+    with (contextlib.nullcontext(sys.stdout) if destino == "-" else open(destino, "w")) as f:
+        json.dump(linhas, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula as estratégias sobre vários históricos, sem interface gráfica.")
+    parser.add_argument("arquivos", nargs="+", help="Arquivos, diretórios ou padrões glob de historico_jogo_*.json")
+    parser.add_argument("--estrategias", nargs="+", default=ESTRATEGIAS, choices=list(ESTRATEGIAS_REGISTRADAS))
+    parser.add_argument("--saldo-inicial", type=float, default=10)
+    parser.add_argument("--aposta-base", type=float, default=1)
+    parser.add_argument("--janela", type=int, default=30)
+    parser.add_argument("--max-perdas", type=int, default=3)
+    parser.add_argument("--stop-gain", type=float, default=20)
+    parser.add_argument("--stop-loss", type=float, default=-5)
+    parser.add_argument("--processos", type=int, help="Quantidade de processos (padrão: todos os núcleos)")
+    parser.add_argument("--csv", help="Arquivo CSV de saída ('-' para a saída padrão)")
+    parser.add_argument("--json", help="Arquivo JSON de saída ('-' para a saída padrão)")
+    parser.add_argument("--graficos", help="Diretório onde gravar os gráficos de cada arquivo")
+    parser.add_argument("--formato", choices=["png", "svg"], default="png", help="Formato dos gráficos")
+    parser.add_argument("--perfil", help="Prefixo dos arquivos de perfil (.json, .trace.json e .folded)")
+    parser.add_argument("--armazem", help="Banco SQLite com os resultados já calculados (só simula o que mudou)")
+    argumentos = parser.parse_args()
+
+    instrumentacao = Instrumentacao() if argumentos.perfil else None
+    linhas = list(simular_em_lote(
+        argumentos.arquivos, argumentos.estrategias, argumentos.processos,
+        (argumentos.graficos, argumentos.formato) if argumentos.graficos else None, instrumentacao,
+        argumentos.armazem, saldo_inicial=argumentos.saldo_inicial, aposta_base=argumentos.aposta_base,
+        tamanho_janela=argumentos.janela, max_perdas_consecutivas=argumentos.max_perdas,
+        stop_gain=argumentos.stop_gain, stop_loss=argumentos.stop_loss))
+    if argumentos.csv:
+        salvar_csv(linhas, argumentos.csv)
+    if argumentos.json:
+        salvar_json(linhas, argumentos.json)
+    if not argumentos.csv and not argumentos.json:
+        salvar_csv(linhas, "-")
+    if instrumentacao is not None:
+        instrumentacao.salvar_relatorio(argumentos.perfil + ".json")
+        instrumentacao.salvar_trace(argumentos.perfil + ".trace.json")
+        instrumentacao.salvar_pilhas(argumentos.perfil + ".folded")
+        instrumentacao.imprimir_relatorio()
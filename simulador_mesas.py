@@ -0,0 +1,273 @@
+import argparse
+import heapq
+import json
+import random
+from itertools import islice
+
+from carregar_historicos import data_do_arquivo, ler_resultados, listar_arquivos_historico
+from estrategias import ESTRATEGIAS_REGISTRADAS, criar_estrategia
+from janela_estatisticas import JanelaEstatisticas
+from simulador_rodadas_com_graficos import escolher_colunas_em_cache, gerar_pesos_em_cache
+from tabela_roleta import RESULTADO_DO_NUMERO, alguma_aposta_vence, retorno_apostas
+
+
+# Segundos entre duas rodadas de uma mesa, quando o histórico não informa
+INTERVALO_RODADA = 40.0
+
+
+class Mesa:
+    """
+    Uma mesa jogada na sessão: um fluxo de números sorteados e o horário da primeira rodada.
+
+    Parâmetros:
+    - nome: Identificação da mesa nos resultados.
+    - numeros: Iterável com os números sorteados (lista, bytes ou gerador).
+    - inicio: Horário da primeira rodada, em segundos (ex.: datetime.timestamp()).
+    - intervalo: Segundos entre duas rodadas.
+    - estrategia: Progressão usada nesta mesa (None usa a estratégia padrão da sessão).
+    """
+
+    __slots__ = ("nome", "numeros", "inicio", "intervalo", "estrategia")
+
+    def __init__(self, nome, numeros, inicio=0.0, intervalo=INTERVALO_RODADA, estrategia=None):
+        self.nome = nome
+        self.numeros = numeros
+        self.inicio = inicio
+        self.intervalo = intervalo
+        self.estrategia = estrategia
+
+
+def mesas_de_arquivos(origem, intervalo=INTERVALO_RODADA, estrategia=None):
+    """
+    Cria uma mesa por arquivo de histórico, começando no horário do nome do arquivo.
+
+    Cada mesa recebe um gerador que só abre o arquivo na primeira rodada pedida e o lê em fluxo
+    (ler_resultados), então a memória não depende do tamanho dos históricos; arquivos sem data
+    no nome começam junto com o mais antigo.
+    """
+    caminhos = listar_arquivos_historico(origem)
+    datas = [data_do_arquivo(caminho) for caminho in caminhos]
+    primeiro = min((data.timestamp() for data in datas if data), default=0.0)
+    return [Mesa(caminho, _ler_numeros(caminho), data.timestamp() if data else primeiro, intervalo, estrategia)
+            for caminho, data in zip(caminhos, datas)]
+
+
+def _ler_numeros(caminho):
+    for numero, _ in ler_resultados(caminho):
+        yield numero
+
+
+def mesas_sinteticas(quantidade, rodadas, intervalo=INTERVALO_RODADA, semente=None, estrategia=None):
+    """
+    Cria mesas com números sorteados sob demanda (roleta europeia), com início espalhado no primeiro intervalo.
+
+    Cada mesa guarda só o seu gerador, então a memória não depende da quantidade de rodadas.
+    """
+    sorteio = random.Random(semente)
+    return [Mesa(f"mesa_{indice + 1}", _sortear(random.Random(sorteio.getrandbits(64)), rodadas),
+                 sorteio.uniform(0, intervalo), intervalo, estrategia)
+            for indice in range(quantidade)]
+
+
+def _sortear(gerador, rodadas):
+    sortear = gerador.randrange
+    for _ in range(rodadas):
+        yield sortear(37)
+
+
+class _EstadoMesa:
+    # Estado de uma mesa durante a sessão: só a janela de estatísticas e a progressão
+    __slots__ = ("mesa", "numeros", "janela", "progressao", "perdas_consecutivas", "rodadas", "ganho", "motivo",
+                 "jogando")
+
+    def __init__(self, mesa, numeros, janela, progressao):
+        self.mesa = mesa
+        self.numeros = numeros
+        self.janela = janela
+        self.progressao = progressao
+        self.perdas_consecutivas = 0
+        self.rodadas = 0
+        self.ganho = 0
+        self.motivo = None
+        self.jogando = False
+
+
+def simular_mesas(mesas, saldo_inicial=100, aposta_base=1, estrategia="martingale", max_perdas_consecutivas=3,
+                  stop_gain=20, stop_loss=-5, pesos_padrao=(0.7, 0.3, 0.0, 0.2), tamanho_janela=30,
+                  registrar_saldos=False):
+    """
+    Simula várias mesas jogadas ao mesmo tempo com uma única banca.
+
+    As rodadas de todas as mesas são intercaladas pelo horário (fila de prioridade: O(log n) por
+    rodada). Em cada mesa as apostas seguem as regras de simular_apostas: os primeiros
+    'tamanho_janela' resultados só preenchem a janela, a escolha das colunas é a mesma e
+    max_perdas_consecutivas encerra apenas aquela mesa. O saldo é compartilhado: stop_gain e
+    stop_loss valem para a banca e encerram todas as mesas, e uma aposta que a banca não cobre
+    encerra a mesa (saldo insuficiente). Cada mesa guarda só a janela e a progressão.
+
+    Com uma única mesa o resultado é o de simular_apostas(resultados, None, ...).
+
+    Parâmetros:
+    - mesas: Lista de Mesa (veja mesas_de_arquivos e mesas_sinteticas).
+    - estrategia: Progressão das mesas que não definem a sua.
+    - registrar_saldos: Se True, guarda (horário, saldo) após cada aposta.
+
+    Retorna:
+    - Um dicionário com o resumo da banca ('saldo_final', 'ganho_liquido', 'motivo', 'rodadas',
+      'saldo_minimo', 'maior_queda', 'maior_aposta', 'mesas_simultaneas', 'duracao'), a lista
+      'mesas' com o resumo de cada mesa e, se pedido, 'saldos'.
+    """
+    pesos_padrao = tuple(pesos_padrao)
+    estados = []
+    fila = []
+    for indice, mesa in enumerate(mesas):
+        numeros = iter(mesa.numeros)
+        janela = JanelaEstatisticas(RESULTADO_DO_NUMERO[numero] for numero in islice(numeros, tamanho_janela))
+        estados.append(_EstadoMesa(mesa, numeros, janela, criar_estrategia(mesa.estrategia or estrategia, aposta_base)))
+        # A primeira aposta é feita na rodada seguinte à janela inicial
+        heapq.heappush(fila, (mesa.inicio + len(janela) * mesa.intervalo, indice))
+
+    saldo = saldo_pico = saldo_minimo = saldo_inicial
+    maior_queda = maior_aposta = 0
+    rodadas = 0
+    # Mesas que já fizeram a primeira rodada e ainda não encerraram
+    mesas_ativas = mesas_simultaneas = 0
+    saldos = [] if registrar_saldos else None
+    motivo = None
+    primeiro_horario = fila[0][0] if fila else 0.0
+    horario = primeiro_horario
+
+    while fila:
+        horario, indice = fila[0]
+        estado = estados[indice]
+        numero = next(estado.numeros, None)
+        if numero is None:
+            estado.motivo = "fim_dos_resultados"
+            heapq.heappop(fila)
+            # Mesas cuja janela inicial consumiu todos os resultados nunca chegaram a jogar
+            if estado.jogando:
+                mesas_ativas -= 1
+            continue
+        if not estado.jogando:
+            estado.jogando = True
+            mesas_ativas += 1
+            mesas_simultaneas = max(mesas_simultaneas, mesas_ativas)
+        resultado = RESULTADO_DO_NUMERO[numero]
+        janela = estado.janela
+
+        frequencia_colunas = janela.frequencias()
+        atrasos = janela.atrasos()
+        repeticoes_recentes = janela.repeticoes_recentes()
+        repeticoes_antigas = janela.repeticoes_antigas()
+        if numero == 0 or estado.perdas_consecutivas > 1:
+            pesos = gerar_pesos_em_cache(frequencia_colunas, atrasos, repeticoes_recentes, repeticoes_antigas,
+                                         len(janela))
+        else:
+            pesos = pesos_padrao
+        colunas, _ = escolher_colunas_em_cache(frequencia_colunas, atrasos, repeticoes_recentes,
+                                               repeticoes_antigas, pesos)
+
+        progressao = estado.progressao
+        aposta_atual = progressao.proxima_aposta(saldo)
+        if saldo - aposta_atual <= 0:
+            estado.motivo = "saldo_insuficiente"
+            heapq.heappop(fila)
+            mesas_ativas -= 1
+            continue
+        # Mesma ordem de operações de simular_apostas (retira a aposta, depois soma o retorno)
+        saldo -= aposta_atual
+        retorno = retorno_apostas(colunas, numero, aposta_atual)
+        saldo += retorno
+        estado.ganho += retorno - aposta_atual
+        estado.rodadas += 1
+        rodadas += 1
+        maior_aposta = max(maior_aposta, aposta_atual)
+        saldo_pico = max(saldo_pico, saldo)
+        saldo_minimo = min(saldo_minimo, saldo)
+        maior_queda = max(maior_queda, saldo_pico - saldo)
+        if saldos is not None:
+            saldos.append((horario, saldo))
+
+        if alguma_aposta_vence(colunas, numero):
+            progressao.ao_vencer()
+            estado.perdas_consecutivas = 0
+            if saldo - saldo_inicial >= stop_gain:
+                motivo = "stop_gain"
+        else:
+            progressao.ao_perder()
+            estado.perdas_consecutivas += 1
+            if saldo - saldo_inicial <= stop_loss:
+                motivo = "stop_loss"
+            elif estado.perdas_consecutivas >= max_perdas_consecutivas:
+                estado.motivo = "max_perdas_consecutivas"
+        if motivo:
+            estado.motivo = motivo
+            break
+        if estado.motivo:
+            heapq.heappop(fila)
+            mesas_ativas -= 1
+            continue
+        janela.adicionar(resultado)
+        heapq.heapreplace(fila, (horario + estado.mesa.intervalo, indice))
+
+    # Mesas ainda na fila quando a banca parou
+    for _, indice in fila:
+        if estados[indice].motivo is None:
+            estados[indice].motivo = motivo
+    resumo = {
+        "saldo_final": saldo,
+        "ganho_liquido": saldo - saldo_inicial,
+        "motivo": motivo or "fim_dos_resultados",
+        "rodadas": rodadas,
+        "saldo_minimo": saldo_minimo,
+        "maior_queda": maior_queda,
+        "maior_aposta": maior_aposta,
+        "mesas_simultaneas": mesas_simultaneas,
+        "duracao": horario - primeiro_horario,
+        "mesas": [{"mesa": estado.mesa.nome, "estrategia": estado.mesa.estrategia or estrategia,
+                   "rodadas": estado.rodadas, "ganho": estado.ganho, "motivo": estado.motivo}
+                  for estado in estados],
+    }
+    if saldos is not None:
+        resumo["saldos"] = saldos
+    return resumo
+
+
+# Função para imprimir o resumo da sessão com várias mesas
+def imprimir_resumo(resumo):
+    for campo in ("saldo_final", "ganho_liquido", "motivo", "rodadas", "saldo_minimo", "maior_queda",
+                  "maior_aposta", "mesas_simultaneas"):
+        print(f"{campo:<20} {resumo[campo]}")
+    print(f"{'duracao':<20} {resumo['duracao'] / 3600:.2f} h")
+    motivos = {}
+    for mesa in resumo["mesas"]:
+        motivos[mesa["motivo"]] = motivos.get(mesa["motivo"], 0) + 1
+    print(f"{'mesas por motivo':<20} {motivos}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula várias mesas ao mesmo tempo com uma única banca.")
+    parser.add_argument("arquivos", nargs="*", help="Arquivos, diretórios ou padrões glob de historico_jogo_*.json")
+    parser.add_argument("--sinteticas", type=int, default=0, help="Quantidade de mesas sintéticas")
+    parser.add_argument("--rodadas", type=int, default=1000, help="Rodadas de cada mesa sintética")
+    parser.add_argument("--semente", type=int)
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_RODADA, help="Segundos entre rodadas de uma mesa")
+    parser.add_argument("--estrategia", default="martingale", choices=list(ESTRATEGIAS_REGISTRADAS))
+    parser.add_argument("--saldo-inicial", type=float, default=100)
+    parser.add_argument("--aposta-base", type=float, default=1)
+    parser.add_argument("--janela", type=int, default=30)
+    parser.add_argument("--max-perdas", type=int, default=3)
+    parser.add_argument("--stop-gain", type=float, default=20)
+    parser.add_argument("--stop-loss", type=float, default=-5)
+    parser.add_argument("--json", help="Arquivo JSON com o resumo e as mesas")
+    argumentos = parser.parse_args()
+
+    mesas = mesas_de_arquivos(argumentos.arquivos, argumentos.intervalo) if argumentos.arquivos else []
+    mesas += mesas_sinteticas(argumentos.sinteticas, argumentos.rodadas, argumentos.intervalo, argumentos.semente)
+    resumo = simular_mesas(mesas, argumentos.saldo_inicial, argumentos.aposta_base, argumentos.estrategia,
+                           argumentos.max_perdas, argumentos.stop_gain, argumentos.stop_loss,
+                           tamanho_janela=argumentos.janela)
+    if argumentos.json:
+        with open(argumentos.json, "w") as f:
+            json.dump(resumo, f, indent=2)
+    imprimir_resumo(resumo)
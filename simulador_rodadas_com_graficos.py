@@ -1,17 +1,23 @@
 import json
-from collections import Counter
-import matplotlib.pyplot as plt
-from tkinter import Tk
-from tkinter.filedialog import askopenfilename
+import time
+from itertools import islice
+from janela_estatisticas import JanelaEstatisticas
+from estrategias import criar_estrategia
+from cache_lru import CacheLRU
+from historico_colunar import CAPACIDADE_INICIAL, HistoricoApostas
+from tabela_roleta import COLUNA_DO_NUMERO, FORA, NOMES_COLUNAS, alguma_aposta_vence, numeros_da_aposta, retorno_apostas
 
 
-# Configuração das colunas da roleta
-COLUNA_1 = {1, 4, 7, 10, 13, 16, 19, 22, 25, 28, 31, 34}
-COLUNA_2 = {2, 5, 8, 11, 14, 17, 20, 23, 26, 29, 32, 35}
-COLUNA_3 = {3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36}
+# Configuração das colunas da roleta (as consultas por número usam COLUNA_DO_NUMERO, de tabela_roleta)
+COLUNA_1 = set(numeros_da_aposta("coluna_1"))
+COLUNA_2 = set(numeros_da_aposta("coluna_2"))
+COLUNA_3 = set(numeros_da_aposta("coluna_3"))
 
 # Função para carregar estatísticas do JSON usando um seletor gráfico
 def carregar_estatisticas():
+    # tkinter só é importado quando o seletor gráfico é usado (o modo em lote roda sem interface)
+    from tkinter import Tk
+    from tkinter.filedialog import askopenfilename
     print("Selecione o arquivo 'estatisticas.json'...")
     Tk().withdraw()  # Oculta a janela principal do tkinter
     arquivo = askopenfilename(title="Selecione o arquivo estatisticas.json", filetypes=[("JSON Files", "*.json")])
@@ -48,7 +54,7 @@ def escolher_colunas_dinamicamente(frequencia_colunas, atrasos, repeticoes_recen
     """
     # Inicializar pontuação para cada coluna
     pontuacao = {}
-    for coluna in ["coluna_1", "coluna_2", "coluna_3"]:
+    for coluna in NOMES_COLUNAS:
         # Frequência: quanto maior, maior a pontuação
         freq = frequencia_colunas.get(coluna, 0)
         
@@ -88,27 +94,14 @@ def calcular_repeticoes_recentes(resultados):
     Calcula o número de repetições consecutivas recentes para cada coluna.
 
     Parâmetros:
-    - resultados: Lista de tuplas no formato [[numero, cor], ...].
+    - resultados: Lista (ou iterador) de tuplas no formato [[numero, cor], ...].
 
     Retorna:
     - Um dicionário com o número de repetições recentes para cada coluna.
     """
-    # Mapeamento dos números para as colunas
-    colunas = {
-        1: "coluna_1", 4: "coluna_1", 7: "coluna_1", 10: "coluna_1", 13: "coluna_1", 16: "coluna_1",
-        19: "coluna_1", 22: "coluna_1", 25: "coluna_1", 28: "coluna_1", 31: "coluna_1", 34: "coluna_1",
-        2: "coluna_2", 5: "coluna_2", 8: "coluna_2", 11: "coluna_2", 14: "coluna_2", 17: "coluna_2",
-        20: "coluna_2", 23: "coluna_2", 26: "coluna_2", 29: "coluna_2", 32: "coluna_2", 35: "coluna_2",
-        3: "coluna_3", 6: "coluna_3", 9: "coluna_3", 12: "coluna_3", 15: "coluna_3", 18: "coluna_3",
-        21: "coluna_3", 24: "coluna_3", 27: "coluna_3", 30: "coluna_3", 33: "coluna_3", 36: "coluna_3"
-    }
 
-    # Converter números para colunas
-    resultados_colunas = []
-    for numero, _ in resultados:
-        if numero == 0:  # Ignorar o número 0 (verde)
-            continue
-        resultados_colunas.append(colunas[numero])
+    # Converter números para colunas, ignorando o número 0 (verde), sem montar uma lista
+    resultados_colunas = (NOMES_COLUNAS[COLUNA_DO_NUMERO[numero]] for numero, _ in resultados if numero != 0)
 
     # Calcular repetições consecutivas
     repeticoes_recentes = {"coluna_1": 0, "coluna_2": 0, "coluna_3": 0}
@@ -132,6 +125,8 @@ def calcular_repeticoes_recentes(resultados):
 
 # Função para carregar resultados das rodadas usando um seletor gráfico
 def carregar_resultados():
+    from tkinter import Tk
+    from tkinter.filedialog import askopenfilename
     Tk().withdraw()  # Oculta a janela principal do tkinter
     arquivo = askopenfilename(title="Selecione o arquivo resultados.json", filetypes=[("JSON Files", "*.json")])
     if not arquivo:
@@ -148,61 +143,52 @@ def carregar_resultados():
 
 # Função para contar frequência das colunas
 def contar_frequencias(resultados):
-    contagem = Counter()
+    contagem = [0, 0, 0]
     for numero, _ in resultados:
-        if numero in COLUNA_1:
-            contagem["coluna_1"] += 1
-        elif numero in COLUNA_2:
-            contagem["coluna_2"] += 1
-        elif numero in COLUNA_3:
-            contagem["coluna_3"] += 1
-    return dict(contagem)
+        coluna = COLUNA_DO_NUMERO[numero]
+        if coluna != FORA:
+            contagem[coluna] += 1
+    return {NOMES_COLUNAS[coluna]: total for coluna, total in enumerate(contagem) if total}
 
 # Função para calcular atrasos das colunas
 def calcular_atrasos(resultados):
-    atrasos = {"coluna_1": 0, "coluna_2": 0, "coluna_3": 0}
-    ultima_coluna = {"coluna_1": -len(resultados), "coluna_2": -len(resultados), "coluna_3": -len(resultados)}
+    atrasos = {}
+    # Percorre uma única vez (aceita iteradores); coluna ausente fica com atraso 2 * total
+    ultima_coluna = [None, None, None]
     
+    total_rodadas = 0
     for i, (numero, _) in enumerate(resultados):
-        if numero in COLUNA_1:
-            ultima_coluna["coluna_1"] = i
-        elif numero in COLUNA_2:
-            ultima_coluna["coluna_2"] = i
-        elif numero in COLUNA_3:
-            ultima_coluna["coluna_3"] = i
+        total_rodadas += 1
+        coluna = COLUNA_DO_NUMERO[numero]
+        if coluna != FORA:
+            ultima_coluna[coluna] = i
     
-    total_rodadas = len(resultados)
-    for coluna, ultima_aparicao in ultima_coluna.items():
-        atrasos[coluna] = total_rodadas - ultima_aparicao
+    for coluna, ultima_aparicao in enumerate(ultima_coluna):
+        if ultima_aparicao is None:
+            ultima_aparicao = -total_rodadas
+        atrasos[NOMES_COLUNAS[coluna]] = total_rodadas - ultima_aparicao
     return atrasos
 
 # Função para calcular frequência recente
 def calcular_frequencia_recente(resultados):
-    contagem = Counter()
+    contagem = [0, 0, 0]
     for numero, _ in resultados:
-        if numero in COLUNA_1:
-            contagem["coluna_1"] += 1
-        elif numero in COLUNA_2:
-            contagem["coluna_2"] += 1
-        elif numero in COLUNA_3:
-            contagem["coluna_3"] += 1
-    return dict(contagem)
+        coluna = COLUNA_DO_NUMERO[numero]
+        if coluna != FORA:
+            contagem[coluna] += 1
+    return {NOMES_COLUNAS[coluna]: total for coluna, total in enumerate(contagem) if total}
 
 # Função para obter a coluna de um número
 def obtem_coluna(numero):
-    if numero in COLUNA_1:
-        return "coluna_1"
-    elif numero in COLUNA_2:
-        return "coluna_2"
-    elif numero in COLUNA_3:
-        return "coluna_3"
-    return None
-def gerar_pesos(frequencia,atrasos,repeticoes_recentes,repeticoes_antigas):
+    coluna = COLUNA_DO_NUMERO[numero]
+    return NOMES_COLUNAS[coluna] if coluna != FORA else None
+def gerar_pesos(frequencia,atrasos,repeticoes_recentes,repeticoes_antigas,tamanho_janela):
     """
     Gera pesos dinâmicos com base nos dados fornecidos pelas funções auxiliares.
     
     Parâmetros:
-    - resultados_analisados: Lista de listas com os resultados analisados.
+    - frequencia, atrasos, repeticoes_recentes, repeticoes_antigas: Estatísticas da janela analisada.
+    - tamanho_janela: Quantidade de resultados na janela analisada.
     
     Retorna:
     - Um dicionário com os pesos ajustados para cada critério:
@@ -219,15 +205,15 @@ def gerar_pesos(frequencia,atrasos,repeticoes_recentes,repeticoes_antigas):
 
     # Calcular o peso do atraso
     total_atrasos = sum(atrasos.values())
-    peso_atraso = total_atrasos / len(resultados_analisados) if len(resultados_analisados) > 0 else 0.3
+    peso_atraso = total_atrasos / tamanho_janela if tamanho_janela > 0 else 0.3
 
     # Calcular o peso das repetições recentes
     total_repeticoes_recentes = sum(repeticoes_recentes.values())
-    peso_repeticao = -total_repeticoes_recentes / len(resultados_analisados) if len(resultados_analisados) > 0 else -0.2
+    peso_repeticao = -total_repeticoes_recentes / tamanho_janela if tamanho_janela > 0 else -0.2
 
     # Calcular o peso das repetições antigas
     total_repeticoes_antigas = sum(repeticoes_antigas.values())
-    peso_repeticao_antiga = total_repeticoes_antigas / len(resultados_analisados) if len(resultados_analisados) > 0 else 0.3
+    peso_repeticao_antiga = total_repeticoes_antigas / tamanho_janela if tamanho_janela > 0 else 0.3
 
     # Normalizar os pesos para garantir que somem 1
     soma_pesos = peso_frequencia + peso_atraso + abs(peso_repeticao) + peso_repeticao_antiga
@@ -242,6 +228,60 @@ def gerar_pesos(frequencia,atrasos,repeticoes_recentes,repeticoes_antigas):
         "peso_repeticao": peso_repeticao,
         "peso_repeticao_antiga": peso_repeticao_antiga,
     }
+# Caches das pontuações e dos pesos: as estatísticas da janela são poucos inteiros e se repetem muito
+# entre rodadas, estratégias e configurações da varredura
+CACHE_COLUNAS = CacheLRU(capacidade=16384)
+CACHE_PESOS = CacheLRU(capacidade=4096)
+
+
+def escolher_colunas_em_cache(frequencia_colunas, atrasos, repeticoes_recentes, repeticoes_antigas, pesos,
+                              cache=CACHE_COLUNAS):
+    """
+    Igual a escolher_colunas_dinamicamente, guardando o resultado num CacheLRU.
+
+    A chave são as estatísticas recebidas (itens dos dicionários) e os pesos; a lista de colunas e o dicionário de pontuações devolvidos são compartilhados
+    entre as chamadas e não devem ser modificados.
+
+    Parâmetros:
+    - pesos: Tupla (peso_frequencia, peso_atraso, peso_repeticao, peso_repeticao_antiga).
+    - cache: CacheLRU usado (padrão: CACHE_COLUNAS).
+    """
+    chave = (tuple(frequencia_colunas.items()), tuple(atrasos.items()), tuple(repeticoes_recentes.items()),
+             tuple(repeticoes_antigas.items()), pesos)
+    escolha = cache.obter(chave)
+    if escolha is None:
+        escolha = escolher_colunas_dinamicamente(
+            frequencia_colunas=frequencia_colunas,
+            atrasos=atrasos,
+            repeticoes_recentes=repeticoes_recentes,
+            repeticoes_antigas=repeticoes_antigas,
+            peso_frequencia=pesos[0],
+            peso_atraso=pesos[1],
+            peso_repeticao=pesos[2],
+            peso_repeticao_antiga=pesos[3],
+        )
+        cache.guardar(chave, escolha)
+    return escolha
+
+
+def gerar_pesos_em_cache(frequencia, atrasos, repeticoes_recentes, repeticoes_antigas, tamanho_janela,
+                         cache=CACHE_PESOS):
+    """
+    Igual a gerar_pesos, mas devolve a tupla (peso_frequencia, peso_atraso, peso_repeticao,
+    peso_repeticao_antiga) e guarda o resultado num CacheLRU. gerar_pesos só usa as somas
+    das estatísticas, que formam a chave junto com o tamanho da janela.
+    """
+    chave = (sum(frequencia.values()), sum(atrasos.values()), sum(repeticoes_recentes.values()),
+             sum(repeticoes_antigas.values()), tamanho_janela)
+    pesos = cache.obter(chave)
+    if pesos is None:
+        pesos = gerar_pesos(frequencia, atrasos, repeticoes_recentes, repeticoes_antigas, tamanho_janela)
+        pesos = (pesos["peso_frequencia"], pesos["peso_atraso"], pesos["peso_repeticao"],
+                 pesos["peso_repeticao_antiga"])
+        cache.guardar(chave, pesos)
+    return pesos
+
+
 # Função para calcular a coluna com o maior numero em um conjunto {"coluna_1":10, "coluna_2":5,"coluna_3":1}
 def calcular_max_col(atrasos):
     max_coluna = max(atrasos, key=atrasos.get)
@@ -250,147 +290,145 @@ def calcular_min_col(atrasos):
     min_coluna = min(atrasos, key=atrasos.get)
     return atrasos[min_coluna]
 # Função para simular apostas
-def simular_apostas(resultados,resultados_analisados, saldo_inicial=100, aposta_base=10, estrategia="martingale"):
+def simular_apostas(resultados,resultados_analisados, saldo_inicial=100, aposta_base=10, estrategia="martingale",
+                    max_perdas_consecutivas=3, stop_gain=20, stop_loss=-5, pesos_padrao=(0.7, 0.3, 0.0, 0.2),
+                    tamanho_janela=30, historico_colunar=False, instrumentacao=None):
+    # 'resultados' pode ser uma lista ou um iterador (ex.: carregar_resultados_em_fluxo).
+    # Com resultados_analisados=None, a janela inicial são os primeiros 'tamanho_janela' resultados.
+    # Com historico_colunar=True o histórico é um HistoricoApostas (arrays tipados) em vez de uma lista.
+    # Com uma Instrumentacao (veja instrumentacao.py) registra o tempo de cada fase e os contadores da simulação.
+    medir = instrumentacao is not None
+    if medir:
+        relogio = time.perf_counter
+        inicio_simulacao = relogio()
+        tempo_estatisticas = tempo_pontuacao = tempo_janela = 0.0
+        rodadas = pesos_dinamicos = 0
+        caches_antes = (CACHE_COLUNAS.acertos, CACHE_COLUNAS.falhas, CACHE_PESOS.acertos, CACHE_PESOS.falhas)
+    if historico_colunar:
+        historico = HistoricoApostas(len(resultados) if hasattr(resultados, "__len__") else CAPACIDADE_INICIAL)
+    else:
+        historico = []
+    resultados = iter(resultados)
+    if resultados_analisados is None:
+        resultados_analisados = list(islice(resultados, tamanho_janela))
   
     saldo = saldo_inicial
-    historico = []
-    aposta_atual = aposta_base
-    fibonacci_sequence = [1, 1]  # Sequência de Fibonacci inicial
-    fib_index = 0  # Índice para acompanhar a sequência de Fibonacci
-    
-    # Estratégia Labouchere
-    labouchere_sequencia = [1, 2, 3]  # Sequência inicial
-    labouchere_vitoria = False
-
-    # Estratégia Paroli
-    paroli_contador = 0
-    paroli_multiplicador = 2
-
-    # Gestão de Risco
-    max_perdas_consecutivas = 3  # Limite máximo de perdas consecutivas
-    stop_gain = 20  # Alvo de lucro
-    stop_loss = -5  # Limite de perda total
+    pesos_padrao = tuple(pesos_padrao)  # faz parte da chave do cache de pontuações
+    # Estado da estratégia de apostas (veja estrategias.py); os ganchos são resolvidos uma única vez
+    progressao = criar_estrategia(estrategia, aposta_base)
+    proxima_aposta, ao_vencer, ao_perder = progressao.proxima_aposta, progressao.ao_vencer, progressao.ao_perder
+
+    # Gestão de Risco: max_perdas_consecutivas (limite de perdas seguidas),
+    # stop_gain (alvo de lucro) e stop_loss (limite de perda total) vêm dos parâmetros
     perdas_consecutivas = 0
     colunas =[]
     inicia = True
-    for i, (numero, _) in enumerate(resultados):
+    motivo = None
+    # Estatísticas da janela mantidas de forma incremental a cada rodada
+    janela = JanelaEstatisticas(resultados_analisados)
+    for resultado in resultados:
+        numero, _ = resultado
+        if medir:
+            rodadas += 1
+            inicio_fase = relogio()
               
-        frequencia_colunas = contar_frequencias(resultados_analisados)
-        atrasos = calcular_atrasos(resultados_analisados)
+        frequencia_colunas = janela.frequencias()
+        atrasos = janela.atrasos()
         # Calcular repetições recentes
-        repeticoes_recentes = calcular_repeticoes_recentes(resultados_analisados) 
-        repeticoes_antigas = calcular_repeticoes_antigas(resultados_analisados)
+        repeticoes_recentes = janela.repeticoes_recentes()
+        repeticoes_antigas = janela.repeticoes_antigas()
+        if medir:
+            fim_fase = relogio()
+            tempo_estatisticas += fim_fase - inicio_fase
+            inicio_fase = fim_fase
    
        
-        if 0 in resultados[i] or perdas_consecutivas >1:
-            frequencia_colunas = contar_frequencias(resultados_analisados)
-            atrasos = calcular_atrasos(resultados_analisados)
-            # Calcular repetições recentes
-            repeticoes_recentes = calcular_repeticoes_recentes(resultados_analisados) 
-            repeticoes_antigas = calcular_repeticoes_antigas(resultados_analisados)
-            pesos = gerar_pesos(frequencia_colunas, atrasos,repeticoes_recentes,repeticoes_antigas)
-            colunas, _ = escolher_colunas_dinamicamente(
-            frequencia_colunas=frequencia_colunas,
-            atrasos=atrasos,
-            repeticoes_recentes=repeticoes_recentes,
-            repeticoes_antigas=repeticoes_antigas,
-            peso_frequencia=pesos['peso_frequencia'],
-            peso_atraso=pesos['peso_atraso'],
-            peso_repeticao=pesos['peso_repeticao'],
-            peso_repeticao_antiga=pesos['peso_repeticao_antiga']
-            )
-           
-        else:   
-           
-            colunas,  pontuacoes = escolher_colunas_dinamicamente(
-            frequencia_colunas=frequencia_colunas,
-            atrasos=atrasos,
-            repeticoes_recentes=repeticoes_recentes,
-            repeticoes_antigas=repeticoes_antigas,
-            peso_frequencia=0.7,
-            peso_atraso=0.3,
-            peso_repeticao=0.0,
-            peso_repeticao_antiga=0.2   
-            )
+        # Pontuações e pesos vêm dos caches (mesmo resultado das funções originais)
+        if 0 in resultado or perdas_consecutivas >1:
+            pesos = gerar_pesos_em_cache(frequencia_colunas, atrasos,repeticoes_recentes,repeticoes_antigas, len(janela))
+            if medir:
+                pesos_dinamicos += 1
+        else:
+            pesos = pesos_padrao
+        colunas, _ = escolher_colunas_em_cache(frequencia_colunas, atrasos, repeticoes_recentes, repeticoes_antigas,
+                                               pesos)
+        if medir:
+            tempo_pontuacao += relogio() - inicio_fase
         
         # Define o valor da aposta com base na estratégia
-        if estrategia == "labouchere":
-            if not labouchere_sequencia:
-                labouchere_sequencia = [1, 2, 3]  # Reinicia a sequência se estiver vazia
-            aposta_atual = labouchere_sequencia[0] + labouchere_sequencia[-1]
-            aposta_atual = min(aposta_atual, saldo)  # Garante que a aposta não exceda o saldo
-        elif estrategia == "paroli":
-            aposta_atual = aposta_base * (paroli_multiplicador ** paroli_contador)
-            aposta_atual = min(aposta_atual, saldo)  # Garante que a aposta não exceda o saldo
+        aposta_atual = proxima_aposta(saldo)
     
         # Registra a aposta retirando do saldo
         saldo -= aposta_atual
         if saldo <= 0:
             saldo += aposta_atual
             print("Saldo insuficiente para gera uma nova aposta! Apostas encerradas.")
+            motivo = "saldo_insuficiente"
             break
-        # Verifica se o número está em uma das colunas escolhidas
-        vitoria = any(numero in globals()[coluna.upper()] for coluna in colunas)
-        # print("ganhou ?",vitoria)
-        if vitoria:
-            saldo += (aposta_atual / 2) * 3  # Ganha o dobro da aposta
+        # Verifica se o número está em uma das colunas escolhidas (a aposta é dividida entre elas)
+        if alguma_aposta_vence(colunas, numero):
+            saldo += retorno_apostas(colunas, numero, aposta_atual)  # Cada coluna paga 2 para 1: (aposta / 2) * 3
             
             # Atualiza a estratégia de aposta
-            if estrategia == "martingale":
-                aposta_atual = aposta_base  # Volta à aposta inicial
-            elif estrategia == "fibonacci":
-                fib_index = max(0, fib_index - 2)  # Retrocede dois passos na sequência
-                aposta_atual = fibonacci_sequence[fib_index]
-            elif estrategia == "dalembert":
-                aposta_atual = max(aposta_base, aposta_atual - aposta_base)  # Diminui uma unidade
-            elif estrategia == "labouchere":
-                if len(labouchere_sequencia) > 1:
-                    labouchere_sequencia.pop(0)  # Remove o primeiro elemento
-                    labouchere_sequencia.pop(-1)  # Remove o último elemento
-                else:
-                    labouchere_sequencia = []  # Zera a sequência
-            elif estrategia == "paroli":
-                paroli_contador += 1  # Incrementa o contador de vitórias consecutivas
+            ao_vencer()
             
             perdas_consecutivas = 0  # Reseta o contador de perdas consecutivas
-            historico.append((numero, "Vitória", aposta_atual, saldo))
+            historico.append((numero, "Vitória", progressao.aposta_atual, saldo))
             
             # Stop Gain
             if saldo - saldo_inicial >= stop_gain:
                 print(f"Alvo de lucro atingido ({stop_gain}). Encerrando apostas.")
+                motivo = "stop_gain"
                 break
         else:
             # Atualiza a estratégia de aposta
-            if estrategia == "martingale":
-                aposta_atual *= 2  # Dobra a aposta
-            elif estrategia == "fibonacci":
-                fib_index += 1
-                if fib_index >= len(fibonacci_sequence):
-                    fibonacci_sequence.append(fibonacci_sequence[-1] + fibonacci_sequence[-2])
-                aposta_atual = fibonacci_sequence[fib_index]
-            elif estrategia == "dalembert":
-                aposta_atual += aposta_base  # Aumenta uma unidade
-            elif estrategia == "labouchere":
-                labouchere_sequencia.append(aposta_atual)  # Adiciona a aposta perdida ao final da sequência
-            elif estrategia == "paroli":
-                paroli_contador = 0  # Reseta o contador de vitórias consecutivas
+            ao_perder()
             
             perdas_consecutivas += 1  # Incrementa o contador de perdas consecutivas
-            historico.append((numero, "Derrota", aposta_atual, saldo))
+            historico.append((numero, "Derrota", progressao.aposta_atual, saldo))
             
             # Stop Loss
             if saldo - saldo_inicial <= stop_loss:
                 print(f"Limite de perda total atingido ({stop_loss}). Encerrando apostas.")
+                motivo = "stop_loss"
                 break
             
             # Limite de Perdas Consecutivas
             if perdas_consecutivas >= max_perdas_consecutivas:
                 print(f"Limite de {max_perdas_consecutivas} perdas consecutivas atingido. Encerrando apostas.")
+                motivo = "max_perdas_consecutivas"
                 break
         
-        resultados_analisados.pop(0)
-        resultados_analisados.append(resultados[i])
+        if medir:
+            inicio_fase = relogio()
+        janela.adicionar(resultado)
+        if medir:
+            tempo_janela += relogio() - inicio_fase
+    # Mantém a janela recebida atualizada, como antes
+    if isinstance(resultados_analisados, list):
+        resultados_analisados[:] = janela.resultados()
     ganho_liquido = saldo - saldo_inicial
+    if medir:
+        # A liquidação da aposta (estratégia, saldo e histórico) é o restante do tempo do laço
+        fim_simulacao = relogio()
+        total = fim_simulacao - inicio_simulacao
+        instrumentacao.adicionar_tempo("simular_apostas", total)
+        instrumentacao.adicionar_tempo("simular_apostas;estatisticas", tempo_estatisticas, rodadas)
+        instrumentacao.adicionar_tempo("simular_apostas;pontuacao", tempo_pontuacao, rodadas)
+        instrumentacao.adicionar_tempo("simular_apostas;janela", tempo_janela, rodadas)
+        instrumentacao.adicionar_tempo("simular_apostas;aposta",
+                                       max(total - tempo_estatisticas - tempo_pontuacao - tempo_janela, 0.0), rodadas)
+        caches_depois = (CACHE_COLUNAS.acertos, CACHE_COLUNAS.falhas, CACHE_PESOS.acertos, CACHE_PESOS.falhas)
+        for nome, antes, depois in zip(("cache_colunas.acertos", "cache_colunas.falhas", "cache_pesos.acertos",
+                                        "cache_pesos.falhas"), caches_antes, caches_depois):
+            instrumentacao.contar(nome, depois - antes)
+        instrumentacao.contar("simulacoes")
+        instrumentacao.contar("rodadas", rodadas)
+        instrumentacao.contar("apostas", len(historico))
+        instrumentacao.contar("recalculos_pesos", pesos_dinamicos)
+        instrumentacao.contar("encerramento." + (motivo or "fim_dos_resultados"))
+        instrumentacao.registrar_evento("simular_apostas", inicio_simulacao, fim_simulacao,
+                                        {"estrategia": estrategia, "rodadas": rodadas, "motivo": motivo})
     return saldo, historico, ganho_liquido
 
 
@@ -399,32 +437,18 @@ def calcular_repeticoes_antigas(resultados, limite_tempo=5):
     Calcula o número de repetições antigas para cada coluna.
 
     Parâmetros:
-    - resultados: Lista de tuplas no formato [[numero, cor], ...].
+    - resultados: Lista (ou iterador) de tuplas no formato [[numero, cor], ...].
     - limite_tempo: Número de sorteios atrás para considerar uma repetição como "antiga".
 
     Retorna:
     - Um dicionário com o número de repetições antigas para cada coluna.
     """
-    # Mapeamento dos números para as colunas
-    colunas = {
-        1: "coluna_1", 4: "coluna_1", 7: "coluna_1", 10: "coluna_1", 13: "coluna_1", 16: "coluna_1",
-        19: "coluna_1", 22: "coluna_1", 25: "coluna_1", 28: "coluna_1", 31: "coluna_1", 34: "coluna_1",
-        2: "coluna_2", 5: "coluna_2", 8: "coluna_2", 11: "coluna_2", 14: "coluna_2", 17: "coluna_2",
-        20: "coluna_2", 23: "coluna_2", 26: "coluna_2", 29: "coluna_2", 32: "coluna_2", 35: "coluna_2",
-        3: "coluna_3", 6: "coluna_3", 9: "coluna_3", 12: "coluna_3", 15: "coluna_3", 18: "coluna_3",
-        21: "coluna_3", 24: "coluna_3", 27: "coluna_3", 30: "coluna_3", 33: "coluna_3", 36: "coluna_3"
-    }
 
-    # Converter números para colunas
-    resultados_colunas = []
-    for numero, _ in resultados:
-        if numero == 0:  # Ignorar o número 0 (verde)
-            continue
-        resultados_colunas.append(colunas[numero])
+    # Converter números para colunas, ignorando o número 0 (verde), sem montar uma lista
+    resultados_colunas = (NOMES_COLUNAS[COLUNA_DO_NUMERO[numero]] for numero, _ in resultados if numero != 0)
 
-    # Dividir os resultados em dois grupos: recentes e antigos
-    resultados_antigos = resultados_colunas[limite_tempo:]  # Resultados além do limite de tempo
-    resultados_recentes = resultados_colunas[:limite_tempo]  # Resultados dentro do limite de tempo
+    # Descartar os recentes (dentro do limite de tempo) e ficar com os antigos
+    resultados_antigos = islice(resultados_colunas, limite_tempo, None)  # Resultados além do limite de tempo
 
     # Calcular repetições antigas
     repeticoes_antigas = {"coluna_1": 0, "coluna_2": 0, "coluna_3": 0}
@@ -447,8 +471,11 @@ def calcular_repeticoes_antigas(resultados, limite_tempo=5):
     return repeticoes_antigas
 # Função para plotar gráficos individuais
 def plotar_grafico(historico, estrategia, saldo_final, ganho_liquido):
+    # matplotlib só é importado quando um gráfico é pedido
+    import matplotlib.pyplot as plt
     rodadas = list(range(1, len(historico) + 1))
-    saldos = [saldo for _, _, _, saldo in historico]
+    # O HistoricoApostas já guarda os saldos em um array, que é usado sem cópia
+    saldos = historico.saldos if isinstance(historico, HistoricoApostas) else [saldo for _, _, _, saldo in historico]
     
     plt.figure(figsize=(10, 6))
     plt.plot(rodadas, saldos, marker='o', linestyle='-', color='b', label=f"Estratégia: {estrategia.capitalize()}")
@@ -468,10 +495,11 @@ def plotar_grafico(historico, estrategia, saldo_final, ganho_liquido):
 
 # Função para plotar gráfico comparativo
 def plotar_grafico_comparativo(historicos, estrategias,ganho_liquidos):
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(12, 8))
     for estrategia, historico,ganho in zip(estrategias, historicos,ganho_liquidos):
         rodadas = list(range(1, len(historico) + 1))
-        saldos = [saldo for _, _, _, saldo in historico]
+        saldos = historico.saldos if isinstance(historico, HistoricoApostas) else [saldo for _, _, _, saldo in historico]
         plt.plot(rodadas, saldos, marker='o', linestyle='-', label=f"{estrategia.capitalize()} - ganho {ganho}")
         plt.title("Comparação de Estratégias")
     plt.xlabel("Rodadas")
@@ -495,8 +523,9 @@ if __name__ == "__main__":
     
     for estrategia in estrategias:
         print(f"\n--- Simulação com estratégia: {estrategia.capitalize()} ---")
+        # Cada estratégia recebe sua própria cópia da janela (simular_apostas a atualiza no lugar)
         saldo_final, historico_apostas, ganho_liquido = simular_apostas(
-            resultados,resultados_analisados, saldo_inicial=10, aposta_base=1, estrategia=estrategia
+            resultados,list(resultados_analisados), saldo_inicial=10, aposta_base=1, estrategia=estrategia
         )
         print(f"Saldo final após as apostas: {saldo_final}")
         print(f"Ganho líquido: {ganho_liquido}")
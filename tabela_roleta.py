@@ -0,0 +1,95 @@
+# Layout da roleta europeia (0 a 36) em tabelas indexadas pelo número sorteado.
+#
+# Cada tabela é uma tupla com 37 posições, então a consulta é um único acesso por índice,
+# sem testes de pertinência em conjuntos nem dicionários montados a cada chamada. O zero
+# fica FORA de colunas, dúzias e apostas simples.
+
+FORA = -1
+NUMEROS = range(37)
+NUMEROS_VERMELHOS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+
+NOMES_COLUNAS = ("coluna_1", "coluna_2", "coluna_3")
+NOMES_DUZIAS = ("duzia_1", "duzia_2", "duzia_3")
+NOMES_CORES = ("vermelho", "preto")
+NOMES_PARIDADES = ("par", "impar")
+NOMES_METADES = ("baixo", "alto")
+
+# Índice da coluna (0, 1, 2), da dúzia (0: 1-12, 1: 13-24, 2: 25-36), da cor (0: vermelho, 1: preto),
+# da paridade (0: par, 1: ímpar) e da metade (0: 1-18, 1: 19-36) de cada número; FORA para o zero
+COLUNA_DO_NUMERO = tuple(FORA if numero == 0 else (numero - 1) % 3 for numero in NUMEROS)
+DUZIA_DO_NUMERO = tuple(FORA if numero == 0 else (numero - 1) // 12 for numero in NUMEROS)
+COR_DO_NUMERO = tuple(FORA if numero == 0 else 0 if numero in NUMEROS_VERMELHOS else 1 for numero in NUMEROS)
+PARIDADE_DO_NUMERO = tuple(FORA if numero == 0 else numero % 2 for numero in NUMEROS)
+METADE_DO_NUMERO = tuple(FORA if numero == 0 else (numero - 1) // 18 for numero in NUMEROS)
+
+# Cor gravada nos arquivos de histórico
+NOME_COR_DO_NUMERO = tuple("verde" if numero == 0 else NOMES_CORES[COR_DO_NUMERO[numero]] for numero in NUMEROS)
+# Resultado (numero, cor) de cada número, reaproveitado ao gerar resultados a partir dos números
+RESULTADO_DO_NUMERO = tuple((numero, NOME_COR_DO_NUMERO[numero]) for numero in NUMEROS)
+
+# Apostas disponíveis: nome -> (tabela, índice que ganha, pagamento por unidade apostada)
+TIPOS_APOSTA = {
+    nome: (tabela, indice, pagamento)
+    for nomes, tabela, pagamento in ((NOMES_COLUNAS, COLUNA_DO_NUMERO, 2), (NOMES_DUZIAS, DUZIA_DO_NUMERO, 2),
+                                     (NOMES_CORES, COR_DO_NUMERO, 1), (NOMES_PARIDADES, PARIDADE_DO_NUMERO, 1),
+                                     (NOMES_METADES, METADE_DO_NUMERO, 1))
+    for indice, nome in enumerate(nomes)
+}
+
+# Para cada aposta, uma tupla com o quanto volta por unidade apostada em cada número
+# (pagamento + a própria aposta quando ganha, 0 quando perde)
+RETORNO_DA_APOSTA = {
+    nome: tuple(pagamento + 1 if tabela[numero] == indice else 0 for numero in NUMEROS)
+    for nome, (tabela, indice, pagamento) in TIPOS_APOSTA.items()
+}
+
+
+def registrar_tipo_aposta(nome, numeros, pagamento):
+    """
+    Registra uma nova aposta a partir dos números que ela cobre (ex.: um canto ou uma linha).
+
+    Parâmetros:
+    - nome: Nome usado nas listas de apostas.
+    - numeros: Números que fazem a aposta ganhar.
+    - pagamento: Quanto a aposta paga por unidade apostada (ex.: 8 para um canto).
+    """
+    numeros = frozenset(numeros)
+    RETORNO_DA_APOSTA[nome] = tuple(pagamento + 1 if numero in numeros else 0 for numero in NUMEROS)
+
+
+def numeros_da_aposta(nome):
+    """Retorna os números cobertos pela aposta."""
+    return [numero for numero, retorno in enumerate(RETORNO_DA_APOSTA[nome]) if retorno]
+
+
+def alguma_aposta_vence(apostas, numero):
+    """
+    Retorna True se o número sorteado faz alguma das apostas ganhar.
+
+    A vitória é decidida pelo número e não pelo retorno: com uma aposta de valor zero o retorno
+    é 0 mesmo quando o número está numa das colunas escolhidas.
+    """
+    return any(RETORNO_DA_APOSTA[aposta][numero] for aposta in apostas)
+
+
+def retorno_apostas(apostas, numero, valor):
+    """
+    Calcula quanto volta ao saldo quando 'valor' é dividido igualmente entre as apostas.
+
+    Com duas colunas, cada uma recebe valor/2 e a que ganha devolve (valor / 2) * 3,
+    como em simular_apostas.
+
+    Parâmetros:
+    - apostas: Lista com os nomes das apostas (ex.: ["coluna_1", "coluna_3"], ["duzia_2", "vermelho"]).
+    - numero: Número sorteado.
+    - valor: Valor total apostado.
+
+    Retorna:
+    - O valor devolvido (0 se nenhuma aposta ganhou).
+    """
+    retorno = 0
+    for aposta in apostas:
+        unidades = RETORNO_DA_APOSTA[aposta][numero]
+        if unidades:
+            retorno += (valor / len(apostas)) * unidades
+    return retorno
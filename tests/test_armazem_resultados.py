@@ -0,0 +1,23 @@
+import json
+import random
+
+from armazem_resultados import ArmazemResultados
+from simulador_lote import simular_em_lote
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+
+def test_arquivos_com_o_mesmo_conteudo_sao_reportados_separadamente(tmp_path):
+    sorteio = random.Random(1)
+    conteudo = [list(RESULTADO_DO_NUMERO[sorteio.randrange(37)]) for _ in range(300)]
+    for nome in ("historico_jogo_18122024_191848.json", "historico_jogo_18122024_191854.json"):
+        (tmp_path / nome).write_text(json.dumps(conteudo))
+    banco = str(tmp_path / "resultados.sqlite")
+
+    linhas = list(simular_em_lote(str(tmp_path), ["martingale"], processos=1, armazem=banco))
+    repetidas = list(simular_em_lote(str(tmp_path), ["martingale"], processos=1, armazem=banco))
+
+    assert [linha["arquivo"] for linha in linhas] == [str(caminho) for caminho in sorted(tmp_path.glob("*.json"))]
+    assert repetidas == linhas
+    with ArmazemResultados(banco) as armazem:
+        assert len(armazem.consultar()) == 2
+        assert [resumo["arquivos"] for resumo in armazem.resumo_por_configuracao()] == [2]
@@ -0,0 +1,48 @@
+import random
+
+import numpy as np
+
+from backtest_vetorizado import ESTRATEGIAS, estatisticas_janelas, gerar_pesos_vetorizado, simular_apostas_vetorizado
+from historico_colunar import HistoricoApostas
+from simulador_rodadas_com_graficos import gerar_pesos, simular_apostas
+from tabela_roleta import NOME_COR_DO_NUMERO
+
+
+def _historico(quantidade, semente):
+    sorteio = random.Random(semente)
+    return [[numero, NOME_COR_DO_NUMERO[numero]] for numero in (sorteio.randrange(37) for _ in range(quantidade))]
+
+
+def test_pesos_sem_janela_usam_os_valores_fixos_de_gerar_pesos():
+    numeros = np.array([numero for numero, _ in _historico(50, 1)])
+    pesos = gerar_pesos_vetorizado(*estatisticas_janelas(numeros, 0), 0)
+    escalar = gerar_pesos({}, {"coluna_1": 0, "coluna_2": 0, "coluna_3": 0}, {}, {}, 0)
+    assert not any(np.isnan(peso).any() for peso in pesos)
+    for peso, nome in zip(pesos, ("peso_frequencia", "peso_atraso", "peso_repeticao", "peso_repeticao_antiga")):
+        assert peso.tolist() == [escalar[nome]] * len(numeros)
+
+
+def test_janela_vazia_igual_a_simular_apostas():
+    for semente in range(20):
+        resultados = _historico(300, semente)
+        vetorizado = simular_apostas_vetorizado(resultados, [], saldo_inicial=1000, aposta_base=1)
+        for estrategia in ESTRATEGIAS:
+            saldo_final, historico, _ = simular_apostas(resultados, [], saldo_inicial=1000, aposta_base=1,
+                                                        estrategia=estrategia)
+            assert vetorizado[estrategia][0] == saldo_final
+            assert vetorizado[estrategia][1] == historico
+
+
+def test_historico_colunar_igual_a_simular_apostas_em_muitos_episodios_de_perdas():
+    # Com limite de 10 perdas seguidas a sessão inteira é jogada, passando por muitos episódios
+    resultados = _historico(2000, 7)
+    vetorizado = simular_apostas_vetorizado(resultados[30:], resultados[:30], saldo_inicial=10 ** 6, aposta_base=1,
+                                            max_perdas_consecutivas=10, stop_gain=10 ** 9, stop_loss=-10 ** 9,
+                                            historico_colunar=True)
+    for estrategia in ESTRATEGIAS:
+        saldo_final, historico, _ = simular_apostas(resultados[30:], resultados[:30], saldo_inicial=10 ** 6,
+                                                    aposta_base=1, estrategia=estrategia, max_perdas_consecutivas=10,
+                                                    stop_gain=10 ** 9, stop_loss=-10 ** 9)
+        assert isinstance(vetorizado[estrategia][1], HistoricoApostas)
+        assert vetorizado[estrategia][0] == saldo_final
+        assert list(vetorizado[estrategia][1]) == historico
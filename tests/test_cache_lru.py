@@ -0,0 +1,70 @@
+import random
+
+import simulador_rodadas_com_graficos as simulador
+from cache_lru import CacheLRU
+from janela_estatisticas import JanelaEstatisticas
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+
+def test_descarta_o_usado_ha_mais_tempo_e_conta_estatisticas():
+    cache = CacheLRU(capacidade=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obter("a") == 1  # "b" passa a ser o usado há mais tempo
+    cache.guardar("c", 3)
+    assert cache.obter("b") is None
+    assert (cache.obter("a"), cache.obter("c")) == (1, 3)
+    cache.guardar("d", 4)  # descarta "a"
+    assert cache.obter("a") is None
+    assert len(cache) == 2
+    assert cache.estatisticas() == {"itens": 2, "capacidade": 2, "acertos": 3, "falhas": 2, "descartes": 2,
+                                    "taxa_acerto": 3 / 5}
+    cache.limpar()
+    assert len(cache) == 0
+    assert cache.estatisticas() == {"itens": 0, "capacidade": 2, "acertos": 0, "falhas": 0, "descartes": 0,
+                                    "taxa_acerto": 0.0}
+
+
+def _estatisticas_das_janelas(semente, rodadas):
+    sorteio = random.Random(semente)
+    janela = JanelaEstatisticas(tamanho=30)
+    for _ in range(rodadas):
+        janela.adicionar(RESULTADO_DO_NUMERO[sorteio.randrange(37)])
+        yield janela.frequencias(), janela.atrasos(), janela.repeticoes_recentes(), janela.repeticoes_antigas()
+
+
+def test_funcoes_em_cache_iguais_as_originais_mesmo_com_descartes():
+    cache_colunas, cache_pesos = CacheLRU(capacidade=8), CacheLRU(capacidade=8)
+    for frequencia, atrasos, recentes, antigas in _estatisticas_das_janelas(1, 400):
+        pesos = simulador.gerar_pesos(frequencia, atrasos, recentes, antigas, 30)
+        tupla_pesos = (pesos["peso_frequencia"], pesos["peso_atraso"], pesos["peso_repeticao"],
+                       pesos["peso_repeticao_antiga"])
+        esperado = simulador.escolher_colunas_dinamicamente(
+            frequencia_colunas=frequencia, atrasos=atrasos, repeticoes_recentes=recentes,
+            repeticoes_antigas=antigas, peso_frequencia=tupla_pesos[0], peso_atraso=tupla_pesos[1],
+            peso_repeticao=tupla_pesos[2], peso_repeticao_antiga=tupla_pesos[3])
+        # A segunda consulta da mesma janela é um acerto; a capacidade pequena força descartes
+        for _ in range(2):
+            assert simulador.gerar_pesos_em_cache(frequencia, atrasos, recentes, antigas, 30,
+                                                  cache=cache_pesos) == tupla_pesos
+            assert simulador.escolher_colunas_em_cache(frequencia, atrasos, recentes, antigas, tupla_pesos,
+                                                       cache=cache_colunas) == esperado
+    for cache in (cache_colunas, cache_pesos):
+        estatisticas = cache.estatisticas()
+        assert estatisticas["acertos"] > 0 and estatisticas["descartes"] > 0
+        assert estatisticas["acertos"] + estatisticas["falhas"] == 800
+        assert estatisticas["itens"] == 8
+
+
+def test_simular_apostas_igual_com_caches_frios_e_quentes():
+    sorteio = random.Random(2)
+    resultados = [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(1500)]
+    parametros = dict(saldo_inicial=10 ** 6, aposta_base=1, estrategia="dalembert", max_perdas_consecutivas=10 ** 6,
+                      stop_gain=10 ** 9, stop_loss=-10 ** 9)
+    simulador.CACHE_COLUNAS.limpar()
+    simulador.CACHE_PESOS.limpar()
+    frio = simulador.simular_apostas(resultados[30:], resultados[:30], **parametros)
+    assert simulador.CACHE_COLUNAS.falhas > 0
+    quente = simulador.simular_apostas(resultados[30:], resultados[:30], **parametros)
+    assert quente == frio
+    assert simulador.CACHE_COLUNAS.acertos >= len(frio[1])
@@ -0,0 +1,38 @@
+import json
+import random
+
+import pytest
+
+from carregar_historicos import carregar_resultados_em_fluxo, ler_resultados
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+
+def _gravar(tmp_path, nome, texto):
+    caminho = tmp_path / nome
+    caminho.write_text(texto)
+    return str(caminho)
+
+
+def test_ler_resultados_igual_a_json_load_com_qualquer_tamanho_de_bloco(tmp_path):
+    sorteio = random.Random(3)
+    resultados = [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(500)]
+    textos = [json.dumps(resultados), json.dumps(resultados, indent=2), " [ ] \n", "[1, 2.5e3, -7, [1e2], {}]"]
+    for indice, texto in enumerate(textos):
+        caminho = _gravar(tmp_path, f"historico_{indice}.json", texto)
+        for tamanho_bloco in (1, 2, 7, 64, 1 << 16):
+            assert list(ler_resultados(caminho, tamanho_bloco)) == json.loads(texto)
+
+
+@pytest.mark.parametrize("texto", ["", "{\"a\": 1}", "[12", "[[1, \"Vermelho\"], [2, \"Pret", "[1,, 2]", "[,1]",
+                                   "[1 2]", "[1,]", "[1, 2] x", "\"[1]\"", "[6e]"])
+def test_arquivo_malformado_ou_sem_lista_levanta_value_error(tmp_path, texto):
+    caminho = _gravar(tmp_path, "historico.json", texto)
+    for tamanho_bloco in (1, 3, 1 << 16):
+        with pytest.raises(ValueError):
+            list(ler_resultados(caminho, tamanho_bloco))
+
+
+def test_carregar_em_fluxo_percorre_os_arquivos_em_ordem_cronologica(tmp_path):
+    _gravar(tmp_path, "historico_jogo_01012025_100000.json", json.dumps([[2, "Preto"]]))
+    _gravar(tmp_path, "historico_jogo_31122024_100000.json", json.dumps([[1, "Vermelho"], [0, "Verde"]]))
+    assert list(carregar_resultados_em_fluxo(str(tmp_path))) == [[1, "Vermelho"], [0, "Verde"], [2, "Preto"]]
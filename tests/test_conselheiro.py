@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+from conselheiro import ServidorConselheiro
+
+
+async def _requisicoes(servidor, pedidos):
+    # Envia os pedidos numa única conexão keep-alive e devolve (status, resposta) de cada um
+    rede = await asyncio.start_server(servidor.atender, "127.0.0.1", 0)
+    porta = rede.sockets[0].getsockname()[1]
+    leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    respostas = []
+    try:
+        for metodo, caminho, dados in pedidos:
+            escritor.write(f"{metodo} {caminho} HTTP/1.1\r\nContent-Length: {len(dados)}\r\n\r\n".encode() + dados)
+            await escritor.drain()
+            status = int((await leitor.readline()).split()[1])
+            cabecalhos = {}
+            while (linha := await leitor.readline()) != b"\r\n":
+                nome, _, valor = linha.decode().partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+            respostas.append((status, json.loads(await leitor.readexactly(int(cabecalhos["content-length"])))))
+    finally:
+        escritor.close()
+        rede.close()
+        await rede.wait_closed()
+    return respostas
+
+
+def test_corpo_que_nao_e_objeto_retorna_400_sem_derrubar_a_conexao():
+    pedidos = [
+        ("POST", "/mesas/1/resultado", b"[5]"),
+        ("POST", "/mesas/1/resultado", b"true"),
+        ("POST", "/mesas/1/resultado", b'"5"'),
+        ("POST", "/mesas/1", b"5"),
+        ("POST", "/mesas/1/resultado", b'{"numero": 5}'),
+    ]
+    respostas = asyncio.run(_requisicoes(ServidorConselheiro(), pedidos))
+    assert [status for status, _ in respostas] == [400, 400, 400, 400, 200]
+
+
+def test_numero_booleano_e_rejeitado():
+    servidor = ServidorConselheiro()
+    assert servidor.tratar("POST", "/mesas/1/resultado", {"numero": True})[0] == 400
+    assert servidor.tratar("POST", "/mesas/1/resultado", {"numero": False})[0] == 400
+    assert servidor.tratar("POST", "/mesas/1/resultado", {"numero": 0})[0] == 200
+
+
+def test_parametros_invalidos_da_mesa_retornam_400():
+    servidor = ServidorConselheiro()
+    for corpo in ({"tamanho_janela": "30"}, {"aposta_base": None}, {"tamanho_janela": 0},
+                  {"max_perdas_consecutivas": 2.5}, {"saldo_inicial": True}, {"estrategia": "martingal"},
+                  {"pesos_padrao": [0.7, 0.3]}, {"stop_gain": float("nan")}, {"janela": 30}):
+        assert servidor.tratar("POST", "/mesas/1", corpo)[0] == 400, corpo
+        assert "1" not in servidor.mesas
+    assert servidor.tratar("POST", "/mesas/1", {"tamanho_janela": 5, "pesos_padrao": [1, 0, 0, 0]})[0] == 201
+    for numero in range(6):
+        status, resposta = servidor.tratar("POST", "/mesas/1/resultado", {"numero": numero})
+        assert status == 200
+    assert resposta["aposta"] is not None
+
+
+def test_json_aninhado_demais_retorna_400_sem_derrubar_a_conexao():
+    pedidos = [
+        ("POST", "/mesas/1", b"[" * 100000 + b"]" * 100000),
+        ("POST", "/mesas/1/resultado", b'{"numero": 5}'),
+    ]
+    respostas = asyncio.run(_requisicoes(ServidorConselheiro(), pedidos))
+    assert [status for status, _ in respostas] == [400, 200]
@@ -0,0 +1,121 @@
+import random
+
+import numpy as np
+
+from estrategias import ESTRATEGIAS_REGISTRADAS, Estrategia, criar_estrategia, obter_estrategia
+
+CLASSICAS = ["martingale", "fibonacci", "dalembert", "paroli", "labouchere", "nenhuma_estrategia"]
+
+
+def _progressao_original(estrategia, vitorias, aposta_base, saldo_inicial):
+    """Apostas feitas e registradas pela cadeia if/elif do simular_apostas original, até faltar saldo."""
+    saldo = saldo_inicial
+    aposta_atual = aposta_base
+    fibonacci_sequence = [1, 1]
+    fib_index = 0
+    labouchere_sequencia = [1, 2, 3]
+    paroli_contador = 0
+    paroli_multiplicador = 2
+    apostas = []
+    for vitoria in vitorias:
+        if estrategia == "labouchere":
+            if not labouchere_sequencia:
+                labouchere_sequencia = [1, 2, 3]
+            aposta_atual = min(labouchere_sequencia[0] + labouchere_sequencia[-1], saldo)
+        elif estrategia == "paroli":
+            aposta_atual = min(aposta_base * (paroli_multiplicador ** paroli_contador), saldo)
+        feita = aposta_atual
+        saldo -= aposta_atual
+        if saldo <= 0:
+            break
+        if vitoria:
+            saldo += (aposta_atual / 2) * 3
+            if estrategia == "martingale":
+                aposta_atual = aposta_base
+            elif estrategia == "fibonacci":
+                fib_index = max(0, fib_index - 2)
+                aposta_atual = fibonacci_sequence[fib_index]
+            elif estrategia == "dalembert":
+                aposta_atual = max(aposta_base, aposta_atual - aposta_base)
+            elif estrategia == "labouchere":
+                if len(labouchere_sequencia) > 1:
+                    labouchere_sequencia.pop(0)
+                    labouchere_sequencia.pop(-1)
+                else:
+                    labouchere_sequencia = []
+            elif estrategia == "paroli":
+                paroli_contador += 1
+        else:
+            if estrategia == "martingale":
+                aposta_atual *= 2
+            elif estrategia == "fibonacci":
+                fib_index += 1
+                if fib_index >= len(fibonacci_sequence):
+                    fibonacci_sequence.append(fibonacci_sequence[-1] + fibonacci_sequence[-2])
+                aposta_atual = fibonacci_sequence[fib_index]
+            elif estrategia == "dalembert":
+                aposta_atual += aposta_base
+            elif estrategia == "labouchere":
+                labouchere_sequencia.append(aposta_atual)
+            elif estrategia == "paroli":
+                paroli_contador = 0
+        apostas.append((feita, aposta_atual))
+    return apostas
+
+
+def _progressao_ganchos(estrategia, vitorias, aposta_base, saldo_inicial):
+    """Mesmo laço, mas com os ganchos da classe registrada."""
+    estado = criar_estrategia(estrategia, aposta_base)
+    saldo = saldo_inicial
+    apostas = []
+    for vitoria in vitorias:
+        feita = estado.proxima_aposta(saldo)
+        saldo -= feita
+        if saldo <= 0:
+            break
+        if vitoria:
+            saldo += (feita / 2) * 3
+            estado.ao_vencer()
+        else:
+            estado.ao_perder()
+        apostas.append((feita, estado.aposta_atual))
+    return apostas
+
+
+def _sessoes(semente, quantidade, rodadas):
+    sorteio = random.Random(semente)
+    # Probabilidades diferentes para ter sequências longas de vitórias e de derrotas
+    return [[sorteio.random() < chance for _ in range(rodadas)]
+            for chance in (sorteio.choice([0.2, 0.5, 0.64, 0.9]) for _ in range(quantidade))]
+
+
+def test_ganchos_iguais_a_cadeia_if_elif_original():
+    for estrategia in CLASSICAS:
+        for aposta_base, saldo_inicial in ((1, 10), (1, 1000), (5, 60), (2.5, 200)):
+            for vitorias in _sessoes(1, 40, 120):
+                assert _progressao_ganchos(estrategia, vitorias, aposta_base, saldo_inicial) == _progressao_original(
+                    estrategia, vitorias, aposta_base, saldo_inicial), (estrategia, aposta_base, saldo_inicial)
+
+
+def test_apostas_lote_iguais_aos_ganchos_ate_faltar_saldo():
+    for estrategia in ESTRATEGIAS_REGISTRADAS:
+        classe = obter_estrategia(estrategia)
+        for aposta_base, saldo_inicial in ((1, 10), (1, 1000), (5, 60)):
+            sessoes = _sessoes(2, 30, 80)
+            apostas_lote, registradas_lote = classe.apostas_lote(np.array(sessoes), aposta_base, saldo_inicial)
+            for linha, vitorias in enumerate(sessoes):
+                esperado = _progressao_ganchos(estrategia, vitorias, aposta_base, saldo_inicial)
+                rodadas = len(esperado)
+                assert apostas_lote[linha, :rodadas].tolist() == [feita for feita, _ in esperado], estrategia
+                assert registradas_lote[linha, :rodadas].tolist() == [registrada for _, registrada in esperado]
+                # Uma sessão sozinha dá o mesmo que a linha do lote
+                apostas, registradas = classe.apostas_lote(np.array(vitorias), aposta_base, saldo_inicial)
+                assert apostas[:rodadas].tolist() == [feita for feita, _ in esperado]
+                assert registradas[:rodadas].tolist() == [registrada for _, registrada in esperado]
+
+
+def test_nome_desconhecido_aposta_sempre_o_valor_base():
+    assert obter_estrategia("inexistente") is Estrategia
+    vitorias = _sessoes(3, 1, 50)[0]
+    assert _progressao_ganchos("inexistente", vitorias, 2, 500) == _progressao_original(
+        "inexistente", vitorias, 2, 500)
@@ -0,0 +1,54 @@
+import json
+import random
+
+from carregar_historicos import carregar_resultados_em_fluxo
+from historico_binario import ResultadosBinarios, abrir_historico_binario, converter_para_binario
+from simulador_rodadas_com_graficos import simular_apostas
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+NOMES = ["historico_jogo_02012025_100000.json", "historico_jogo_01012025_100000.json",
+         "historico_jogo_03012025_100000.json"]
+
+
+def _gravar_sessoes(tmp_path, tamanhos, semente):
+    sorteio = random.Random(semente)
+    for nome, tamanho in zip(NOMES, tamanhos):
+        resultados = [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(tamanho)]
+        (tmp_path / nome).write_text(json.dumps(resultados))
+    return list(carregar_resultados_em_fluxo(str(tmp_path)))
+
+
+def test_binario_igual_aos_arquivos_json(tmp_path):
+    originais = _gravar_sessoes(tmp_path, [120, 0, 300], 6)
+    destino = str(tmp_path / "historico.bin")
+    assert converter_para_binario(str(tmp_path), destino) == len(originais)
+    binario = abrir_historico_binario(destino)
+    assert len(binario) == len(originais)
+    assert list(binario) == originais
+    assert [binario[posicao] for posicao in (0, 5, -1)] == [originais[posicao] for posicao in (0, 5, -1)]
+
+    fatia = binario[30:200]
+    assert isinstance(fatia, ResultadosBinarios)
+    assert list(fatia) == originais[30:200]
+
+    # Sessões em ordem cronológica: 01/01 (vazia), 02/01 e 03/01
+    assert [len(binario.sessao(posicao)) for posicao in range(3)] == [0, 120, 300]
+    assert list(binario.sessao(1)) == originais[:120]
+    assert list(binario.sessao(2)) == originais[120:]
+
+
+def test_simular_apostas_igual_com_binario_e_com_lista(tmp_path):
+    originais = _gravar_sessoes(tmp_path, [200, 150, 50], 7)
+    destino = str(tmp_path / "historico.bin")
+    converter_para_binario(str(tmp_path), destino)
+    binario = abrir_historico_binario(destino)
+    parametros = dict(saldo_inicial=50, aposta_base=1, estrategia="martingale", max_perdas_consecutivas=5,
+                      stop_gain=30, stop_loss=-30)
+    assert simular_apostas(binario[30:], binario[:30], **parametros) == simular_apostas(
+        originais[30:], originais[:30], **parametros)
+
+
+def test_historico_vazio(tmp_path):
+    destino = str(tmp_path / "vazio.bin")
+    assert converter_para_binario(str(tmp_path), destino) == 0
+    assert list(abrir_historico_binario(destino)) == []
@@ -0,0 +1,66 @@
+import csv
+import random
+
+import pytest
+
+from historico_colunar import HistoricoApostas
+from simulador_rodadas_com_graficos import simular_apostas
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+
+def _registros(semente, quantidade):
+    sorteio = random.Random(semente)
+    return [(sorteio.randrange(37), sorteio.choice(["Vitória", "Derrota"]), sorteio.choice([1.0, 2.5, 64.0]),
+             sorteio.uniform(-100, 100)) for _ in range(quantidade)]
+
+
+def test_historico_colunar_igual_a_lista_de_tuplas():
+    # Mais registros que a capacidade inicial para passar pelo crescimento
+    lista = _registros(1, 2500)
+    historico = HistoricoApostas(capacidade=3)
+    for registro in lista:
+        historico.append(registro)
+    assert len(historico) == len(lista)
+    assert list(historico) == lista
+    for indice in (0, 1, 1023, 1024, 2499, -1, -2500):
+        assert historico[indice] == lista[indice]
+    for indice in (2500, -2501):
+        with pytest.raises(IndexError):
+            historico[indice]
+    for fatia in (slice(None), slice(10, 20), slice(-30, None), slice(None, None, 7), slice(100, 10)):
+        assert list(historico[fatia]) == lista[fatia]
+        assert list(historico[fatia][1:-1]) == lista[fatia][1:-1]
+    registros = historico.para_numpy()
+    assert registros["numero"].tolist() == [numero for numero, _, _, _ in lista]
+    assert registros["vitoria"].tolist() == [situacao == "Vitória" for _, situacao, _, _ in lista]
+    assert registros["aposta"].tolist() == [aposta for _, _, aposta, _ in lista]
+    assert registros["saldo"].tolist() == [saldo for _, _, _, saldo in lista]
+
+
+def test_npz_e_csv_preservam_o_historico(tmp_path):
+    lista = _registros(2, 300)
+    historico = HistoricoApostas()
+    for registro in lista:
+        historico.append(registro)
+    historico.salvar_npz(str(tmp_path / "historico.npz"))
+    assert list(HistoricoApostas.carregar_npz(str(tmp_path / "historico.npz"))) == lista
+    historico.salvar_csv(str(tmp_path / "historico.csv"))
+    with open(tmp_path / "historico.csv", newline="") as f:
+        linhas = list(csv.reader(f))
+    assert linhas[0] == ["rodada", "numero", "resultado", "aposta", "saldo"]
+    assert [(int(numero), resultado, float(aposta), float(saldo)) for _, numero, resultado, aposta, saldo
+            in linhas[1:]] == lista
+
+
+def test_simular_apostas_colunar_igual_a_lista():
+    sorteio = random.Random(3)
+    resultados = [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(3000)]
+    for estrategia in ("martingale", "fibonacci", "labouchere", "nenhuma_estrategia"):
+        parametros = dict(saldo_inicial=10 ** 6, aposta_base=1, estrategia=estrategia, max_perdas_consecutivas=10 ** 6,
+                          stop_gain=10 ** 9, stop_loss=-10 ** 9)
+        saldo_lista, lista, ganho_lista = simular_apostas(resultados[30:], resultados[:30], **parametros)
+        saldo_colunar, colunar, ganho_colunar = simular_apostas(resultados[30:], resultados[:30],
+                                                               historico_colunar=True, **parametros)
+        assert isinstance(colunar, HistoricoApostas)
+        assert (saldo_colunar, ganho_colunar) == (saldo_lista, ganho_lista)
+        assert list(colunar) == lista
@@ -0,0 +1,60 @@
+import random
+
+from indice_historico import IndiceHistorico
+from simulador_rodadas_com_graficos import calcular_atrasos, contar_frequencias
+from tabela_roleta import COLUNA_DO_NUMERO, NOMES_COLUNAS, RESULTADO_DO_NUMERO
+
+
+def _maior_sequencia(resultados):
+    """Busca linear: a primeira sequência mais longa da mesma coluna, ignorando o zero."""
+    maior = (None, 0)
+    coluna_atual, comprimento = None, 0
+    for numero, _ in resultados:
+        if numero == 0:
+            continue
+        coluna = COLUNA_DO_NUMERO[numero]
+        comprimento = comprimento + 1 if coluna == coluna_atual else 1
+        coluna_atual = coluna
+        if comprimento > maior[1]:
+            maior = (NOMES_COLUNAS[coluna], comprimento)
+    return maior
+
+
+def _historicos(semente):
+    sorteio = random.Random(semente)
+    for _ in range(120):
+        tamanho = sorteio.randrange(0, 400)
+        chance_zero = sorteio.random() * 0.5
+        # Poucos números distintos formam muitas sequências do mesmo comprimento (empates)
+        numeros_possiveis = sorteio.choice([range(37), [1, 2, 3, 4, 5, 6], [1, 2], [1, 4]])
+        yield [RESULTADO_DO_NUMERO[0 if sorteio.random() < chance_zero else sorteio.choice(numeros_possiveis)]
+               for _ in range(tamanho)]
+    # Sequências alternadas de mesmo comprimento: todos os blocos empatam
+    yield [RESULTADO_DO_NUMERO[numero] for _ in range(100) for numero in (1, 4, 2, 5)]
+
+
+def test_consultas_iguais_ao_fatiamento_ingenuo():
+    sorteio = random.Random(1)
+    for resultados in _historicos(1):
+        indice = IndiceHistorico(resultados)
+        tamanho = len(resultados)
+        assert len(indice) == tamanho
+        for _ in range(60):
+            inicio, fim = sorteio.randrange(tamanho + 1), sorteio.randrange(tamanho + 1)
+            trecho = resultados[inicio:fim]
+            assert indice.frequencias(inicio, fim) == contar_frequencias(trecho), (inicio, fim)
+            assert indice.atrasos(inicio, fim) == calcular_atrasos(trecho), (inicio, fim)
+            assert indice.maior_sequencia(inicio, fim) == _maior_sequencia(trecho), (inicio, fim)
+        assert indice.frequencias() == contar_frequencias(resultados)
+        assert indice.frequencias(-10) == contar_frequencias(resultados[-10:])
+        assert indice.maior_sequencia() == _maior_sequencia(resultados)
+
+
+def test_atraso_em_igual_ao_atraso_do_prefixo():
+    for resultados in _historicos(2):
+        indice = IndiceHistorico(resultados)
+        for posicao in range(len(resultados) + 1):
+            atrasos = calcular_atrasos(resultados[:posicao])
+            for coluna, atraso in indice.atraso_em(posicao).items():
+                # Sem aparição no prefixo calcular_atrasos devolve 2 * tamanho; o índice devolve None
+                assert atraso == (None if atrasos[coluna] == 2 * posicao else atrasos[coluna]), (posicao, coluna)
@@ -0,0 +1,78 @@
+import json
+import random
+
+import simulador_rodadas_com_graficos as simulador
+from instrumentacao import Instrumentacao
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+
+def _resultados(semente, quantidade):
+    sorteio = random.Random(semente)
+    return [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(quantidade)]
+
+
+def _recalculos_esperados(historico):
+    """Rodadas com pesos dinâmicos: número zero ou mais de uma perda seguida antes da rodada."""
+    recalculos = perdas_consecutivas = 0
+    for numero, situacao, _, _ in historico:
+        if numero == 0 or perdas_consecutivas > 1:
+            recalculos += 1
+        perdas_consecutivas = 0 if situacao == "Vitória" else perdas_consecutivas + 1
+    return recalculos
+
+
+def test_simulacao_instrumentada_igual_e_contadores_coerentes():
+    resultados = _resultados(1, 2000)
+    casos = [(dict(saldo_inicial=10 ** 6, max_perdas_consecutivas=10 ** 6, stop_gain=10 ** 9, stop_loss=-10 ** 9),
+              "encerramento.fim_dos_resultados"),
+             (dict(saldo_inicial=100, max_perdas_consecutivas=4, stop_gain=10 ** 9, stop_loss=-10 ** 9),
+              "encerramento.max_perdas_consecutivas")]
+    for parametros, encerramento in casos:
+        esperado = simulador.simular_apostas(resultados[30:], resultados[:30], aposta_base=1, estrategia="martingale",
+                                             **parametros)
+        instrumentacao = Instrumentacao()
+        assert simulador.simular_apostas(resultados[30:], resultados[:30], aposta_base=1, estrategia="martingale",
+                                         instrumentacao=instrumentacao, **parametros) == esperado
+        historico = esperado[1]
+        contadores = instrumentacao.contadores
+        assert contadores["simulacoes"] == 1
+        assert contadores["rodadas"] == contadores["apostas"] == len(historico)
+        assert contadores[encerramento] == 1
+        assert contadores["recalculos_pesos"] == _recalculos_esperados(historico)
+        assert contadores["cache_colunas.acertos"] + contadores["cache_colunas.falhas"] == len(historico)
+        assert (contadores["cache_pesos.acertos"] + contadores["cache_pesos.falhas"]
+                == contadores["recalculos_pesos"])
+        fases = instrumentacao.relatorio()["fases"]
+        assert set(fases) == {"simular_apostas", "simular_apostas;estatisticas", "simular_apostas;pontuacao",
+                              "simular_apostas;janela", "simular_apostas;aposta"}
+        assert fases["simular_apostas;estatisticas"]["medicoes"] == len(historico)
+        assert sum(fase["tempo_s"] for pilha, fase in fases.items() if ";" in pilha) <= (
+            fases["simular_apostas"]["tempo_s"] + 1e-9)
+
+
+def test_combinar_e_arquivos_gerados(tmp_path):
+    resultados = _resultados(2, 300)
+    total = Instrumentacao()
+    for estrategia in ("martingale", "paroli"):
+        parcial = Instrumentacao()
+        simulador.simular_apostas(resultados[30:], resultados[:30], saldo_inicial=10 ** 6, aposta_base=1,
+                                  estrategia=estrategia, max_perdas_consecutivas=10 ** 6, stop_gain=10 ** 9,
+                                  stop_loss=-10 ** 9, instrumentacao=parcial)
+        with parcial.secao("graficos"):
+            pass
+        total.combinar(parcial)
+    assert total.contadores["simulacoes"] == 2
+    assert total.contadores["rodadas"] == 2 * 270
+    assert total.medicoes["graficos"] == 2
+
+    total.salvar_relatorio(str(tmp_path / "relatorio.json"))
+    with open(tmp_path / "relatorio.json") as f:
+        assert json.load(f) == json.loads(json.dumps(total.relatorio()))
+    total.salvar_trace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        eventos = json.load(f)["traceEvents"]
+    assert [evento["name"] for evento in eventos] == ["simular_apostas", "graficos"] * 2
+    total.salvar_pilhas(str(tmp_path / "pilhas.txt"))
+    linhas = (tmp_path / "pilhas.txt").read_text().splitlines()
+    assert {linha.rsplit(" ", 1)[0] for linha in linhas} == set(total.tempos)
+    assert all(int(linha.rsplit(" ", 1)[1]) >= 0 for linha in linhas)
@@ -0,0 +1,38 @@
+import random
+
+from janela_estatisticas import JanelaEstatisticas
+from simulador_rodadas_com_graficos import (calcular_atrasos, calcular_repeticoes_antigas,
+                                            calcular_repeticoes_recentes, contar_frequencias)
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+
+def _conferir(janela, resultados):
+    assert janela.frequencias() == contar_frequencias(resultados)
+    assert janela.atrasos() == calcular_atrasos(resultados)
+    assert janela.repeticoes_recentes() == calcular_repeticoes_recentes(resultados)
+    assert janela.repeticoes_antigas() == calcular_repeticoes_antigas(resultados)
+    assert janela.repeticoes_antigas(2) == calcular_repeticoes_antigas(resultados, 2)
+
+
+def test_janela_deslizante_igual_as_funcoes_de_estatistica():
+    sorteio = random.Random(1)
+    for tamanho in (1, 2, 5, 30):
+        # Poucos números distintos (e muitos zeros) para formar sequências longas e repetições
+        for numeros_possiveis in (range(37), [0, 0, 1, 2, 3, 4], [0, 1, 4, 7]):
+            historico = [RESULTADO_DO_NUMERO[sorteio.choice(numeros_possiveis)] for _ in range(tamanho + 200)]
+            janela = JanelaEstatisticas(historico[:tamanho])
+            _conferir(janela, historico[:tamanho])
+            for inicio in range(1, 201):
+                janela.adicionar(historico[inicio + tamanho - 1])
+                _conferir(janela, historico[inicio:inicio + tamanho])
+
+
+def test_janela_enchendo_ate_o_tamanho():
+    sorteio = random.Random(2)
+    historico = [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(60)]
+    janela = JanelaEstatisticas(tamanho=30)
+    _conferir(janela, [])
+    for fim in range(1, 61):
+        janela.adicionar(historico[fim - 1])
+        _conferir(janela, historico[max(0, fim - 30):fim])
+    assert len(janela) == 30
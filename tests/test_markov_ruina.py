@@ -0,0 +1,86 @@
+import copy
+import math
+
+from estrategias import criar_estrategia
+from markov_ruina import MOTIVOS, PROBABILIDADE_VITORIA, analisar_sessao, comparar_com_monte_carlo
+
+PARAMETROS = dict(saldo_inicial=10, aposta_base=1, max_perdas_consecutivas=4, stop_gain=8, stop_loss=-7)
+
+
+def _distribuicao_por_enumeracao(estrategia, rodadas, saldo_inicial, aposta_base, max_perdas_consecutivas,
+                                 stop_gain, stop_loss):
+    """Percorre todas as sequências de vitórias e derrotas com as regras de parada de simular_apostas."""
+    distribuicao = {}
+
+    def encerrar(motivo, saldo, probabilidade):
+        chave = (motivo, saldo - saldo_inicial)
+        distribuicao[chave] = distribuicao.get(chave, 0.0) + probabilidade
+
+    def rodada(restantes, saldo, perdas_consecutivas, progressao, probabilidade):
+        if restantes == 0:
+            return encerrar("fim_dos_resultados", saldo, probabilidade)
+        progressao = copy.deepcopy(progressao)
+        aposta = progressao.proxima_aposta(saldo)
+        if saldo - aposta <= 0:
+            return encerrar("saldo_insuficiente", saldo, probabilidade)
+        saldo_vitoria = saldo - aposta + (aposta / 2) * 3
+        vitoria = copy.deepcopy(progressao)
+        vitoria.ao_vencer()
+        if saldo_vitoria - saldo_inicial >= stop_gain:
+            encerrar("stop_gain", saldo_vitoria, probabilidade * PROBABILIDADE_VITORIA)
+        else:
+            rodada(restantes - 1, saldo_vitoria, 0, vitoria, probabilidade * PROBABILIDADE_VITORIA)
+        saldo_derrota = saldo - aposta
+        progressao.ao_perder()
+        probabilidade_derrota = probabilidade * (1 - PROBABILIDADE_VITORIA)
+        if saldo_derrota - saldo_inicial <= stop_loss:
+            encerrar("stop_loss", saldo_derrota, probabilidade_derrota)
+        elif perdas_consecutivas + 1 >= max_perdas_consecutivas:
+            encerrar("max_perdas_consecutivas", saldo_derrota, probabilidade_derrota)
+        else:
+            rodada(restantes - 1, saldo_derrota, perdas_consecutivas + 1, progressao,
+                   probabilidade_derrota)
+
+    rodada(rodadas, saldo_inicial, 0, criar_estrategia(estrategia, aposta_base), 1.0)
+    return distribuicao
+
+
+def test_cadeia_igual_a_enumeracao_das_sessoes():
+    for estrategia in ("martingale", "fibonacci", "dalembert", "paroli", "labouchere", "nenhuma_estrategia"):
+        distribuicao = _distribuicao_por_enumeracao(estrategia, 12, **PARAMETROS)
+        resumo = analisar_sessao(estrategia, rodadas=12, **PARAMETROS)
+        for motivo in MOTIVOS:
+            esperado = sum(probabilidade for (nome, _), probabilidade in distribuicao.items() if nome == motivo)
+            assert math.isclose(resumo[f"prob_{motivo}"], esperado, abs_tol=1e-12), (estrategia, motivo)
+        por_ganho = {}
+        for (_, ganho), probabilidade in distribuicao.items():
+            por_ganho[ganho] = por_ganho.get(ganho, 0.0) + probabilidade
+        # A cadeia também lista ganhos que só seriam alcançados depois do limite de rodadas (probabilidade 0)
+        exato = dict(resumo["distribuicao"])
+        assert set(por_ganho) <= set(exato)
+        for ganho, probabilidade in exato.items():
+            assert math.isclose(probabilidade, por_ganho.get(ganho, 0.0), abs_tol=1e-12), (estrategia, ganho)
+        media = sum(ganho * probabilidade for ganho, probabilidade in por_ganho.items())
+        assert math.isclose(resumo["ganho_esperado"], media, abs_tol=1e-12)
+
+
+def test_sem_limite_de_rodadas_e_o_limite_das_sessoes_longas():
+    for estrategia in ("martingale", "dalembert", "labouchere"):
+        sem_limite = analisar_sessao(estrategia, **PARAMETROS)
+        assert sem_limite["prob_fim_dos_resultados"] == 0.0
+        assert math.isclose(sum(probabilidade for _, probabilidade in sem_limite["distribuicao"]), 1.0,
+                            abs_tol=1e-9)
+        longa = analisar_sessao(estrategia, rodadas=2000, **PARAMETROS)
+        assert longa["prob_fim_dos_resultados"] < 1e-9
+        for medida in ("prob_ruina", "prob_stop_gain", "ganho_esperado", "rodadas_esperadas"):
+            assert math.isclose(longa[medida], sem_limite[medida], abs_tol=1e-6), (estrategia, medida)
+
+
+def test_monte_carlo_dentro_do_intervalo_com_confianca_alta():
+    # Conferência estatística com semente fixa e confiança de 99,9%
+    comparacao = comparar_com_monte_carlo("martingale", sessoes=4000, rodadas=60, semente=1, confianca=0.999,
+                                          **PARAMETROS)
+    assert set(comparacao) == {"ganho_esperado", "prob_ruina", "prob_lucro", "prob_stop_gain"}
+    for medida, (_, _, intervalo, dentro) in comparacao.items():
+        assert intervalo[0] <= intervalo[1]
+        assert dentro, (medida, comparacao[medida])
@@ -0,0 +1,37 @@
+import numpy as np
+
+from monte_carlo import ESTRATEGIAS, gerar_sessoes, intervalo_wilson, simular_lote, simular_monte_carlo
+from simulador_rodadas_com_graficos import simular_apostas
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+
+def test_cada_sessao_do_lote_igual_a_simular_apostas():
+    numeros = gerar_sessoes(np.random.default_rng(3), 40, 30 + 150)
+    parametros = dict(saldo_inicial=30, aposta_base=1, max_perdas_consecutivas=5, stop_gain=20, stop_loss=-15)
+    resultado = simular_lote(numeros, 30, ESTRATEGIAS, **parametros)
+    for sessao, linha in enumerate(numeros):
+        resultados = [RESULTADO_DO_NUMERO[numero] for numero in linha.tolist()]
+        for estrategia in ESTRATEGIAS:
+            _, _, ganho_liquido = simular_apostas(resultados[30:], resultados[:30], estrategia=estrategia,
+                                                  **parametros)
+            assert resultado[estrategia][0][sessao] == ganho_liquido, (sessao, estrategia)
+
+
+def test_resumo_reproduzivel_e_completo_em_qualquer_tamanho_de_lote():
+    resumo = simular_monte_carlo(300, rodadas=80, semente=7, tamanho_lote=300)
+    assert simular_monte_carlo(300, rodadas=80, semente=7, tamanho_lote=300) == resumo
+    for estrategia, dados in resumo.items():
+        assert dados["sessoes"] == 300
+        assert sum(contagem for _, contagem in dados["distribuicao"]) == 300
+        inferior, superior = dados["ic_media"]
+        assert inferior <= dados["media"] <= superior
+    # Com lotes menores os sorteios mudam, mas todas as sessões entram no resumo
+    em_partes = simular_monte_carlo(300, rodadas=80, semente=7, tamanho_lote=64)
+    assert all(dados["sessoes"] == 300 for dados in em_partes.values())
+
+
+def test_intervalo_wilson():
+    inferior, superior = intervalo_wilson(50, 100)
+    assert abs(inferior - 0.4038) < 1e-4 and abs(superior - 0.5962) < 1e-4
+    assert abs(intervalo_wilson(0, 100)[0]) < 1e-12
+    assert intervalo_wilson(0, 0) == (0.0, 1.0)
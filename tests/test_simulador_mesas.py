@@ -0,0 +1,41 @@
+import json
+import random
+
+from estrategias import ESTRATEGIAS_REGISTRADAS
+from simulador_mesas import Mesa, mesas_de_arquivos, simular_mesas
+from simulador_rodadas_com_graficos import simular_apostas
+from tabela_roleta import RESULTADO_DO_NUMERO
+
+
+def test_uma_mesa_igual_a_simular_apostas():
+    for semente in range(20):
+        sorteio = random.Random(semente)
+        numeros = [sorteio.randrange(37) for _ in range(sorteio.randrange(5, 400))]
+        for estrategia in ESTRATEGIAS_REGISTRADAS:
+            parametros = dict(saldo_inicial=sorteio.choice([10, 100]), aposta_base=sorteio.choice([1, 2]),
+                              max_perdas_consecutivas=sorteio.choice([3, 10 ** 9]),
+                              stop_gain=sorteio.choice([20, 10 ** 9]), stop_loss=sorteio.choice([-5, -10 ** 9]),
+                              tamanho_janela=sorteio.choice([10, 30]))
+            resumo = simular_mesas([Mesa("mesa", bytes(numeros))], estrategia=estrategia, registrar_saldos=True,
+                                   **parametros)
+            saldo_final, historico, ganho_liquido = simular_apostas(
+                [RESULTADO_DO_NUMERO[numero] for numero in numeros], None, estrategia=estrategia, **parametros)
+            assert (resumo["saldo_final"], resumo["ganho_liquido"]) == (saldo_final, ganho_liquido)
+            assert [saldo for _, saldo in resumo["saldos"]] == [registro[3] for registro in historico]
+
+
+def test_mesa_sem_rodadas_apos_a_janela_nao_conta_como_simultanea():
+    resumo = simular_mesas([Mesa("curta", bytes(range(10))), Mesa("longa", bytes([1, 2, 3] * 40))],
+                           saldo_inicial=1000, stop_loss=-10 ** 9)
+    assert resumo["mesas_simultaneas"] == 1
+    assert resumo["mesas"][0]["rodadas"] == 0
+
+
+def test_mesas_de_arquivos_leem_o_arquivo_so_na_primeira_rodada(tmp_path):
+    caminho = tmp_path / "historico_jogo_2025-01-01_10-00-00.json"
+    caminho.write_text(json.dumps([RESULTADO_DO_NUMERO[numero] for numero in range(37)]))
+    mesas = mesas_de_arquivos([str(tmp_path)])
+    # Nada foi lido ao criar a mesa: ela enxerga o conteúdo do arquivo no momento da primeira rodada
+    numeros = [random.Random(1).randrange(37) for _ in range(200)]
+    caminho.write_text(json.dumps([RESULTADO_DO_NUMERO[numero] for numero in numeros]))
+    assert list(mesas[0].numeros) == numeros
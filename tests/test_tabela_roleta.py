@@ -0,0 +1,46 @@
+import random
+
+from simulador_mesas import Mesa, simular_mesas
+from simulador_rodadas_com_graficos import simular_apostas
+from tabela_roleta import (COLUNA_DO_NUMERO, FORA, NOMES_COLUNAS, RESULTADO_DO_NUMERO, alguma_aposta_vence,
+                           numeros_da_aposta, retorno_apostas)
+
+# Colunas da mesa, como nos conjuntos de números do simulador original
+NUMEROS_DAS_COLUNAS = {"coluna_1": set(range(1, 37, 3)), "coluna_2": set(range(2, 37, 3)),
+                       "coluna_3": set(range(3, 37, 3))}
+SEM_LIMITES = dict(saldo_inicial=10 ** 6, max_perdas_consecutivas=10 ** 6, stop_gain=10 ** 9, stop_loss=-10 ** 9)
+
+
+def test_tabelas_iguais_aos_conjuntos_de_numeros():
+    for nome, numeros in NUMEROS_DAS_COLUNAS.items():
+        assert set(numeros_da_aposta(nome)) == numeros
+    assert COLUNA_DO_NUMERO[0] == FORA
+
+
+def test_retorno_de_duas_colunas_paga_dois_para_um_na_metade_apostada():
+    for primeira in NOMES_COLUNAS:
+        for segunda in NOMES_COLUNAS:
+            if primeira == segunda:
+                continue
+            for numero in range(37):
+                venceu = numero in NUMEROS_DAS_COLUNAS[primeira] | NUMEROS_DAS_COLUNAS[segunda]
+                for valor in (1, 10, 7.5):
+                    assert retorno_apostas([primeira, segunda], numero, valor) == ((valor / 2) * 3 if venceu else 0)
+                assert alguma_aposta_vence([primeira, segunda], numero) == venceu
+                assert retorno_apostas([primeira, segunda], numero, 0) == 0
+
+
+def test_aposta_zero_ainda_vence_quando_o_numero_esta_nas_colunas():
+    sorteio = random.Random(4)
+    resultados = [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(300)]
+    # A escolha das colunas depende só das vitórias e derrotas, não do valor apostado
+    _, com_valor, _ = simular_apostas(resultados[30:], resultados[:30], aposta_base=1,
+                                      estrategia="nenhuma_estrategia", **SEM_LIMITES)
+    _, sem_valor, _ = simular_apostas(resultados[30:], resultados[:30], aposta_base=0,
+                                      estrategia="nenhuma_estrategia", **SEM_LIMITES)
+    assert [registro[1] for registro in sem_valor] == [registro[1] for registro in com_valor]
+    assert "Vitória" in {registro[1] for registro in sem_valor}
+
+    resumo = simular_mesas([Mesa("mesa", bytes(numero for numero, _ in resultados))], aposta_base=0,
+                           estrategia="nenhuma_estrategia", **SEM_LIMITES)
+    assert resumo["rodadas"] == len(sem_valor)
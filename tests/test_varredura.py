@@ -0,0 +1,37 @@
+import random
+
+from simulador_rodadas_com_graficos import simular_apostas
+from tabela_roleta import RESULTADO_DO_NUMERO
+from varredura import gerar_configuracoes, varrer_parametros
+
+
+def test_grade_completa_e_amostras_distintas():
+    eixos = dict(pesos=[(0.7, 0.3, 0.0, 0.2), (0.5, 0.5, 0.1, 0.1)], max_perdas=[3, 5], stop_gains=[20],
+                 stop_losses=[-5, -10], janelas=[10, 30])
+    grade = list(gerar_configuracoes(**eixos))
+    assert len(grade) == 16
+    assert len({tuple(configuracao.items()) for configuracao in grade}) == 16
+    amostras = list(gerar_configuracoes(**eixos, amostras=5, semente=1))
+    assert len(amostras) == 5
+    assert all(configuracao in grade for configuracao in amostras)
+    assert len({tuple(configuracao.items()) for configuracao in amostras}) == 5
+
+
+def test_cada_linha_igual_a_simular_apostas_com_a_mesma_configuracao():
+    sorteio = random.Random(5)
+    resultados = [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(400)]
+    estrategias = ["martingale", "paroli", "nenhuma_estrategia"]
+    tabela = varrer_parametros(resultados, estrategias, pesos=[(0.7, 0.3, 0.0, 0.2), (0.2, 0.2, 0.5, 0.1)],
+                               max_perdas=[3, 6], stop_gains=[20], stop_losses=[-5, -30], janelas=[10, 30],
+                               saldo_inicial=50, aposta_base=1, processos=1)
+    assert len(tabela) == 16 * len(estrategias)
+    assert [linha["ganho_liquido"] for linha in tabela] == sorted((linha["ganho_liquido"] for linha in tabela),
+                                                                  reverse=True)
+    for linha in tabela:
+        janela = linha["janela"]
+        saldo_final, historico, ganho_liquido = simular_apostas(
+            resultados[janela:], resultados[:janela], saldo_inicial=50, aposta_base=1, estrategia=linha["estrategia"],
+            max_perdas_consecutivas=linha["max_perdas_consecutivas"], stop_gain=linha["stop_gain"],
+            stop_loss=linha["stop_loss"], pesos_padrao=linha["pesos"])
+        assert (linha["saldo_final"], linha["ganho_liquido"], linha["rodadas"]) == (
+            saldo_final, ganho_liquido, len(historico))
@@ -0,0 +1,56 @@
+import random
+
+from simulador_rodadas_com_graficos import simular_apostas
+from tabela_roleta import RESULTADO_DO_NUMERO
+from walk_forward import ESTRATEGIAS, avaliar_walk_forward, gerar_dobras, resumir_por_estrategia
+
+
+def _resultados(semente, quantidade):
+    sorteio = random.Random(semente)
+    return [RESULTADO_DO_NUMERO[sorteio.randrange(37)] for _ in range(quantidade)]
+
+
+def test_dobras_cobrem_o_historico_sem_passar_do_fim():
+    assert gerar_dobras(500, 30, 200) == [(0, 30, 230), (200, 230, 430)]
+    assert gerar_dobras(100, 30, 200) == []
+    dobras = gerar_dobras(1000, 12, 80, passo=37)
+    assert [inicio for inicio, _, _ in dobras] == list(range(0, 1000 - 12 - 80 + 1, 37))
+    assert all(fim <= 1000 for _, _, fim in dobras)
+
+
+def test_cada_dobra_igual_a_simular_apostas_no_trecho():
+    resultados = _resultados(5, 2500)
+    casos = [(30, 200, None, dict(saldo_inicial=10, aposta_base=1, max_perdas_consecutivas=3, stop_gain=20,
+                                  stop_loss=-5)),
+             (30, 150, 37, dict(saldo_inicial=10, aposta_base=1, max_perdas_consecutivas=3, stop_gain=20,
+                                stop_loss=-5)),
+             (12, 80, 300, dict(saldo_inicial=50, aposta_base=2, max_perdas_consecutivas=5, stop_gain=40,
+                                stop_loss=-30, pesos_padrao=(0.2, 0.2, 0.5, 0.1)))]
+    for tamanho_janela, tamanho_teste, passo, parametros in casos:
+        linhas = avaliar_walk_forward(resultados, tamanho_janela=tamanho_janela, tamanho_teste=tamanho_teste,
+                                      passo=passo, processos=1, **parametros)
+        dobras = gerar_dobras(len(resultados), tamanho_janela, tamanho_teste, passo)
+        assert len(linhas) == len(dobras) * len(ESTRATEGIAS)
+        for linha in linhas:
+            inicio, inicio_teste, fim = dobras[linha["dobra"]]
+            assert (linha["inicio"], linha["inicio_teste"], linha["fim"]) == (inicio, inicio_teste, fim)
+            saldo_final, historico, ganho_liquido = simular_apostas(
+                resultados[inicio_teste:fim], resultados[inicio:inicio_teste], estrategia=linha["estrategia"],
+                tamanho_janela=tamanho_janela, **parametros)
+            assert (linha["saldo_final"], linha["ganho_liquido"], linha["rodadas"]) == (
+                saldo_final, ganho_liquido, len(historico)), linha
+
+
+def test_processos_dao_o_mesmo_resultado_e_resumo_conta_as_dobras():
+    resultados = _resultados(6, 1500)
+    parametros = dict(tamanho_janela=30, tamanho_teste=100, passo=60, saldo_inicial=30, aposta_base=1)
+    linhas = avaliar_walk_forward(resultados, processos=1, **parametros)
+    assert avaliar_walk_forward(resultados, processos=2, **parametros) == linhas
+    resumos = resumir_por_estrategia(linhas)
+    assert set(resumos) == set(ESTRATEGIAS)
+    for estrategia, resumo in resumos.items():
+        dobras = [linha for linha in linhas if linha["estrategia"] == estrategia]
+        assert resumo["dobras"] == len(dobras)
+        assert sum(resumo["motivos"].values()) == len(dobras)
+        inferior, superior = resumo["intervalo_ganho_medio"]
+        assert inferior <= resumo["ganho_medio"] <= superior
@@ -0,0 +1,135 @@
+import bisect
+import math
+import os
+import random
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from backtest_vetorizado import ESTRATEGIAS, simular_numeros_vetorizado
+
+
+# Valores hoje fixos em simular_apostas e no __main__
+PESOS_PADRAO = [(0.7, 0.3, 0.0, 0.2)]
+MAX_PERDAS_PADRAO = [3]
+STOP_GAIN_PADRAO = [20]
+STOP_LOSS_PADRAO = [-5]
+JANELAS_PADRAO = [30]
+
+# Histórico compartilhado com os processos de trabalho (preenchido pelo inicializador)
+_memoria = None
+_numeros = None
+
+
+def gerar_configuracoes(pesos=PESOS_PADRAO, max_perdas=MAX_PERDAS_PADRAO, stop_gains=STOP_GAIN_PADRAO,
+                        stop_losses=STOP_LOSS_PADRAO, janelas=JANELAS_PADRAO, amostras=None, semente=None):
+    """
+    Gera as combinações (janela, pesos, max_perdas, stop_gain, stop_loss) da varredura.
+
+    Sem 'amostras' percorre a grade completa; com 'amostras' sorteia essa quantidade de
+    combinações distintas da grade (busca aleatória) sem montar a grade inteira em memória.
+    """
+    eixos = [list(janelas), list(pesos), list(max_perdas), list(stop_gains), list(stop_losses)]
+    total = math.prod(len(eixo) for eixo in eixos)
+    if amostras is None or amostras >= total:
+        indices = range(total)
+    else:
+        indices = random.Random(semente).sample(range(total), amostras)
+    for indice in indices:
+        configuracao = []
+        for eixo in reversed(eixos):
+            indice, posicao = divmod(indice, len(eixo))
+            configuracao.append(eixo[posicao])
+        janela, peso, perdas, gain, loss = reversed(configuracao)
+        yield {"janela": janela, "pesos": tuple(peso), "max_perdas_consecutivas": perdas,
+               "stop_gain": gain, "stop_loss": loss}
+
+
+def _iniciar_processo(nome, tamanho):
+    global _memoria, _numeros
+    _memoria = shared_memory.SharedMemory(name=nome)
+    _numeros = np.ndarray((tamanho,), dtype=np.uint8, buffer=_memoria.buf)
+
+
+# Simula todas as estratégias de uma configuração sobre o histórico compartilhado
+def _executar_configuracao(tarefa):
+    configuracao, estrategias, saldo_inicial, aposta_base = tarefa
+    resultados = simular_numeros_vetorizado(
+        _numeros, configuracao["janela"], saldo_inicial, aposta_base, estrategias,
+        configuracao["max_perdas_consecutivas"], configuracao["stop_gain"], configuracao["stop_loss"],
+        configuracao["pesos"])
+    linhas = []
+    for estrategia, (saldo_final, historico, ganho_liquido) in resultados.items():
+        linhas.append(dict(configuracao, estrategia=estrategia, saldo_final=saldo_final,
+                           ganho_liquido=ganho_liquido, rodadas=len(historico)))
+    return linhas
+
+
+def executar_varredura(resultados, configuracoes, estrategias=ESTRATEGIAS, saldo_inicial=10, aposta_base=1,
+                       processos=None):
+    """
+    Executa as configurações em paralelo e produz as linhas de resultado à medida que ficam prontas.
+
+    O histórico é copiado uma única vez para memória compartilhada (um uint8 por resultado)
+    e lido pelos processos sem ser serializado a cada tarefa.
+
+    Parâmetros:
+    - resultados: Lista de tuplas no formato [[numero, cor], ...], array de números ou ResultadosBinarios.
+    - configuracoes: Iterável de configurações, como as de gerar_configuracoes.
+    - estrategias, saldo_inicial, aposta_base: Como em simular_apostas.
+    - processos: Quantidade de processos (padrão: todos os núcleos).
+
+    Retorna:
+    - Um gerador de dicionários, um por (configuração, estratégia).
+    """
+    if hasattr(resultados, "numeros"):
+        resultados = resultados.numeros
+    elif len(resultados) and not isinstance(resultados, np.ndarray):
+        resultados = [numero for numero, _ in resultados]
+    numeros = np.asarray(resultados, dtype=np.uint8)
+    memoria = shared_memory.SharedMemory(create=True, size=max(len(numeros), 1))
+    try:
+        np.ndarray(numeros.shape, dtype=np.uint8, buffer=memoria.buf)[:] = numeros
+        tarefas = ((configuracao, list(estrategias), saldo_inicial, aposta_base) for configuracao in configuracoes)
+        with Pool(processos or os.cpu_count(), initializer=_iniciar_processo,
+                  initargs=(memoria.name, len(numeros))) as pool:
+            for linhas in pool.imap_unordered(_executar_configuracao, tarefas):
+                yield from linhas
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def varrer_parametros(resultados, estrategias=ESTRATEGIAS, pesos=PESOS_PADRAO, max_perdas=MAX_PERDAS_PADRAO,
+                      stop_gains=STOP_GAIN_PADRAO, stop_losses=STOP_LOSS_PADRAO, janelas=JANELAS_PADRAO,
+                      saldo_inicial=10, aposta_base=1, amostras=None, semente=None, processos=None,
+                      top=None, ao_receber=None):
+    """
+    Varredura em grade (ou aleatória, com 'amostras') de estratégias, pesos, limites e janelas.
+
+    Cada linha recebida é inserida na tabela ordenada pelo ganho líquido (maior primeiro);
+    'ao_receber', se informado, é chamado com a tabela a cada linha nova.
+
+    Retorna:
+    - A tabela ordenada, limitada às 'top' melhores linhas se informado.
+    """
+    configuracoes = gerar_configuracoes(pesos, max_perdas, stop_gains, stop_losses, janelas, amostras, semente)
+    tabela = []
+    for linha in executar_varredura(resultados, configuracoes, estrategias, saldo_inicial, aposta_base, processos):
+        bisect.insort(tabela, linha, key=lambda item: -item["ganho_liquido"])
+        if top is not None:
+            del tabela[top:]
+        if ao_receber is not None:
+            ao_receber(tabela)
+    return tabela
+
+
+# Função para imprimir a tabela da varredura
+def imprimir_tabela(tabela):
+    print(f"{'#':>4} {'estrategia':<20} {'janela':>6} {'pesos':<26} {'perdas':>6} {'gain':>6} {'loss':>6} "
+          f"{'rodadas':>8} {'ganho':>10}")
+    for posicao, linha in enumerate(tabela, start=1):
+        pesos = "/".join(f"{peso:g}" for peso in linha["pesos"])
+        print(f"{posicao:>4} {linha['estrategia']:<20} {linha['janela']:>6} {pesos:<26} "
+              f"{linha['max_perdas_consecutivas']:>6} {linha['stop_gain']:>6} {linha['stop_loss']:>6} "
+              f"{linha['rodadas']:>8} {linha['ganho_liquido']:>10.2f}")
@@ -0,0 +1,271 @@
+import argparse
+import json
+import math
+import os
+import statistics
+from collections import Counter
+from multiprocessing import Pool
+
+from carregar_historicos import carregar_resultados_em_fluxo
+from estrategias import ESTRATEGIAS_REGISTRADAS, criar_estrategia
+from janela_estatisticas import JanelaEstatisticas
+from monte_carlo import Z_95, intervalo_wilson
+from simulador_rodadas_com_graficos import escolher_colunas_em_cache, gerar_pesos_em_cache
+from tabela_roleta import RESULTADO_DO_NUMERO, alguma_aposta_vence, retorno_apostas
+
+
+ESTRATEGIAS = ["martingale", "fibonacci", "dalembert", "paroli", "labouchere", "nenhuma_estrategia"]
+
+
+def gerar_dobras(tamanho_historico, tamanho_janela=30, tamanho_teste=200, passo=None):
+    """
+    Gera as dobras (inicio, inicio_teste, fim) da avaliação walk-forward.
+
+    Cada dobra usa resultados[inicio:inicio_teste] como janela analisada e aposta em
+    resultados[inicio_teste:fim]; a origem avança 'passo' resultados (padrão: tamanho_teste,
+    dobras sem sobreposição).
+    """
+    passo = passo or tamanho_teste
+    return [(inicio, inicio + tamanho_janela, inicio + tamanho_janela + tamanho_teste)
+            for inicio in range(0, tamanho_historico - tamanho_janela - tamanho_teste + 1, passo)]
+
+
+class _EstadoDobra:
+    # Estado de uma estratégia dentro de uma dobra; cada uma tem sua própria progressão
+    __slots__ = ("dobra", "estrategia", "fim", "progressao", "saldo", "perdas_consecutivas", "rodadas", "motivo")
+
+    def __init__(self, dobra, estrategia, fim, aposta_base, saldo_inicial):
+        self.dobra = dobra
+        self.estrategia = estrategia
+        self.fim = fim
+        self.progressao = criar_estrategia(estrategia, aposta_base)
+        self.saldo = saldo_inicial
+        self.perdas_consecutivas = 0
+        self.rodadas = 0
+        self.motivo = None
+
+
+def avaliar_dobras(numeros, dobras, estrategias=ESTRATEGIAS, saldo_inicial=10, aposta_base=1,
+                   max_perdas_consecutivas=3, stop_gain=20, stop_loss=-5, pesos_padrao=(0.7, 0.3, 0.0, 0.2)):
+    """
+    Avalia todas as dobras numa única passada pelo histórico.
+
+    A janela de estatísticas numa rodada é sempre a dos 'tamanho_janela' resultados anteriores,
+    qualquer que seja a dobra, então ela é mantida uma vez só (JanelaEstatisticas) e as colunas
+    escolhidas são calculadas uma vez por rodada e compartilhadas por todas as dobras e estratégias
+    ativas. Cada (dobra, estratégia) liquida as apostas como simular_apostas(resultados[inicio_teste:fim],
+    resultados[inicio:inicio_teste], ...), com seu próprio saldo e progressão.
+
+    Parâmetros:
+    - numeros: Sequência com os números sorteados (lista, bytes ou array).
+    - dobras: Lista de (inicio, inicio_teste, fim), como as de gerar_dobras, com o mesmo tamanho de janela.
+
+    Retorna:
+    - Lista de dicionários, um por (dobra, estratégia), na ordem das dobras.
+    """
+    if not dobras:
+        return []
+    dobras = sorted(dobras)
+    primeiro_inicio, primeiro_teste, _ = dobras[0]
+    fim_total = max(fim for _, _, fim in dobras)
+    pesos_padrao = tuple(pesos_padrao)
+    janela = JanelaEstatisticas(RESULTADO_DO_NUMERO[numero] for numero in numeros[primeiro_inicio:primeiro_teste])
+
+    linhas = []
+    ativos = []
+    proxima = 0
+
+    def finalizar(estado):
+        linhas.append({
+            "dobra": estado.dobra, "inicio": dobras[estado.dobra][0], "inicio_teste": dobras[estado.dobra][1],
+            "fim": estado.fim, "estrategia": estado.estrategia, "saldo_final": estado.saldo,
+            "ganho_liquido": estado.saldo - saldo_inicial, "rodadas": estado.rodadas,
+            "motivo": estado.motivo or "fim_da_dobra",
+        })
+
+    for posicao in range(primeiro_teste, fim_total):
+        while proxima < len(dobras) and dobras[proxima][1] == posicao:
+            ativos.extend(_EstadoDobra(proxima, estrategia, dobras[proxima][2], aposta_base, saldo_inicial)
+                          for estrategia in estrategias)
+            proxima += 1
+        resultado = RESULTADO_DO_NUMERO[numeros[posicao]]
+        numero = resultado[0]
+
+        if ativos:
+            frequencia_colunas = janela.frequencias()
+            atrasos = janela.atrasos()
+            repeticoes_recentes = janela.repeticoes_recentes()
+            repeticoes_antigas = janela.repeticoes_antigas()
+            colunas_padrao, _ = escolher_colunas_em_cache(frequencia_colunas, atrasos, repeticoes_recentes,
+                                                          repeticoes_antigas, pesos_padrao)
+            colunas_dinamicas = None
+            encerrou = False
+            for estado in ativos:
+                if numero == 0 or estado.perdas_consecutivas > 1:
+                    if colunas_dinamicas is None:
+                        pesos = gerar_pesos_em_cache(frequencia_colunas, atrasos, repeticoes_recentes,
+                                                     repeticoes_antigas, len(janela))
+                        colunas_dinamicas, _ = escolher_colunas_em_cache(
+                            frequencia_colunas, atrasos, repeticoes_recentes, repeticoes_antigas, pesos)
+                    colunas = colunas_dinamicas
+                else:
+                    colunas = colunas_padrao
+                encerrou |= _liquidar(estado, colunas, numero, saldo_inicial, max_perdas_consecutivas,
+                                      stop_gain, stop_loss)
+                encerrou |= estado.fim == posicao + 1
+            if encerrou:
+                restantes = []
+                for estado in ativos:
+                    if estado.motivo is not None or estado.fim == posicao + 1:
+                        finalizar(estado)
+                    else:
+                        restantes.append(estado)
+                ativos = restantes
+        janela.adicionar(resultado)
+
+    linhas.sort(key=lambda linha: (linha["dobra"], estrategias.index(linha["estrategia"])))
+    return linhas
+
+
+# Liquida a aposta de uma rodada com as mesmas regras de simular_apostas; retorna True se encerrou
+def _liquidar(estado, colunas, numero, saldo_inicial, max_perdas_consecutivas, stop_gain, stop_loss):
+    progressao = estado.progressao
+    aposta_atual = progressao.proxima_aposta(estado.saldo)
+    saldo = estado.saldo - aposta_atual
+    if saldo <= 0:
+        estado.motivo = "saldo_insuficiente"
+        return True
+    estado.rodadas += 1
+    if alguma_aposta_vence(colunas, numero):
+        estado.saldo = saldo + retorno_apostas(colunas, numero, aposta_atual)
+        progressao.ao_vencer()
+        estado.perdas_consecutivas = 0
+        if estado.saldo - saldo_inicial >= stop_gain:
+            estado.motivo = "stop_gain"
+    else:
+        estado.saldo = saldo
+        progressao.ao_perder()
+        estado.perdas_consecutivas += 1
+        if saldo - saldo_inicial <= stop_loss:
+            estado.motivo = "stop_loss"
+        elif estado.perdas_consecutivas >= max_perdas_consecutivas:
+            estado.motivo = "max_perdas_consecutivas"
+    return estado.motivo is not None
+
+
+# Avalia um grupo de dobras sobre o seu trecho do histórico (executada nos processos de trabalho)
+def _avaliar_grupo(tarefa):
+    trecho, deslocamento, primeira, dobras, estrategias, parametros = tarefa
+    relativas = [(inicio - deslocamento, teste - deslocamento, fim - deslocamento) for inicio, teste, fim in dobras]
+    linhas = avaliar_dobras(trecho, relativas, estrategias, **parametros)
+    for linha in linhas:
+        linha["dobra"] += primeira
+        for campo in ("inicio", "inicio_teste", "fim"):
+            linha[campo] += deslocamento
+    return linhas
+
+
+def avaliar_walk_forward(resultados, estrategias=ESTRATEGIAS, tamanho_janela=30, tamanho_teste=200, passo=None,
+                         processos=1, **parametros):
+    """
+    Avaliação walk-forward (origem móvel) das estratégias sobre um histórico longo.
+
+    As dobras são divididas em grupos contíguos, um por processo; cada processo recebe só o trecho
+    do histórico das suas dobras (um byte por resultado) e o percorre uma vez (veja avaliar_dobras).
+
+    Parâmetros:
+    - resultados: Lista de tuplas no formato [[numero, cor], ...], iterador, array de números ou ResultadosBinarios.
+    - tamanho_janela, tamanho_teste, passo: Como em gerar_dobras.
+    - processos: Quantidade de processos (1 roda no processo atual; None usa todos os núcleos).
+    - parametros: saldo_inicial, aposta_base, max_perdas_consecutivas, stop_gain, stop_loss, pesos_padrao.
+
+    Retorna:
+    - Lista de dicionários, um por (dobra, estratégia), na ordem das dobras.
+    """
+    if hasattr(resultados, "numeros"):
+        numeros = bytes(resultados.numeros)
+    elif hasattr(resultados, "tobytes"):
+        numeros = resultados.astype("uint8").tobytes()
+    else:
+        numeros = bytes(numero for numero, _ in resultados)
+    dobras = gerar_dobras(len(numeros), tamanho_janela, tamanho_teste, passo)
+    if not dobras:
+        return []
+    estrategias = list(estrategias)
+    processos = processos or os.cpu_count()
+    if processos == 1:
+        return avaliar_dobras(numeros, dobras, estrategias, **parametros)
+
+    tamanho_grupo = math.ceil(len(dobras) / processos)
+    tarefas = []
+    for primeira in range(0, len(dobras), tamanho_grupo):
+        grupo = dobras[primeira:primeira + tamanho_grupo]
+        inicio, fim = grupo[0][0], grupo[-1][2]
+        tarefas.append((numeros[inicio:fim], inicio, primeira, grupo, estrategias, parametros))
+    with Pool(len(tarefas)) as pool:
+        return [linha for linhas in pool.map(_avaliar_grupo, tarefas) for linha in linhas]
+
+
+def resumir_por_estrategia(linhas):
+    """
+    Resume as dobras de cada estratégia: ganho médio com intervalo de 95% (aproximação normal),
+    desvio padrão, fração de dobras com lucro (intervalo de Wilson) e motivos de encerramento.
+    """
+    por_estrategia = {}
+    for linha in linhas:
+        por_estrategia.setdefault(linha["estrategia"], []).append(linha)
+    resumos = {}
+    for estrategia, dobras in por_estrategia.items():
+        ganhos = [dobra["ganho_liquido"] for dobra in dobras]
+        media = statistics.fmean(ganhos)
+        desvio = statistics.stdev(ganhos) if len(ganhos) > 1 else 0.0
+        margem = Z_95 * desvio / math.sqrt(len(ganhos))
+        com_lucro = sum(1 for ganho in ganhos if ganho > 0)
+        resumos[estrategia] = {
+            "dobras": len(dobras),
+            "ganho_medio": media,
+            "intervalo_ganho_medio": (media - margem, media + margem),
+            "desvio_padrao": desvio,
+            "fracao_com_lucro": com_lucro / len(dobras),
+            "intervalo_fracao_com_lucro": intervalo_wilson(com_lucro, len(dobras)),
+            "rodadas_medias": statistics.fmean(dobra["rodadas"] for dobra in dobras),
+            "motivos": dict(Counter(dobra["motivo"] for dobra in dobras)),
+        }
+    return resumos
+
+
+# Função para imprimir o resumo da avaliação walk-forward
+def imprimir_resumo(resumos):
+    print(f"{'estrategia':<20} {'dobras':>7} {'ganho medio':>12} {'IC 95%':>20} {'com lucro':>10} {'rodadas':>8}")
+    for estrategia, resumo in resumos.items():
+        baixo, alto = resumo["intervalo_ganho_medio"]
+        print(f"{estrategia:<20} {resumo['dobras']:>7} {resumo['ganho_medio']:>12.3f} "
+              f"{f'[{baixo:.3f}, {alto:.3f}]':>20} {resumo['fracao_com_lucro']:>10.1%} {resumo['rodadas_medias']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avaliação walk-forward das estratégias sobre os históricos.")
+    parser.add_argument("arquivos", nargs="+", help="Arquivos, diretórios ou padrões glob de historico_jogo_*.json")
+    parser.add_argument("--estrategias", nargs="+", default=ESTRATEGIAS, choices=list(ESTRATEGIAS_REGISTRADAS))
+    parser.add_argument("--janela", type=int, default=30)
+    parser.add_argument("--teste", type=int, default=200, help="Resultados apostados em cada dobra")
+    parser.add_argument("--passo", type=int, help="Avanço da origem entre dobras (padrão: --teste)")
+    parser.add_argument("--saldo-inicial", type=float, default=10)
+    parser.add_argument("--aposta-base", type=float, default=1)
+    parser.add_argument("--max-perdas", type=int, default=3)
+    parser.add_argument("--stop-gain", type=float, default=20)
+    parser.add_argument("--stop-loss", type=float, default=-5)
+    parser.add_argument("--processos", type=int, help="Quantidade de processos (padrão: todos os núcleos)")
+    parser.add_argument("--json", help="Arquivo JSON com o resultado de cada dobra")
+    argumentos = parser.parse_args()
+
+    linhas = avaliar_walk_forward(
+        carregar_resultados_em_fluxo(argumentos.arquivos), argumentos.estrategias, argumentos.janela,
+        argumentos.teste, argumentos.passo, argumentos.processos,
+        saldo_inicial=argumentos.saldo_inicial, aposta_base=argumentos.aposta_base,
+        max_perdas_consecutivas=argumentos.max_perdas, stop_gain=argumentos.stop_gain,
+        stop_loss=argumentos.stop_loss)
+    if argumentos.json:
+        with open(argumentos.json, "w") as f:
+            json.dump(linhas, f, indent=2)
+    imprimir_resumo(resumir_por_estrategia(linhas))